@@ -0,0 +1,594 @@
+#!/usr/bin/env python3
+"""End-to-end generation benchmark with a per-phase time breakdown.
+
+Runs ``ReasoningEngine.generate_with_report`` over the category × platform
+matrix and reports, per request and as p50 / p95 / p99 over all requests:
+
+- wall time, split into Phase A (LLM time net of tools), planning,
+  Phase B and finalize (safety validation) time
+- tool time per tool, Neo4j query time and query count
+- Phase A / Phase B tokens and abilities produced
+- allocations (``tracemalloc`` peak and net bytes per request)
+
+Backends are chosen independently:
+
+    --llm    live    the configured provider (LLM_PROVIDER, incl. ``local``)
+             record  live provider, every call stored in the cassette
+             replay  responses served from the cassette (no network)
+    --graph  live    Neo4j
+             record  Neo4j, every query stored in the cassette's graph.json
+             replay  in-memory snapshot of the recorded queries (no Neo4j)
+
+With ``--llm replay --graph replay`` the suite runs fully offline (the MISP
+galaxy is read from the local download cache).  Results are written as JSON
+to ``output/benchmarks/`` for comparison across commits (``--compare``).
+
+Usage:
+    # Record a cassette once (needs Neo4j + an LLM provider)
+    python scripts/benchmark_generation.py --llm record --graph record --cassette bench
+
+    # Replay it offline, e.g. on every commit
+    python scripts/benchmark_generation.py --llm replay --graph replay --cassette bench
+
+    # Subset of the matrix, compared with an earlier run
+    python scripts/benchmark_generation.py --category credential_access \\
+        --platform windows --platform linux --compare output/benchmarks/<run>.json
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import math
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import click
+from rich.console import Console
+from rich.logging import RichHandler
+from rich.table import Table
+
+# Add project root to path so `src` is importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import tracing
+from src.config import BENCHMARK_DIR, CASSETTE_DIR, get_settings
+from src.graph.connection import Neo4jConnection
+from src.graph.snapshot import SnapshotConnection
+from src.layers.download_manager import DownloadManager
+from src.layers.layer2_enrichment import GalaxyManager
+from src.layers.layer3_reasoning import ReasoningEngine
+from src.llm import create_llm_client
+from src.llm.base import GenerateResult, LLMClient
+from src.llm.cassette import CassetteLLMClient
+from src.models.enums import AttackCategory, Platform
+
+console = Console()
+logger = logging.getLogger("benchmark_generation")
+
+BACKENDS = ("live", "record", "replay")
+PERCENTILES = (50, 95, 99)
+
+
+def setup_logging(level: str = "WARNING") -> None:
+    """Configure logging with Rich handler."""
+    logging.basicConfig(
+        level=getattr(logging, level.upper(), logging.WARNING),
+        format="%(message)s",
+        datefmt="[%X]",
+        handlers=[RichHandler(console=console, rich_tracebacks=True)],
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# Instrumentation
+# ──────────────────────────────────────────────────────────────
+
+class Timings:
+    """Thread-safe accumulator of named durations and counts."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.counts: dict[str, int] = defaultdict(int)
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.seconds[name] += seconds
+            self.counts[name] += 1
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def total(self, prefix: str) -> float:
+        with self._lock:
+            return sum(v for k, v in self.seconds.items() if k.startswith(prefix))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.seconds.clear()
+            self.counts.clear()
+
+
+class TimedConnection:
+    """Graph connection wrapper that times every query."""
+
+    def __init__(self, conn: Any, timings: Timings) -> None:
+        self._conn = conn
+        self._timings = timings
+
+    def run_query(self, cypher: str, params: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+        with self._timings.span("neo4j"):
+            return self._conn.run_query(cypher, params)
+
+    def run_write(self, cypher: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        with self._timings.span("neo4j"):
+            return self._conn.run_write(cypher, params)
+
+    def is_active(self) -> bool:
+        return self._conn.is_active()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class TimedLLMClient(LLMClient):
+    """LLM wrapper that times calls; calls with tools are Phase A calls.
+
+    Tool time spent inside a Phase A call is subtracted so ``llm.phase_a``
+    is the model's own time (requests run one at a time, so the tool
+    total's delta over the call belongs to it).
+    """
+
+    def __init__(self, inner: LLMClient, timings: Timings) -> None:
+        self._inner = inner
+        self._timings = timings
+        self.rate_limiter = inner.rate_limiter
+
+    @property
+    def model_name(self) -> str:
+        return self._inner.model_name
+
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: Any = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        tools_before = self._timings.total("tool.")
+        start = time.perf_counter()
+        try:
+            return self._inner.generate(
+                messages, tools=tools, schema=schema, max_iterations=max_iterations, **kwargs
+            )
+        finally:
+            elapsed = time.perf_counter() - start
+            if tools:
+                tool_time = self._timings.total("tool.") - tools_before
+                self._timings.add("llm.phase_a", max(elapsed - tool_time, 0.0))
+            else:
+                self._timings.add("llm.phase_b", elapsed)
+
+
+def _timed_tool(tool: Any, timings: Timings) -> Any:
+    """Wrap a tool closure, keeping the name / signature the LLM sees."""
+
+    @functools.wraps(tool)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with timings.span(f"tool.{tool.__name__}"):
+            return tool(*args, **kwargs)
+
+    return wrapper
+
+
+def _timed_method(obj: Any, method: str, name: str, timings: Timings) -> None:
+    """Replace ``obj.method`` on the instance with a timed version."""
+    original = getattr(obj, method)
+
+    @functools.wraps(original)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with timings.span(name):
+            return original(*args, **kwargs)
+
+    setattr(obj, method, wrapper)
+
+
+def instrument(engine: ReasoningEngine, timings: Timings) -> None:
+    """Time the engine's pipeline steps and tool closures."""
+    engine._tools = [_timed_tool(tool, timings) for tool in engine._tools]
+    engine._dispatch = {tool.__name__: tool for tool in engine._tools}
+    _timed_method(engine, "_phase_a_cached", "phase.phase_a", timings)
+    _timed_method(engine, "_phase_a_graph_first", "phase.phase_a", timings)
+    _timed_method(engine, "_plan_slots", "phase.planning", timings)
+    _timed_method(engine, "_phase_b_compose_all", "phase.phase_b", timings)
+    _timed_method(engine, "_finalize", "phase.finalize", timings)
+    _timed_method(engine._validator, "validate", "validation", timings)
+
+
+# ──────────────────────────────────────────────────────────────
+# Backends
+# ──────────────────────────────────────────────────────────────
+
+def build_llm(mode: str, cassette: Path) -> LLMClient:
+    settings = get_settings()
+    if mode == "replay":
+        return CassetteLLMClient(None, cassette, mode="replay", latency=None)
+    client = create_llm_client(settings)
+    if mode == "record":
+        return CassetteLLMClient(client, cassette, mode="record")
+    return client
+
+
+def build_graph(mode: str, cassette: Path) -> tuple[Any, Neo4jConnection | None]:
+    """Return ``(connection, live connection to close)``."""
+    if mode == "replay":
+        return SnapshotConnection(cassette / "graph.json"), None
+    live = Neo4jConnection()
+    if mode == "record":
+        return SnapshotConnection(cassette / "graph.json", live), live
+    return live, live
+
+
+def build_galaxy(graph_mode: str) -> GalaxyManager | None:
+    """MISP galaxy for the engine (``None`` = read from the graph)."""
+    if get_settings().galaxy_source == "graph":
+        return None
+    # Offline replay: never revalidate the local galaxy download cache
+    downloader = DownloadManager(freshness_seconds=math.inf) if graph_mode == "replay" else None
+    galaxy = GalaxyManager(downloader=downloader)
+    galaxy.load_all()
+    return galaxy
+
+
+# ──────────────────────────────────────────────────────────────
+# Statistics
+# ──────────────────────────────────────────────────────────────
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile (0.0 for no values)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered)) - 1
+    return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+
+def summarize(runs: list[dict[str, Any]]) -> dict[str, Any]:
+    """p50 / p95 / p99 / mean of every numeric metric across runs."""
+    metrics: dict[str, list[float]] = defaultdict(list)
+    for run in runs:
+        for section in ("timings_s", "tokens", "allocations"):
+            for key, value in run[section].items():
+                metrics[f"{section}.{key}"].append(value)
+        metrics["abilities"].append(run["abilities"])
+    return {
+        name: {
+            **{f"p{p}": round(percentile(values, p), 4) for p in PERCENTILES},
+            "mean": round(sum(values) / len(values), 4),
+            "total": round(sum(values), 4),
+        }
+        for name, values in sorted(metrics.items())
+    }
+
+
+def run_once(
+    engine: ReasoningEngine,
+    timings: Timings,
+    category: str,
+    platform: str,
+    count: int,
+    fresh_research: bool,
+    trace_allocations: bool,
+) -> dict[str, Any]:
+    """Benchmark one generation request."""
+    timings.reset()
+    if trace_allocations:
+        tracemalloc.reset_peak()
+        allocated_before = tracemalloc.get_traced_memory()[0]
+
+    start = time.perf_counter()
+    error = None
+    try:
+        report = engine.generate_with_report(
+            category, platform, count, fresh_research=fresh_research
+        )
+    except Exception as exc:  # record and keep benchmarking the matrix
+        logger.error("%s/%s failed: %s", category, platform, exc)
+        report, error = None, str(exc)
+    wall = time.perf_counter() - start
+
+    allocations: dict[str, int] = {}
+    if trace_allocations:
+        current, peak = tracemalloc.get_traced_memory()
+        allocations = {
+            "peak_bytes": peak - allocated_before,
+            "net_bytes": current - allocated_before,
+        }
+
+    seconds = dict(timings.seconds)
+    tool_times = {k[len("tool."):]: v for k, v in seconds.items() if k.startswith("tool.")}
+    return {
+        "category": category,
+        "platform": platform,
+        "error": error,
+        "abilities": len(report.abilities) if report else 0,
+        "research_cached": report.research_cached if report else False,
+        "timings_s": {
+            "wall": round(wall, 4),
+            "phase_a": round(seconds.get("phase.phase_a", 0.0), 4),
+            "phase_a_llm": round(seconds.get("llm.phase_a", 0.0), 4),
+            "planning": round(seconds.get("phase.planning", 0.0), 4),
+            "phase_b": round(seconds.get("phase.phase_b", 0.0), 4),
+            "phase_b_llm_calls": round(seconds.get("llm.phase_b", 0.0), 4),
+            "finalize": round(seconds.get("phase.finalize", 0.0), 4),
+            "validation": round(seconds.get("validation", 0.0), 4),
+            "tools": round(sum(tool_times.values()), 4),
+            "neo4j": round(seconds.get("neo4j", 0.0), 4),
+            **{f"tool.{name}": round(v, 4) for name, v in sorted(tool_times.items())},
+        },
+        "counts": {
+            "neo4j_queries": timings.counts.get("neo4j", 0),
+            "llm_calls": timings.counts.get("llm.phase_a", 0)
+            + timings.counts.get("llm.phase_b", 0),
+            **{
+                k: v for k, v in sorted(timings.counts.items()) if k.startswith("tool.")
+            },
+        },
+        "tokens": {
+            "phase_a": report.phase_a_tokens if report else 0,
+            "phase_b": report.phase_b_tokens if report else 0,
+            "total": report.total_tokens if report else 0,
+        },
+        "allocations": allocations,
+    }
+
+
+# ──────────────────────────────────────────────────────────────
+# Output
+# ──────────────────────────────────────────────────────────────
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_summary(summary: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    table = Table(title="Generation benchmark (seconds / tokens / bytes)")
+    table.add_column("Metric", style="cyan", no_wrap=True)
+    for p in PERCENTILES:
+        table.add_column(f"p{p}", justify="right")
+    table.add_column("mean", justify="right")
+    if baseline is not None:
+        table.add_column("Δ p50 vs baseline", justify="right")
+
+    for name, stats in summary.items():
+        row = [name, *(f"{stats[f'p{p}']:,.3f}" for p in PERCENTILES), f"{stats['mean']:,.3f}"]
+        if baseline is not None:
+            before = baseline.get(name, {}).get("p50")
+            if before:
+                change = (stats["p50"] - before) / before * 100
+                color = "red" if change > 5 else "green" if change < -5 else "white"
+                row.append(f"[{color}]{change:+.1f}%[/{color}]")
+            else:
+                row.append("—")
+        table.add_row(*row)
+    console.print(table)
+
+
+# ──────────────────────────────────────────────────────────────
+# CLI
+# ──────────────────────────────────────────────────────────────
+
+@click.command()
+@click.option(
+    "--llm",
+    "llm_mode",
+    type=click.Choice(BACKENDS),
+    default="replay",
+    help="LLM backend: live provider, record to / replay from the cassette.",
+)
+@click.option(
+    "--graph",
+    "graph_mode",
+    type=click.Choice(BACKENDS),
+    default="replay",
+    help="Graph backend: live Neo4j, record to / replay from the cassette snapshot.",
+)
+@click.option(
+    "--cassette",
+    default="benchmark",
+    show_default=True,
+    help="Cassette name (directory under output/cassettes/).",
+)
+@click.option(
+    "--category",
+    "categories",
+    multiple=True,
+    type=click.Choice([c.value for c in AttackCategory]),
+    help="Categories to run (repeatable; default: all).",
+)
+@click.option(
+    "--platform",
+    "platforms",
+    multiple=True,
+    type=click.Choice([p.value for p in Platform]),
+    help="Platforms to run (repeatable; default: all).",
+)
+@click.option("--count", default=3, show_default=True, help="Abilities per request.")
+@click.option("--repeat", default=1, show_default=True, help="Runs per matrix cell.")
+@click.option(
+    "--use-research-cache",
+    is_flag=True,
+    default=False,
+    help="Allow Phase A research cache hits (default: always run Phase A).",
+)
+@click.option(
+    "--allocations/--no-allocations",
+    default=True,
+    show_default=True,
+    help="Trace allocations with tracemalloc (adds CPU overhead).",
+)
+@click.option(
+    "--compare",
+    "compare_path",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Earlier benchmark JSON to compare p50s against.",
+)
+@click.option(
+    "--output",
+    "output_path",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Result file (default: output/benchmarks/<timestamp>-<commit>.json).",
+)
+@click.option(
+    "--log-level",
+    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"], case_sensitive=False),
+    default="WARNING",
+    help="Logging level.",
+)
+def main(
+    llm_mode: str,
+    graph_mode: str,
+    cassette: str,
+    categories: tuple[str, ...],
+    platforms: tuple[str, ...],
+    count: int,
+    repeat: int,
+    use_research_cache: bool,
+    allocations: bool,
+    compare_path: str | None,
+    output_path: str | None,
+    log_level: str,
+) -> None:
+    """Benchmark ability generation across the category × platform matrix."""
+    setup_logging(log_level)
+    settings = get_settings()
+    tracing.configure(settings)
+    cassette_dir = CASSETTE_DIR / cassette
+    matrix = [
+        (category, platform)
+        for category in categories or [c.value for c in AttackCategory]
+        for platform in platforms or [p.value for p in Platform]
+    ]
+
+    console.rule("[bold blue]Generation Benchmark[/bold blue]")
+    console.print(
+        f"LLM: [bold]{llm_mode}[/bold]  Graph: [bold]{graph_mode}[/bold]  "
+        f"Cassette: {cassette_dir}\n"
+        f"Matrix: {len(matrix)} cells × {repeat} run(s), {count} abilities each"
+    )
+
+    timings = Timings()
+    conn, live_conn = build_graph(graph_mode, cassette_dir)
+    llm = TimedLLMClient(build_llm(llm_mode, cassette_dir), timings)
+    engine = ReasoningEngine(
+        llm=llm, conn=TimedConnection(conn, timings), galaxy=build_galaxy(graph_mode)
+    )
+    instrument(engine, timings)
+
+    if allocations:
+        tracemalloc.start()
+    runs: list[dict[str, Any]] = []
+    try:
+        for index, (category, platform) in enumerate(matrix * repeat, start=1):
+            run = run_once(
+                engine,
+                timings,
+                category,
+                platform,
+                count,
+                fresh_research=not use_research_cache,
+                trace_allocations=allocations,
+            )
+            runs.append(run)
+            console.print(
+                f"[{index}/{len(matrix) * repeat}] {category}/{platform}: "
+                f"{run['timings_s']['wall']:.2f}s, {run['abilities']}/{count} abilities, "
+                f"{run['tokens']['total']:,} tokens"
+                + (f" [red]{run['error']}[/red]" if run["error"] else "")
+            )
+    finally:
+        if allocations:
+            tracemalloc.stop()
+        engine.close()
+        conn.close()
+        if live_conn is not None and live_conn is not conn:
+            live_conn.close()
+
+    summary = summarize(runs)
+    baseline = None
+    if compare_path:
+        baseline = json.loads(Path(compare_path).read_text(encoding="utf-8"))["summary"]
+    print_summary(summary, baseline)
+
+    commit = git_commit()
+    started = datetime.now(timezone.utc)
+    result = {
+        "meta": {
+            "commit": commit,
+            "timestamp": started.isoformat(),
+            "llm": llm_mode,
+            "graph": graph_mode,
+            "cassette": cassette,
+            "model": llm.model_name,
+            "count": count,
+            "repeat": repeat,
+            "fresh_research": not use_research_cache,
+            "allocations": allocations,
+            "settings": {
+                "generation_mode": settings.generation_mode,
+                "phase_b_concurrency": settings.phase_b_concurrency,
+                "phase_b_batch_size": settings.phase_b_batch_size,
+                "phase_b_schema": settings.phase_b_schema,
+                "galaxy_source": settings.galaxy_source,
+                "enable_safety_layer": settings.enable_safety_layer,
+            },
+        },
+        "summary": summary,
+        "runs": runs,
+    }
+    path = (
+        Path(output_path)
+        if output_path
+        else BENCHMARK_DIR / f"{started:%Y%m%dT%H%M%SZ}-{commit}.json"
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    console.print(f"\n[green]Results written to {path}[/green]")
+
+    failed = sum(1 for run in runs if run["error"])
+    if failed:
+        console.print(f"[red]{failed} of {len(runs)} requests failed[/red]")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
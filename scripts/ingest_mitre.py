@@ -16,10 +16,14 @@ Usage:
 
     # Skip schema creation (indexes/constraints already exist)
     python scripts/ingest_mitre.py --source local --skip-schema
+
+    # Skip loading MISP Galaxy clusters into the graph
+    python scripts/ingest_mitre.py --source local --skip-galaxy
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import sys
 import time
@@ -36,17 +40,22 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.config import get_settings
 from src.graph.connection import Neo4jConnection
-from src.graph.loader import load_all_nodes, load_all_relationships
+from src.graph.loader import (
+    load_all_nodes,
+    load_all_relationships,
+    load_galaxy,
+    record_graph_version,
+)
 from src.graph.queries import (
     COUNT_NODES_BY_LABEL,
     COUNT_RELATIONSHIPS_BY_TYPE,
     SAMPLE_CREDENTIAL_ACCESS,
 )
 from src.graph.schema import clear_graph, setup_schema
-from src.config import DEFAULT_STIX_CACHE_PATH
 from src.layers.layer1_ingestion import (
     download_stix_bundle,
     load_stix_store,
+    local_stix_bundle,
     parse_campaigns,
     parse_data_sources,
     parse_intrusion_sets,
@@ -59,6 +68,8 @@ from src.layers.layer1_ingestion import (
     parse_techniques,
     parse_tools,
 )
+from src.layers.download_manager import content_digest
+from src.layers.layer2_enrichment import GalaxyManager
 
 console = Console()
 
@@ -85,7 +96,11 @@ def setup_logging(level: str = "INFO") -> None:
     "file_path",
     type=click.Path(exists=False),
     default=None,
-    help="Path to local STIX JSON file (default: src/data/mitre/enterprise-attack.json).",
+    help=(
+        "Path to local STIX JSON file (default: the cached "
+        "src/data/mitre/enterprise-attack.json.gz, or a legacy "
+        "enterprise-attack.json)."
+    ),
 )
 @click.option(
     "--clear",
@@ -99,6 +114,12 @@ def setup_logging(level: str = "INFO") -> None:
     default=False,
     help="Skip index/constraint creation (for re-runs).",
 )
+@click.option(
+    "--skip-galaxy",
+    is_flag=True,
+    default=False,
+    help="Skip loading MISP Galaxy clusters into the graph.",
+)
 @click.option(
     "--log-level",
     type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"], case_sensitive=False),
@@ -110,6 +131,7 @@ def main(
     file_path: str | None,
     clear: bool,
     skip_schema: bool,
+    skip_galaxy: bool,
     log_level: str,
 ) -> None:
     """Ingest MITRE ATT&CK STIX data into Neo4j knowledge graph."""
@@ -156,7 +178,7 @@ def main(
         elif source == "github":
             stix_path = download_stix_bundle()
         else:
-            stix_path = DEFAULT_STIX_CACHE_PATH
+            stix_path = local_stix_bundle()
             if not stix_path.exists():
                 console.print(
                     f"[red]Cached file not found at {stix_path}. "
@@ -243,6 +265,32 @@ def main(
         rel_elapsed = time.time() - rel_start
         console.print(f"  Loaded {sum(rel_stats.values())} relationships in {rel_elapsed:.1f}s")
 
+        # ── Step 6b: Load MISP Galaxy clusters ─────────────
+        galaxy_version = "none"
+        if not skip_galaxy:
+            console.print("\n[bold]Step 6b:[/bold] Loading MISP Galaxy clusters into Neo4j ...")
+            galaxy_start = time.time()
+
+            galaxy = GalaxyManager()
+            galaxy.load_all()
+            galaxy_stats = load_galaxy(
+                conn, galaxy.cluster_records(), galaxy.attack_pattern_records()
+            )
+
+            galaxy_version = galaxy.version
+            galaxy_elapsed = time.time() - galaxy_start
+            console.print(
+                f"  Loaded {sum(galaxy_stats.values())} galaxy records in {galaxy_elapsed:.1f}s"
+            )
+        else:
+            console.print("\n[bold]Step 6b:[/bold] Skipping MISP Galaxy load (--skip-galaxy).")
+
+        # Stamp the graph so caches keyed on its content invalidate
+        graph_version = hashlib.sha256(
+            f"stix:{content_digest(stix_path)}\ngalaxy:{galaxy_version}".encode("utf-8")
+        ).hexdigest()
+        record_graph_version(conn, graph_version)
+
         # ── Step 7: Verification ───────────────────────────
         console.print("\n[bold]Step 7:[/bold] Verifying loaded data ...")
 
@@ -5,7 +5,7 @@ from collections import Counter
 
 import stix2
 
-from src.config import DEFAULT_STIX_CACHE_PATH
+from src.layers.layer1_ingestion import load_stix_store, local_stix_bundle
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +13,7 @@ logger = logging.getLogger(__name__)
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(message)s")
 
-    store = stix2.MemoryStore()
-    store.load_from_file(str(DEFAULT_STIX_CACHE_PATH))
+    store = load_stix_store(local_stix_bundle())
 
     techs = store.query([stix2.Filter("type", "=", "attack-pattern")])
     t1003_ids = []
@@ -1,12 +1,13 @@
 """Quick inspection of Galaxy data richness."""
 
-import json
 import logging
-from pathlib import Path
 
 import stix2
 
-from src.config import DEFAULT_STIX_CACHE_PATH, DEFAULT_GALAXY_CACHE_DIR
+from src.config import DEFAULT_GALAXY_CACHE_DIR
+from src.layers.download_manager import read_cached_json
+from src.layers.layer1_ingestion import load_stix_store, local_stix_bundle
+from src.layers.layer2_enrichment import GalaxyManager
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +17,10 @@ def main() -> None:
 
     cache = DEFAULT_GALAXY_CACHE_DIR
     logger.info("Cached files: %s", [f.name for f in cache.iterdir()])
+    paths = GalaxyManager(cache_dir=cache).download_all()
 
     # Attack pattern meta fields
-    data = json.loads(Path(cache / "mitre-attack-pattern.json").read_text(encoding="utf-8"))
+    data = read_cached_json(paths["attack_pattern"])
     for val in data["values"]:
         if "T1003" in val.get("value", "") and "LSASS" in val.get("value", ""):
             meta = val.get("meta", {})
@@ -35,7 +37,7 @@ def main() -> None:
 
     # Check all unique meta keys across intrusion sets
     logger.info("\n=== Intrusion Set Meta Keys Survey ===")
-    is_data = json.loads(Path(cache / "mitre-intrusion-set.json").read_text(encoding="utf-8"))
+    is_data = read_cached_json(paths["intrusion_set"])
     all_meta_keys: set[str] = set()
     has_country = 0
     has_cfr = 0
@@ -67,8 +69,7 @@ def main() -> None:
 
     # Check the STIX bundle for campaigns
     logger.info("\n=== STIX Bundle - Campaigns ===")
-    store = stix2.MemoryStore()
-    store.load_from_file(str(DEFAULT_STIX_CACHE_PATH))
+    store = load_stix_store(local_stix_bundle())
     campaigns = store.query([stix2.Filter("type", "=", "campaign")])
     logger.info("Campaign objects: %d", len(campaigns))
     if campaigns:
@@ -0,0 +1,407 @@
+"""Durable job queue for long-running generations (SQLite).
+
+``POST /jobs`` stores a generation request and returns at once; worker
+tasks (``run_worker``) claim queued jobs, run them and store the result,
+and clients poll or long-poll ``GET /jobs/{id}``.  Throughput scales with
+the number of workers (``JOBS_WORKERS`` per server process, all sharing
+one database file), not with open HTTP connections.
+
+Job lifecycle::
+
+    queued ──claim──▶ running ──▶ succeeded
+      ▲                  │
+      └── retry (backoff)┤ error, or lease expired — attempts left
+                         └──▶ failed — attempts exhausted
+
+    queued / running ── ttl after submission ──▶ expired
+
+A running job holds a lease that its worker renews on a heartbeat (every
+third of the lease) and with every progress update; when a worker dies
+the lease runs out and any worker claims the job again.  Writes from a worker that lost its lease are ignored.
+Finished jobs are deleted ``ttl`` after they finish.
+
+Usage:
+    from src.api.jobs import JobStore, run_worker
+
+    store = JobStore(max_attempts=3, ttl_seconds=86400)
+    job = store.enqueue({"category": "credential_access", "platform": "windows"})
+    task = asyncio.create_task(run_worker(store, handler, "worker-1"))
+    store.get(job.id).status  # "queued" → "running" → "succeeded"
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from src import metrics
+from src.config import JOBS_DB_PATH, JOBS_POLL_SECONDS, JOBS_RETRY_DELAY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "expired")
+FINISHED_STATUSES = ("succeeded", "failed", "expired")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           TEXT PRIMARY KEY,
+    status       TEXT NOT NULL,
+    request      TEXT NOT NULL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    created_at   REAL NOT NULL,
+    available_at REAL NOT NULL,
+    started_at   REAL,
+    finished_at  REAL,
+    lease_until  REAL,
+    worker       TEXT,
+    progress     TEXT,
+    result       TEXT,
+    error        TEXT
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, available_at)"
+
+# Called by a job handler with its progress so far (renews the lease)
+ProgressReporter = Callable[[dict[str, Any]], None]
+JobHandler = Callable[["Job", ProgressReporter], Awaitable[dict[str, Any]]]
+
+
+@dataclass
+class Job:
+    """One queued generation and its outcome."""
+
+    id: str
+    status: str
+    request: dict[str, Any]
+    attempts: int = 0
+    created_at: float = 0.0
+    started_at: float | None = None  # latest attempt
+    finished_at: float | None = None
+    progress: dict[str, Any] = field(default_factory=dict)
+    result: dict[str, Any] | None = None
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+
+class JobStore:
+    """SQLite-backed job queue with retries, leases and expiry.
+
+    Every operation opens its own short-lived connection, so one instance
+    can be shared by the request handlers and workers (and several
+    processes can share the database file).
+
+    Args:
+        path: SQLite database file (created with parent directories).
+        max_attempts: Attempts per job before it is marked failed.
+        ttl_seconds: Unfinished jobs expire this long after submission;
+            finished jobs are deleted this long after they finish.
+        lease_seconds: How long a running job stays claimed without a
+            renewal from its worker (workers renew every third of it).
+    """
+
+    def __init__(
+        self,
+        path: Path | str = JOBS_DB_PATH,
+        *,
+        max_attempts: int = 3,
+        ttl_seconds: float = 86400,
+        lease_seconds: float = 900,
+    ) -> None:
+        self._path = Path(path)
+        self.max_attempts = max(1, max_attempts)
+        self.ttl = ttl_seconds
+        self.lease_seconds = lease_seconds
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(_SCHEMA)
+            db.execute(_INDEX)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, commit on success, always close."""
+        db = sqlite3.connect(self._path, timeout=10)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    # ── Clients ───────────────────────────────────────────────
+
+    def enqueue(self, request: dict[str, Any]) -> Job:
+        """Queue a generation request; returns the new job."""
+        now = time.time()
+        job = Job(id=uuid.uuid4().hex, status="queued", request=request, created_at=now)
+        with self._connect() as db:
+            db.execute(
+                "INSERT INTO jobs (id, status, request, created_at, available_at) "
+                "VALUES (?, 'queued', ?, ?, ?)",
+                (job.id, json.dumps(request), now, now),
+            )
+        logger.info("Job %s queued", job.id)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """The job with *job_id* (``None`` if unknown or deleted)."""
+        with self._connect() as db:
+            self._expire(db, time.time())
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job(row) if row is not None else None
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per status."""
+        with self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: 0 for status in JOB_STATUSES} | {row[0]: row[1] for row in rows}
+
+    # ── Workers ───────────────────────────────────────────────
+
+    def claim(self, worker: str) -> Job | None:
+        """Take the oldest runnable job for *worker* (``None`` if none).
+
+        Runnable: queued jobs whose retry delay has passed, and running
+        jobs whose lease expired (their worker is gone).  Also expires
+        and purges old jobs.
+        """
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")  # one claimer at a time
+            self._expire(db, now)
+            db.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, worker = NULL, "
+                "error = COALESCE(error, 'worker lease expired') "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts),
+            )
+            db.execute(
+                "DELETE FROM jobs WHERE status IN ('succeeded', 'failed', 'expired') "
+                "AND finished_at < ?",
+                (now - self.ttl,),
+            )
+            row = db.execute(
+                "SELECT id FROM jobs "
+                "WHERE (status = 'queued' AND available_at <= ?) "
+                "OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY available_at LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                "worker = ?, started_at = ?, lease_until = ?, progress = NULL WHERE id = ?",
+                (worker, now, now + self.lease_seconds, row["id"]),
+            )
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        job = _job(row)
+        logger.info("Job %s claimed by %s (attempt %d)", job.id, worker, job.attempts)
+        return job
+
+    def renew(
+        self, job_id: str, worker: str, progress: dict[str, Any] | None = None
+    ) -> bool:
+        """Extend the lease (and store *progress*); ``False`` if the lease was lost."""
+        now = time.time()
+        with self._connect() as db:
+            updated = db.execute(
+                "UPDATE jobs SET progress = COALESCE(?, progress), lease_until = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (
+                    json.dumps(progress, default=str) if progress is not None else None,
+                    now + self.lease_seconds,
+                    job_id,
+                    worker,
+                ),
+            ).rowcount
+        return bool(updated)
+
+    def complete(
+        self,
+        job_id: str,
+        worker: str,
+        result: dict[str, Any],
+        progress: dict[str, Any] | None = None,
+    ) -> bool:
+        """Mark the job succeeded with *result* (and its final *progress*).
+
+        Returns:
+            ``False`` if the lease was lost.
+        """
+        with self._connect() as db:
+            updated = db.execute(
+                "UPDATE jobs SET status = 'succeeded', result = ?, "
+                "progress = COALESCE(?, progress), error = NULL, "
+                "finished_at = ?, worker = NULL "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (
+                    json.dumps(result, default=str),
+                    json.dumps(progress, default=str) if progress else None,
+                    time.time(),
+                    job_id,
+                    worker,
+                ),
+            ).rowcount
+        return bool(updated)
+
+    def fail(self, job_id: str, worker: str, error: str) -> str | None:
+        """Record a failed attempt: requeue with backoff, or fail for good.
+
+        Returns:
+            The job's new status (``"queued"`` or ``"failed"``), or ``None``
+            if the lease was lost.
+        """
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND status = 'running'",
+                (job_id, worker),
+            ).fetchone()
+            if row is None:
+                return None
+            attempts = row["attempts"]
+            if attempts >= self.max_attempts:
+                db.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, "
+                    "worker = NULL WHERE id = ?",
+                    (error, now, job_id),
+                )
+                return "failed"
+            delay = JOBS_RETRY_DELAY_SECONDS * 2 ** (attempts - 1)
+            db.execute(
+                "UPDATE jobs SET status = 'queued', error = ?, available_at = ?, "
+                "worker = NULL, lease_until = NULL WHERE id = ?",
+                (error, now + delay, job_id),
+            )
+        return "queued"
+
+    def release(self, job_id: str, worker: str) -> None:
+        """Hand a job back without using up an attempt (worker shutdown)."""
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET status = 'queued', attempts = attempts - 1, "
+                "available_at = ?, worker = NULL, lease_until = NULL "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time(), job_id, worker),
+            )
+
+    def _expire(self, db: sqlite3.Connection, now: float) -> None:
+        db.execute(
+            "UPDATE jobs SET status = 'expired', finished_at = ?, worker = NULL "
+            "WHERE status IN ('queued', 'running') AND created_at < ?",
+            (now, now - self.ttl),
+        )
+
+
+def _job(row: sqlite3.Row) -> Job:
+    return Job(
+        id=row["id"],
+        status=row["status"],
+        request=json.loads(row["request"]),
+        attempts=row["attempts"],
+        created_at=row["created_at"],
+        started_at=row["started_at"],
+        finished_at=row["finished_at"],
+        progress=json.loads(row["progress"]) if row["progress"] else {},
+        result=json.loads(row["result"]) if row["result"] else None,
+        error=row["error"],
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# Worker
+# ──────────────────────────────────────────────────────────────
+
+async def run_worker(store: JobStore, handler: JobHandler, name: str) -> None:
+    """Claim and run jobs from *store* until cancelled.
+
+    ``handler(job, report_progress)`` returns the job result.  Progress
+    reports are written in the background and renew the job's lease.  A
+    failed handler requeues the job (or fails it once its attempts are
+    used up); cancelling the worker hands its current job back.  Queue
+    errors (e.g. ``database is locked``) are logged and retried after
+    ``JOBS_POLL_SECONDS``; a job caught mid-write is reclaimed once its
+    lease runs out.
+    """
+    logger.info("Job worker %s started", name)
+    while True:
+        try:
+            ran = await _run_next(store, handler, name)
+        except Exception as exc:
+            logger.error("Job worker %s: queue error (%s) — retrying", name, exc, exc_info=True)
+            ran = False
+        if not ran:
+            await asyncio.sleep(JOBS_POLL_SECONDS)
+
+
+async def _run_next(store: JobStore, handler: JobHandler, name: str) -> bool:
+    """Claim and run one job; ``False`` when none was runnable."""
+    job = await asyncio.to_thread(store.claim, name)
+    if job is None:
+        return False
+
+    loop = asyncio.get_running_loop()
+    latest: dict[str, Any] = {}
+
+    def report_progress(progress: dict[str, Any]) -> None:
+        latest.clear()
+        latest.update(progress)
+        loop.run_in_executor(None, store.renew, job.id, name, progress)
+
+    heartbeat = asyncio.create_task(_keep_lease(store, job.id, name))
+    try:
+        try:
+            result = await handler(job, report_progress)
+        finally:
+            heartbeat.cancel()
+    except asyncio.CancelledError:
+        await asyncio.shield(asyncio.to_thread(store.release, job.id, name))
+        raise
+    except Exception as exc:
+        status = await asyncio.to_thread(
+            store.fail, job.id, name, f"{type(exc).__name__}: {exc}"
+        )
+        if status is None:
+            outcome = "lost"
+            logger.warning("Job %s failed after its lease was lost: %s", job.id, exc)
+        else:
+            outcome = "retried" if status == "queued" else "failed"
+            logger.warning(
+                "Job %s attempt %d failed (%s): %s", job.id, job.attempts, outcome, exc
+            )
+    else:
+        completed = await asyncio.to_thread(store.complete, job.id, name, result, latest)
+        outcome = "succeeded" if completed else "lost"
+        if not completed:
+            logger.warning("Job %s finished after its lease was lost", job.id)
+    metrics.JOB_ATTEMPTS.inc(outcome=outcome)
+    return True
+
+
+async def _keep_lease(store: JobStore, job_id: str, worker: str) -> None:
+    """Renew *job_id*'s lease every third of its length until cancelled.
+
+    Keeps a long phase (no progress reports) from letting another worker
+    reclaim the job while it still runs.
+    """
+    while True:
+        await asyncio.sleep(store.lease_seconds / 3)
+        try:
+            if not await asyncio.to_thread(store.renew, job_id, worker):
+                logger.warning("Job %s lost its lease to another worker or expiry", job_id)
+                return
+        except Exception as exc:
+            logger.warning("Job %s lease renewal failed: %s", job_id, exc)
@@ -1,6 +1,15 @@
 """FastAPI service — Ability Generation endpoint.
 
 Exposes the two-phase reasoning engine via a single POST endpoint.
+Generations run on the async pipeline (``agenerate_with_report``), so the
+event loop keeps serving ``/health`` and ``/metrics`` while they run;
+admission is bounded (``API_MAX_CONCURRENT_GENERATIONS`` running,
+``API_MAX_QUEUED_GENERATIONS`` waiting) and each request has a timeout.
+
+Generations that outlive an HTTP request go through the job queue
+(``src/api/jobs.py``): ``POST /jobs`` enqueues one and returns its id at
+once, worker tasks run it, and ``GET /jobs/{id}`` reports status, progress
+per phase and the result (``?wait=`` long-polls until the job finishes).
 Starts the server with:
 
     uvicorn src.api.main:app --reload --port 8000
@@ -12,18 +21,31 @@ Or:
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import socket
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from typing import Any
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
 
-from src.config import AGENT_VERSION, get_settings
+from src import metrics, tracing
+from src.api.jobs import Job, JobStore, ProgressReporter, run_worker
+from src.config import (
+    AGENT_VERSION,
+    API_DISCONNECT_POLL_SECONDS,
+    JOBS_MAX_WAIT_SECONDS,
+    JOBS_POLL_SECONDS,
+    get_settings,
+)
 from src.graph.connection import Neo4jConnection
 from src.layers.layer2_enrichment import GalaxyManager
-from src.layers.layer3_reasoning import ReasoningEngine
+from src.layers.layer3_reasoning import GenerationReport, ReasoningEngine
 from src.llm import create_llm_client
 from src.models.enums import AttackCategory, Platform
 
@@ -53,6 +75,10 @@ class GenerateRequest(BaseModel):
         le=10,
         description="Number of abilities to generate (1–10).",
     )
+    fresh_research: bool = Field(
+        default=False,
+        description="Bypass the Phase A research cache (re-run the exploration).",
+    )
 
 
 class AbilitySummary(BaseModel):
@@ -72,6 +98,10 @@ class GenerateResponse(BaseModel):
     count: int
     elapsed_seconds: float
     model: str
+    research_cached: bool = Field(
+        default=False,
+        description="Whether Phase A research was served from the cache.",
+    )
     validation_summary: dict[str, Any] = Field(
         default_factory=dict,
         description=(
@@ -79,6 +109,54 @@ class GenerateResponse(BaseModel):
             "and warned abilities."
         ),
     )
+    technique_summary: dict[str, Any] = Field(
+        default_factory=dict,
+        description=(
+            "Technique planning summary: assigned, backfilled and rejected "
+            "technique IDs, plus the uniqueness rate of the produced abilities."
+        ),
+    )
+
+
+class JobResponse(BaseModel):
+    """Response from /jobs: a queued generation and, once done, its result."""
+
+    job_id: str
+    status: str = Field(
+        ...,
+        description="queued, running, succeeded, failed or expired.",
+        examples=["running"],
+    )
+    attempts: int = Field(default=0, description="Attempts started so far.")
+    created_at: datetime
+    started_at: datetime | None = Field(
+        default=None, description="Start of the latest attempt."
+    )
+    finished_at: datetime | None = None
+    expires_at: datetime = Field(
+        ...,
+        description=(
+            "When an unfinished job expires, or when a finished job is deleted."
+        ),
+    )
+    timings: dict[str, float] = Field(
+        default_factory=dict,
+        description=(
+            "Seconds spent queued and running (latest attempt), plus wall "
+            "clock per completed pipeline phase."
+        ),
+    )
+    progress: dict[str, Any] = Field(
+        default_factory=dict,
+        description=(
+            "Partial results of the running attempt: last completed phase, "
+            "research cache outcome, planned techniques and tokens so far."
+        ),
+    )
+    result: GenerateResponse | None = None
+    error: str | None = Field(
+        default=None, description="Error of the latest failed attempt."
+    )
 
 
 # ──────────────────────────────────────────────────────────────
@@ -86,12 +164,16 @@ class GenerateResponse(BaseModel):
 # ──────────────────────────────────────────────────────────────
 
 _engine: ReasoningEngine | None = None
+_slots: asyncio.Semaphore | None = None  # running generations
+_waiting = 0  # requests queued for a slot (event-loop thread only)
+_jobs: JobStore | None = None
+_workers: set[asyncio.Task] = set()  # running job workers (restarted if they die)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start/stop shared resources (Neo4j, Galaxy, LLM)."""
-    global _engine
+    """Start/stop shared resources (Neo4j, Galaxy, LLM, job workers)."""
+    global _engine, _slots, _jobs
 
     settings = get_settings()
 
@@ -101,6 +183,15 @@ async def lifespan(app: FastAPI):
     )
 
     logger.info("Starting up — initialising resources...")
+    tracing.configure(settings)
+
+    # Bounded pool for the blocking steps of async generations (to_thread)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=settings.api_worker_threads, thread_name_prefix="api-worker"
+        )
+    )
+    _slots = asyncio.Semaphore(max(1, settings.api_max_concurrent_generations))
 
     # LLM client
     llm = create_llm_client(settings)
@@ -110,19 +201,40 @@ async def lifespan(app: FastAPI):
     conn = Neo4jConnection()
     logger.info("Neo4j connection ready: %s", settings.neo4j_uri)
 
-    # MISP Galaxy data
-    galaxy = GalaxyManager()
-    galaxy.load_all()
-    logger.info("Galaxy data loaded.")
+    # MISP Galaxy data (in-process copy only when not served from the graph)
+    galaxy: GalaxyManager | None = None
+    if settings.galaxy_source == "graph":
+        logger.info("Galaxy data served from Neo4j.")
+    else:
+        galaxy = GalaxyManager()
+        galaxy.load_all()
+        logger.info("Galaxy data loaded.")
 
     # Reasoning engine
     _engine = ReasoningEngine(llm=llm, conn=conn, galaxy=galaxy)
     logger.info("ReasoningEngine ready.")
 
+    # Job queue and its workers
+    _jobs = JobStore(
+        max_attempts=settings.jobs_max_attempts,
+        ttl_seconds=settings.jobs_ttl_seconds,
+        lease_seconds=settings.jobs_lease_seconds,
+    )
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    for i in range(settings.jobs_workers):
+        _start_worker(f"{prefix}:{i}")
+    logger.info("Job queue ready: %d workers.", len(_workers))
+
     yield  # ← app runs here
 
     # Shutdown
     logger.info("Shutting down...")
+    workers = list(_workers)
+    _workers.clear()  # stopped workers are not restarted
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    _jobs = None
     _engine.close()
     _engine = None
 
@@ -148,31 +260,102 @@ async def health():
     return {"status": "ok", "engine_ready": _engine is not None}
 
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Service metrics in the Prometheus text exposition format."""
+    if _jobs is not None:
+        for status, count in (await asyncio.to_thread(_jobs.counts)).items():
+            metrics.JOBS.set(count, status=status)
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.post("/generate", response_model=GenerateResponse)
-async def generate_abilities(req: GenerateRequest):
+async def generate_abilities(req: GenerateRequest, request: Request):
     """Generate attack abilities through the two-phase reasoning pipeline.
 
     1. **Phase A** — LLM explores the MITRE ATT&CK knowledge graph with
        4 tool closures, selects techniques, gathers threat intelligence.
     2. **Phase B** — For each ability, the LLM produces validated
        structured JSON conforming to the ``Ability`` Pydantic schema.
+
+    Answers 503 when the generation queue is full and 504 when the
+    generation exceeds ``API_GENERATE_TIMEOUT_SECONDS``.  A generation
+    whose client disconnects is cancelled.
     """
     if _engine is None:
         raise HTTPException(status_code=503, detail="Engine not initialised.")
 
     start = time.perf_counter()
-
-    try:
-        abilities = _engine.generate_abilities(
-            category=req.category,
-            platform=req.platform,
-            count=req.count,
-        )
-    except Exception as exc:
-        logger.error("Generation failed: %s", exc, exc_info=True)
-        raise HTTPException(status_code=500, detail=str(exc))
-
-    elapsed = round(time.perf_counter() - start, 2)
+    labels = {"category": req.category.value, "platform": req.platform.value}
+
+    with tracing.span(
+        "POST /generate",
+        {"http.request.method": "POST", "http.route": "/generate"},
+        kind=tracing.SPAN_KIND_SERVER,
+    ) as span:
+        try:
+            report = await _cancel_on_disconnect(request, _generate(req))
+        except HTTPException as exc:
+            span.set_attribute("http.response.status_code", exc.status_code)
+            metrics.GENERATE_REQUESTS.inc(status=str(exc.status_code), **labels)
+            raise
+        except Exception as exc:
+            logger.error("Generation failed: %s", exc, exc_info=True)
+            span.set_attribute("http.response.status_code", 500)
+            metrics.GENERATE_REQUESTS.inc(status="500", **labels)
+            raise HTTPException(status_code=500, detail=str(exc))
+        span.set_attribute("http.response.status_code", 200)
+
+    response = _build_response(report, time.perf_counter() - start)
+    metrics.GENERATE_REQUESTS.inc(status="200", **labels)
+    metrics.GENERATE_SECONDS.observe(time.perf_counter() - start, **labels)
+    _count_abilities(response, labels)
+    return response
+
+
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(req: GenerateRequest, response: Response):
+    """Queue a generation; poll ``GET /jobs/{job_id}`` for its outcome.
+
+    The job runs on a worker with the same pipeline and timeout as
+    ``/generate``.  Failed attempts are retried with backoff up to
+    ``JOBS_MAX_ATTEMPTS`` times; jobs still unfinished after
+    ``JOBS_TTL_SECONDS`` expire.
+    """
+    if _jobs is None:
+        raise HTTPException(status_code=503, detail="Job queue not initialised.")
+    job = await asyncio.to_thread(_jobs.enqueue, req.model_dump(mode="json"))
+    response.headers["Location"] = f"/jobs/{job.id}"
+    return _job_response(job)
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    wait: float = Query(
+        default=0,
+        ge=0,
+        le=JOBS_MAX_WAIT_SECONDS,
+        description="Long-poll: wait up to this many seconds for the job to finish.",
+    ),
+):
+    """Status, timings, partial progress and (once succeeded) result of a job."""
+    if _jobs is None:
+        raise HTTPException(status_code=503, detail="Job queue not initialised.")
+    deadline = time.monotonic() + wait
+    while True:
+        job = await asyncio.to_thread(_jobs.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+        if job.finished or time.monotonic() >= deadline:
+            return _job_response(job)
+        await asyncio.sleep(min(JOBS_POLL_SECONDS, max(deadline - time.monotonic(), 0)))
+
+
+def _build_response(report: GenerationReport, elapsed: float) -> GenerateResponse:
+    """``GenerateResponse`` for a finished generation."""
+    abilities = report.abilities
+    assignment = report.assignment
 
     # Compute validation summary from generated abilities
     passed_count = sum(
@@ -192,17 +375,199 @@ async def generate_abilities(req: GenerateRequest):
     return GenerateResponse(
         abilities=[a.model_dump(mode="json") for a in abilities],
         count=len(abilities),
-        elapsed_seconds=elapsed,
+        elapsed_seconds=round(elapsed, 2),
         model=_engine.model_name,
+        research_cached=report.research_cached,
         validation_summary={
             "total": len(abilities),
             "passed": passed_count,
             "blocked": blocked_count,
             "warned": warned_count,
         },
+        technique_summary={
+            "assigned": assignment.technique_ids if assignment else [],
+            "backfilled": assignment.backfilled if assignment else [],
+            "rejected": assignment.rejected if assignment else [],
+            "unique_techniques": report.unique_techniques,
+            "uniqueness_rate": round(report.uniqueness_rate, 3),
+        },
     )
 
 
+def _count_abilities(response: GenerateResponse, labels: dict[str, str]) -> None:
+    summary = response.validation_summary
+    metrics.ABILITIES_GENERATED.inc(summary["total"], **labels)
+    metrics.ABILITIES_BLOCKED.inc(summary["blocked"], **labels)
+    metrics.ABILITIES_WARNED.inc(summary["warned"], **labels)
+
+
+# ──────────────────────────────────────────────────────────────
+# Admission, timeout and cancellation
+# ──────────────────────────────────────────────────────────────
+
+
+async def _generate(req: GenerateRequest) -> GenerationReport:
+    """Wait for a generation slot, then run the async pipeline.
+
+    Raises:
+        HTTPException: 503 when ``API_MAX_QUEUED_GENERATIONS`` requests are
+            already waiting, 504 when the generation times out.
+    """
+    global _waiting
+    settings = get_settings()
+    max_queued = settings.api_max_queued_generations
+    if _slots.locked() and max_queued and _waiting >= max_queued:
+        raise HTTPException(
+            status_code=503, detail="Generation queue is full; retry later."
+        )
+
+    _waiting += 1
+    try:
+        with metrics.GENERATE_QUEUED.track():
+            await _slots.acquire()
+    finally:
+        _waiting -= 1
+
+    timeout = settings.api_generate_timeout_seconds or None
+    try:
+        with metrics.GENERATE_IN_FLIGHT.track():
+            return await asyncio.wait_for(
+                _engine.agenerate_with_report(
+                    category=req.category,
+                    platform=req.platform,
+                    count=req.count,
+                    fresh_research=req.fresh_research,
+                ),
+                timeout,
+            )
+    except asyncio.TimeoutError:
+        logger.warning("Generation timed out after %gs", timeout)
+        raise HTTPException(
+            status_code=504, detail=f"Generation exceeded {timeout:g}s."
+        ) from None
+    finally:
+        _slots.release()
+
+
+async def _cancel_on_disconnect(request: Request, coro: Any) -> Any:
+    """Await *coro*, cancelling it when the client disconnects first.
+
+    Raises:
+        HTTPException: 499 (client closed request) after a disconnect.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=API_DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.warning("Client disconnected — cancelling generation")
+                raise HTTPException(status_code=499, detail="Client closed request.")
+    finally:
+        task.cancel()  # no-op once done
+
+
+# ──────────────────────────────────────────────────────────────
+# Job queue
+# ──────────────────────────────────────────────────────────────
+
+
+async def _run_job(job: Job, report_progress: ProgressReporter) -> dict[str, Any]:
+    """Job handler: run one queued generation (``run_worker``).
+
+    Raises:
+        TimeoutError: After ``API_GENERATE_TIMEOUT_SECONDS`` (the attempt
+            fails and is retried).
+    """
+    req = GenerateRequest.model_validate(job.request)
+    labels = {"category": req.category.value, "platform": req.platform.value}
+
+    def progress(phase: str, report: GenerationReport) -> None:
+        report_progress(_job_progress(phase, report))
+
+    start = time.perf_counter()
+    timeout = get_settings().api_generate_timeout_seconds or None
+    with tracing.span(
+        "job.run", {"job.id": job.id, "job.attempt": job.attempts}
+    ), metrics.GENERATE_IN_FLIGHT.track():
+        try:
+            report = await asyncio.wait_for(
+                _engine.agenerate_with_report(
+                    category=req.category,
+                    platform=req.platform,
+                    count=req.count,
+                    fresh_research=req.fresh_research,
+                    progress=progress,
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Generation exceeded {timeout:g}s.") from None
+    response = _build_response(report, time.perf_counter() - start)
+    _count_abilities(response, labels)
+    return response.model_dump(mode="json")
+
+
+def _start_worker(name: str) -> None:
+    task = asyncio.create_task(run_worker(_jobs, _run_job, name), name=name)
+    _workers.add(task)
+    task.add_done_callback(_worker_done)
+
+
+def _worker_done(task: asyncio.Task) -> None:
+    """Restart a job worker that died (unless the app is shutting down)."""
+    if task not in _workers:
+        return
+    _workers.discard(task)
+    error = None if task.cancelled() else task.exception()
+    logger.error(
+        "Job worker %s stopped unexpectedly (%r) — restarting.", task.get_name(), error
+    )
+    _start_worker(task.get_name())
+
+
+def _job_progress(phase: str, report: GenerationReport) -> dict[str, Any]:
+    """Partial results stored after each completed pipeline phase."""
+    assignment = report.assignment
+    return {
+        "phase": phase,
+        "phase_seconds": dict(report.phase_seconds),
+        "research_cached": report.research_cached,
+        "techniques": assignment.technique_ids if assignment else [],
+        "tokens": report.total_tokens,
+        "abilities": len(report.abilities),
+    }
+
+
+def _job_response(job: Job) -> JobResponse:
+    timings: dict[str, float] = {}
+    if job.started_at is not None:
+        end = job.finished_at or time.time()
+        timings["queued"] = round(job.started_at - job.created_at, 3)
+        timings["running"] = round(max(end - job.started_at, 0), 3)
+    timings.update(job.progress.get("phase_seconds", {}))
+
+    ttl = _jobs.ttl if _jobs is not None else 0
+    return JobResponse(
+        job_id=job.id,
+        status=job.status,
+        attempts=job.attempts,
+        created_at=_timestamp(job.created_at),
+        started_at=_timestamp(job.started_at),
+        finished_at=_timestamp(job.finished_at),
+        expires_at=_timestamp((job.finished_at or job.created_at) + ttl),
+        timings=timings,
+        progress={k: v for k, v in job.progress.items() if k != "phase_seconds"},
+        result=job.result,
+        error=job.error,
+    )
+
+
+def _timestamp(value: float | None) -> datetime | None:
+    return datetime.fromtimestamp(value, timezone.utc) if value is not None else None
+
+
 # ──────────────────────────────────────────────────────────────
 # Direct execution: python -m src.api.main
 # ──────────────────────────────────────────────────────────────
@@ -32,12 +32,48 @@ class Settings(BaseSettings):
 
     # --- LLM Provider ---
     llm_provider: str = "gemini"
+    # Providers behind LLM_PROVIDER=router, in preference order
+    llm_router_providers: str = "gemini,groq"
     gemini_api_key: str = ""
     gemini_model: str = "gemini-3-flash-preview"
+    # Run Gemini tool calls in our own loop (concurrent per turn) instead of
+    # the SDK's automatic function calling, which executes them serially
+    gemini_manual_function_calling: bool = False
+    # Duplicate slow calls (tail-latency hedging); the hedge goes to
+    # llm_hedge_provider, or to the same provider when empty
+    llm_hedging: bool = False
+    llm_hedge_provider: str = ""
+    # Record / replay LLM calls (src/llm/cassette.py): "", "record", "replay".
+    # The cassette is output/cassettes/<llm_cassette_name>; replay latency
+    # < 0 replays each call's recorded latency
+    llm_cassette_mode: str = ""
+    llm_cassette_name: str = "default"
+    llm_cassette_latency: float = -1.0
     groq_api_key: str = ""
     groq_model: str = "qwen/qwen3-32b"
     ollama_model: str = "qwen3:32b"
     ollama_base_url: str = "http://localhost:11434/v1"
+    # Synthetic provider for load testing (LLM_PROVIDER=local): per-turn
+    # latency (log-normal median / sigma), tokens (mean / std), fault rates
+    local_latency_ms: float = 800.0
+    local_latency_sigma: float = 0.5
+    local_tokens_mean: int = 1500
+    local_tokens_std: int = 300
+    local_fault_rate_limit: float = 0.0
+    local_fault_timeout: float = 0.0
+    local_fault_invalid_json: float = 0.0
+    local_timeout_seconds: float = 30.0
+    local_seed: int = -1  # < 0 = random
+    # Client-side rate limits shared by every client in the process
+    # (requests / tokens per minute; 0 = unlimited)
+    gemini_rpm: int = 0
+    gemini_tpm: int = 0
+    groq_rpm: int = 0
+    groq_tpm: int = 0
+    ollama_rpm: int = 0
+    ollama_tpm: int = 0
+    local_rpm: int = 0
+    local_tpm: int = 0
 
     # --- Neo4j ---
     neo4j_uri: str = ""
@@ -45,8 +81,27 @@ class Settings(BaseSettings):
     neo4j_password: str = ""
     neo4j_database: str = "neo4j"
 
+    # --- MISP Galaxy ---
+    # "memory": each process loads the galaxy JSON files (GalaxyManager)
+    # "graph":  galaxy clusters are read from Neo4j (load with
+    #           scripts/ingest_mitre.py — see src.graph.loader.load_galaxy)
+    galaxy_source: str = "memory"
+
     # --- Safety & Generation ---
     max_abilities_per_batch: int = 20
+    phase_b_concurrency: int = 4  # concurrent Phase B LLM calls per request
+    phase_b_batch_size: int = 0  # abilities per Phase B call (0/1 = one per call)
+    # "slim": the LLM writes name/description/executors only; mapping and
+    #         threat intel are filled from the graph (AbilityDraft)
+    # "full": the LLM writes the whole Ability, including threat intel
+    phase_b_schema: str = "slim"
+    # "agentic":     Phase A tool loop — the LLM browses the graph
+    # "graph_first": deterministic planner picks techniques from the graph
+    #                and prefetches their intel (no Phase A LLM call)
+    generation_mode: str = "agentic"
+    # Phase A research cache (output/cache); TTL 0 disables it
+    research_cache_ttl_seconds: int = 86400
+    research_cache_max_entries: int = 256
     enable_safety_layer: bool = False
     enable_api_submission: bool = False
     backend_api_url: str = ""
@@ -54,6 +109,21 @@ class Settings(BaseSettings):
     # --- API Server ---
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    # /generate admission: generations running at once, and requests allowed
+    # to wait for a slot (0 = unbounded) before answering 503
+    api_max_concurrent_generations: int = 4
+    api_max_queued_generations: int = 32
+    # Per-request limit; 504 when exceeded (0 = no limit)
+    api_generate_timeout_seconds: float = 600.0
+    # Threads for blocking graph / cache / validation work of async requests
+    api_worker_threads: int = 16
+    # Job queue (POST /jobs, src/api/jobs.py): worker tasks per process
+    # (0 = enqueue only), attempts per job, job lifetime and worker lease
+    # (a job whose worker stops renewing it is picked up again)
+    jobs_workers: int = 2
+    jobs_max_attempts: int = 3
+    jobs_ttl_seconds: int = 86400
+    jobs_lease_seconds: float = 900.0
 
     # --- Groq ---
     groq_base_url: str = "https://api.groq.com/openai/v1"
@@ -61,6 +131,12 @@ class Settings(BaseSettings):
     # --- Logging ---
     log_level: str = "INFO"
 
+    # --- Tracing (src/tracing.py) ---
+    # Export spans as OTLP/JSON lines; an empty path means
+    # output/traces/spans.jsonl
+    tracing_enabled: bool = False
+    tracing_path: str = ""
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -80,6 +156,7 @@ def get_settings() -> Settings:
 
 SCHEMA_VERSION: str = "1.0"
 AGENT_VERSION: str = "0.1.0"
+PHASE_A_PROMPT_VERSION: str = "1"  # bump when the Phase A prompt changes (cache key)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -90,8 +167,30 @@ LLM_MAX_RETRIES: int = 3
 LLM_BASE_DELAY: float = 1.0       # seconds
 LLM_MAX_DELAY: float = 30.0       # seconds
 LLM_BACKOFF_FACTOR: float = 2.0
+LLM_BACKOFF_JITTER: float = 0.5   # each delay randomised within ±50%
 MAX_VALIDATION_RETRIES: int = 3
 
+# OpenAI-compatible tool loop history (src/llm/history.py)
+TOOL_HISTORY_MAX_TOKENS: int = 6000  # compact older tool results above this; 0 = never
+TOOL_HISTORY_KEEP_RECENT: int = 4    # most recent tool results always kept verbatim
+
+# Multi-provider router (src/llm/router.py, LLM_PROVIDER=router)
+ROUTER_FAILURE_THRESHOLD: int = 3       # consecutive failures that open a circuit
+ROUTER_COOLDOWN_SECONDS: float = 30.0   # open circuit → half-open trial after this
+ROUTER_LATENCY_ALPHA: float = 0.3       # EWMA weight of the newest latency sample
+ROUTER_ERROR_WINDOW: int = 20           # recent calls used for the error rate
+
+# Hedged requests (src/llm/hedging.py, LLM_HEDGING=true)
+HEDGE_LATENCY_PERCENTILE: float = 95.0  # hedge calls slower than this recent percentile
+HEDGE_LATENCY_WINDOW: int = 100         # recent call latencies kept for the percentile
+HEDGE_MIN_SAMPLES: int = 20             # no hedging until this many latencies are known
+HEDGE_MAX_RATIO: float = 0.1            # at most this share of calls may be hedged
+HEDGE_WORKERS: int = 16                 # threads running sync primary + hedge calls
+
+# Shared executor for tool calls returned in the same model turn
+# (src/llm/tool_executor.py); bounds concurrent Neo4j lookups per process
+TOOL_DISPATCH_WORKERS: int = 8
+
 
 # ══════════════════════════════════════════════════════════════
 # HTTP / Download
@@ -100,6 +199,11 @@ MAX_VALIDATION_RETRIES: int = 3
 STIX_DOWNLOAD_TIMEOUT: int = 120   # seconds
 DOWNLOAD_CHUNK_SIZE: int = 8192
 GALAXY_DOWNLOAD_TIMEOUT: float = 60.0  # seconds
+DOWNLOAD_POOL_SIZE: int = 8            # pooled connections (shared httpx.Client)
+DOWNLOAD_MAX_ATTEMPTS: int = 4         # interrupted downloads resume via Range
+DOWNLOAD_FRESHNESS_SECONDS: float = 6 * 3600  # skip revalidation within this window
+DOWNLOAD_CONNECT_TIMEOUT: float = 5.0  # seconds; offline revalidation fails fast
+DOWNLOAD_OFFLINE_RETRY_SECONDS: float = 300.0  # wait after a failed revalidation
 
 
 # ══════════════════════════════════════════════════════════════
@@ -128,7 +232,7 @@ STIX_GITHUB_URL: str = (
     "master/enterprise-attack/enterprise-attack.json"
 )
 
-DEFAULT_STIX_CACHE_PATH: Path = _SRC_DIR / "data" / "mitre" / "enterprise-attack.json"
+DEFAULT_STIX_CACHE_PATH: Path = _SRC_DIR / "data" / "mitre" / "enterprise-attack.json.gz"
 
 STIX_FILTERS: dict[str, list[Filter]] = {
     "tactics": [Filter("type", "=", "x-mitre-tactic")],
@@ -188,6 +292,25 @@ CATEGORY_TO_TACTICS: dict[str, list[str]] = {
     "network_signaling":          ["command-and-control"],
 }
 
+# Platform enum value → ATT&CK ``platforms`` names (covers pre- and
+# post-v15 cloud platform naming).
+PLATFORM_TO_ATTACK_PLATFORMS: dict[str, list[str]] = {
+    "windows":     ["Windows"],
+    "linux":       ["Linux"],
+    "macos":       ["macOS"],
+    "cloud_aws":   ["IaaS", "AWS"],
+    "cloud_azure": ["IaaS", "Azure", "Azure AD", "Identity Provider", "Office 365", "Office Suite"],
+    "cloud_gcp":   ["IaaS", "GCP", "Google Workspace"],
+}
+
+# Graph-first planner scoring (see src/layers/layer3_planner.py)
+PLANNER_PREVALENCE_WEIGHT: float = 0.6   # groups/campaigns/software using it
+PLANNER_PLATFORM_WEIGHT: float = 0.3     # platform specificity
+PLANNER_SUBTECHNIQUE_BONUS: float = 0.1  # prefer concrete sub-techniques
+PLANNER_DIVERSITY_PENALTY: float = 0.5   # multiplier per pick sharing a parent
+PLANNER_PREFETCH_WORKERS: int = 4        # concurrent get_technique_intel calls
+PLANNER_MAX_LIST_ITEMS: int = 8          # per-list cap in the planned context
+
 SYSTEM_PROMPT: str = """\
 You are an adversary simulation specialist for defensive security testing.
 Your role is to generate MITRE ATT&CK-mapped attack abilities that help security teams
@@ -227,6 +350,31 @@ Generate Ability objects conforming to the provided schema.
 Do not include conversational text. Output only structured data."""
 
 
+# ══════════════════════════════════════════════════════════════
+# Layer 3 — LLM tool result projections (src/tools/graph_tools.py)
+# ══════════════════════════════════════════════════════════════
+
+TOOL_CHARS_PER_TOKEN: int = 4  # rough token estimate for JSON tool results
+
+# Per-tool budget (estimated tokens) for a single tool result
+TOOL_TOKEN_BUDGETS: dict[str, int] = {
+    "get_techniques_by_tactic":    2000,
+    "get_techniques_for_platform": 2000,
+    "get_subtechniques":           1000,
+    "get_technique_intel":         2500,
+}
+
+# (max text chars, max list items) tried in order until a result fits its
+# budget; the last step is used even if still over budget.
+TOOL_PROJECTION_STEPS: list[tuple[int, int]] = [
+    (400, 25),
+    (240, 15),
+    (160, 10),
+    (80, 6),
+    (0, 4),
+]
+
+
 # ══════════════════════════════════════════════════════════════
 # Layer 6 — Safety & Governance constants
 # ══════════════════════════════════════════════════════════════
@@ -357,3 +505,21 @@ EXECUTOR_TO_PLATFORM_FAMILY: dict[str, str] = {
 }
 
 AUDIT_LOG_PATH: Path = _SRC_DIR.parent / "output" / "safety_audit.jsonl"
+RESEARCH_CACHE_PATH: Path = _SRC_DIR.parent / "output" / "cache" / "research_cache.sqlite3"
+CASSETTE_DIR: Path = _SRC_DIR.parent / "output" / "cassettes"
+BENCHMARK_DIR: Path = _SRC_DIR.parent / "output" / "benchmarks"
+TRACE_PATH: Path = _SRC_DIR.parent / "output" / "traces" / "spans.jsonl"
+JOBS_DB_PATH: Path = _SRC_DIR.parent / "output" / "jobs" / "jobs.sqlite3"
+
+
+# ══════════════════════════════════════════════════════════════
+# API Service (src/api/main.py)
+# ══════════════════════════════════════════════════════════════
+
+# How often a running /generate checks whether its client disconnected
+API_DISCONNECT_POLL_SECONDS: float = 1.0
+
+# Job queue: idle workers / long-polling clients re-check the store this often
+JOBS_POLL_SECONDS: float = 0.5
+JOBS_RETRY_DELAY_SECONDS: float = 5.0  # doubled per failed attempt
+JOBS_MAX_WAIT_SECONDS: float = 60.0  # cap on GET /jobs/{id}?wait=
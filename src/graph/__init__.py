@@ -2,7 +2,12 @@
 
 from src.graph.connection import Neo4jConnection
 from src.graph.schema import setup_schema, clear_graph
-from src.graph.loader import load_all_nodes, load_all_relationships
+from src.graph.loader import (
+    load_all_nodes,
+    load_all_relationships,
+    load_galaxy,
+    record_graph_version,
+)
 
 __all__ = [
     "Neo4jConnection",
@@ -10,4 +15,6 @@ __all__ = [
     "clear_graph",
     "load_all_nodes",
     "load_all_relationships",
+    "load_galaxy",
+    "record_graph_version",
 ]
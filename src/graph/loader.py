@@ -10,12 +10,15 @@ Usage:
     with Neo4jConnection() as conn:
         stats = load_all_nodes(conn, parsed_data)
         stats.update(load_all_relationships(conn, relationships, tactic_links))
+        stats.update(load_galaxy(conn, galaxy.cluster_records(),
+                                 galaxy.attack_pattern_records()))
 """
 
 from __future__ import annotations
 
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 from typing import Any
 
 from src.config import GRAPH_BATCH_SIZE
@@ -176,6 +179,64 @@ SET r.description = rel.description,
 """
 
 
+# ──────────────────────────────────────────────────────────────
+# Cypher Templates — MISP Galaxy
+# ──────────────────────────────────────────────────────────────
+
+# galaxy_key → (Neo4j label, STIX type prefix).  MISP's mitre-* galaxies
+# reuse the STIX object UUIDs, so "<prefix>--<uuid>" is the STIX id.
+GALAXY_LABELS: dict[str, tuple[str, str]] = {
+    "intrusion_set": ("IntrusionSet", "intrusion-set"),
+    "tool": ("Tool", "tool"),
+    "malware": ("Malware", "malware"),
+}
+
+# Labels are interpolated from GALAXY_LABELS only — never from input.
+EXISTING_GALAXY_TARGETS = """
+MATCH (n:{label})
+RETURN n.stix_id AS stix_id, n.name AS name, n.aliases AS aliases
+"""
+
+LOAD_GALAXY_CLUSTERS = """
+UNWIND $items AS item
+MERGE (n:{label} {{stix_id: item.stix_id}})
+ON CREATE SET n.name = item.name,
+              n.aliases = item.aliases,
+              n.description = item.description,
+              n.source = 'misp-galaxy'
+SET n:GalaxyCluster,
+    n.galaxy_uuid = item.uuid,
+    n.galaxy_external_id = item.external_id,
+    n.galaxy_synonyms = item.aliases,
+    n.galaxy_country = item.country,
+    n.galaxy_description = item.description
+"""
+
+LINK_GALAXY_USES = """
+UNWIND $links AS link
+MATCH (src:{label} {{stix_id: link.stix_id}})
+MATCH (t {{attack_id: link.technique_id}})
+WHERE t:Technique OR t:SubTechnique
+MERGE (src)-[:GALAXY_USES]->(t)
+"""
+
+LOAD_GALAXY_ATTACK_PATTERNS = """
+UNWIND $items AS item
+MATCH (t {attack_id: item.technique_id})
+WHERE t:Technique OR t:SubTechnique
+SET t.galaxy_uuid = item.uuid,
+    t.galaxy_name = item.name,
+    t.galaxy_refs = item.refs
+"""
+
+
+RECORD_GRAPH_VERSION = """
+MERGE (m:GraphMeta {name: 'attack'})
+SET m.version = $version,
+    m.loaded_at = $loaded_at
+"""
+
+
 # ──────────────────────────────────────────────────────────────
 # Batch Helper
 # ──────────────────────────────────────────────────────────────
@@ -398,3 +459,118 @@ def load_all_relationships(
     stats["attributed_to"] = load_attributed_to_relationships(conn, attributed_rels)
 
     return stats
+
+
+def _resolve_galaxy_clusters(
+    conn: Neo4jConnection,
+    label: str,
+    stix_prefix: str,
+    clusters: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Attach a ``stix_id`` to each cluster, reusing existing nodes.
+
+    A cluster is matched to an existing node of the same label by STIX
+    UUID first, then by case-insensitive name or alias.  Unmatched
+    clusters get the STIX id derived from their galaxy UUID, so they
+    become new nodes on MERGE.
+    """
+    existing = conn.run_query(EXISTING_GALAXY_TARGETS.format(label=label))
+    known_ids = {row["stix_id"] for row in existing}
+    by_name: dict[str, str] = {}
+    for row in existing:
+        for name in [row.get("name"), *(row.get("aliases") or [])]:
+            if name:
+                by_name.setdefault(name.lower(), row["stix_id"])
+
+    resolved: list[dict[str, Any]] = []
+    matched = 0
+    for cluster in clusters:
+        stix_id = f"{stix_prefix}--{cluster['uuid']}"
+        if stix_id not in known_ids:
+            for name in [cluster["name"], *cluster.get("aliases", [])]:
+                if name and name.lower() in by_name:
+                    stix_id = by_name[name.lower()]
+                    break
+        if stix_id in known_ids:
+            matched += 1
+        resolved.append({**cluster, "stix_id": stix_id})
+
+    logger.info(
+        "Galaxy %s: %d/%d clusters matched existing nodes.",
+        label,
+        matched,
+        len(clusters),
+    )
+    return resolved
+
+
+def load_galaxy(
+    conn: Neo4jConnection,
+    clusters: dict[str, list[dict[str, Any]]],
+    attack_patterns: list[dict[str, Any]],
+) -> dict[str, int]:
+    """Load MISP Galaxy clusters and technique links into the graph.
+
+    Must run after the STIX nodes are loaded so clusters deduplicate
+    against existing IntrusionSet/Tool/Malware nodes.  Clusters gain the
+    ``GalaxyCluster`` label and link to techniques via ``GALAXY_USES``.
+
+    Args:
+        conn: Neo4j connection.
+        clusters: ``GalaxyManager.cluster_records()`` output.
+        attack_patterns: ``GalaxyManager.attack_pattern_records()`` output.
+
+    Returns:
+        Dict mapping galaxy load step → count loaded.
+    """
+    stats: dict[str, int] = {}
+
+    for key, (label, stix_prefix) in GALAXY_LABELS.items():
+        resolved = _resolve_galaxy_clusters(
+            conn, label, stix_prefix, clusters.get(key, [])
+        )
+        stats[f"galaxy_{key}"] = _load_batch(
+            conn,
+            LOAD_GALAXY_CLUSTERS.format(label=label),
+            resolved,
+            f"galaxy {label} clusters",
+        )
+        links = [
+            {"stix_id": c["stix_id"], "technique_id": tid}
+            for c in resolved
+            for tid in c["technique_ids"]
+        ]
+        stats[f"galaxy_{key}_links"] = _load_batch(
+            conn,
+            LINK_GALAXY_USES.format(label=label),
+            links,
+            f"GALAXY_USES links ({label})",
+            param_name="links",
+        )
+
+    stats["galaxy_attack_patterns"] = _load_batch(
+        conn, LOAD_GALAXY_ATTACK_PATTERNS, attack_patterns, "galaxy attack patterns"
+    )
+    return stats
+
+
+# ──────────────────────────────────────────────────────────────
+# Graph version marker
+# ──────────────────────────────────────────────────────────────
+
+
+def record_graph_version(conn: Neo4jConnection, version: str) -> None:
+    """Stamp the graph with a content version (single ``GraphMeta`` node).
+
+    Written at the end of ingestion so consumers (e.g. the Phase A research
+    cache) can tell when the graph content changed.
+
+    Args:
+        conn: Neo4j connection.
+        version: Opaque version string, e.g. a digest of the source data.
+    """
+    conn.run_write(
+        RECORD_GRAPH_VERSION,
+        {"version": version, "loaded_at": datetime.now(timezone.utc).isoformat()},
+    )
+    logger.info("Recorded graph version %s.", version[:12])
@@ -81,6 +81,9 @@ ORDER BY m.name
 # ──────────────────────────────────────────────────────────────
 # Query 7: Full Context for a Technique (combined)
 # ──────────────────────────────────────────────────────────────
+# Also returns the MISP Galaxy context of Query 12 as galaxy_* columns
+# (evaluated once, after aggregation; empty when no galaxy is loaded), so
+# graph-mode enrichment is a single round trip.
 FULL_TECHNIQUE_CONTEXT = """
 MATCH (t {attack_id: $technique_id})
 WHERE t:Technique OR t:SubTechnique
@@ -90,16 +93,32 @@ OPTIONAL MATCH (s)-[:USES]->(t) WHERE s:Tool OR s:Malware
 OPTIONAL MATCH (t)-[:DETECTED_BY]->(ds:DataSource)
 OPTIONAL MATCH (m:Mitigation)-[:MITIGATES]->(t)
 OPTIONAL MATCH (c:Campaign)-[:CAMPAIGN_USES]->(t)
+WITH t,
+     collect(DISTINCT tac.shortname) AS tactics,
+     collect(DISTINCT g.name) AS groups,
+     collect(DISTINCT s.name) AS tools,
+     collect(DISTINCT ds.name) AS data_sources,
+     collect(DISTINCT m.name) AS mitigations,
+     collect(DISTINCT {name: c.name, first_seen: c.first_seen,
+                       last_seen: c.last_seen, external_id: c.external_id}) AS campaigns
 RETURN t.name AS name, t.attack_id AS attack_id,
        t.description AS description, t.platforms AS platforms,
-       collect(DISTINCT tac.shortname) AS tactics,
-       collect(DISTINCT g.name) AS groups,
-       collect(DISTINCT s.name) AS tools,
-       collect(DISTINCT ds.name) AS data_sources,
-       collect(DISTINCT m.name) AS mitigations,
+       tactics, groups, tools, data_sources, mitigations,
        t.detection AS detection_text,
-       collect(DISTINCT {name: c.name, first_seen: c.first_seen,
-                         last_seen: c.last_seen, external_id: c.external_id}) AS campaigns
+       campaigns,
+       CASE WHEN t.galaxy_uuid IS NULL THEN null
+            ELSE {name: t.galaxy_name, description: t.description,
+                  uuid: t.galaxy_uuid, meta: {refs: t.galaxy_refs}}
+       END AS galaxy_attack_pattern,
+       [(gc:IntrusionSet:GalaxyCluster)-[:GALAXY_USES]->(t) |
+           {name: gc.name, description: gc.galaxy_description, uuid: gc.galaxy_uuid,
+            aliases: gc.galaxy_synonyms, country: gc.galaxy_country}] AS galaxy_groups,
+       [(gs:Tool:GalaxyCluster)-[:GALAXY_USES]->(t) |
+           {name: gs.name, description: gs.galaxy_description,
+            uuid: gs.galaxy_uuid}] AS galaxy_tools,
+       [(gm:Malware:GalaxyCluster)-[:GALAXY_USES]->(t) |
+           {name: gm.name, description: gm.galaxy_description,
+            uuid: gm.galaxy_uuid}] AS galaxy_malware
 """
 
 # ──────────────────────────────────────────────────────────────
@@ -158,6 +177,69 @@ RETURN t.name AS name, t.attack_id AS attack_id,
 ORDER BY t.attack_id
 """
 
+# ──────────────────────────────────────────────────────────────
+# Query 12: MISP Galaxy Context for a Technique
+# ──────────────────────────────────────────────────────────────
+# Same shape as GalaxyManager.get_technique_context(), served from the
+# GalaxyCluster nodes written by src.graph.loader.load_galaxy().
+GALAXY_CONTEXT_FOR_TECHNIQUE = """
+MATCH (t {attack_id: $technique_id})
+WHERE t:Technique OR t:SubTechnique
+RETURN CASE WHEN t.galaxy_uuid IS NULL THEN null
+            ELSE {name: t.galaxy_name, description: t.description,
+                  uuid: t.galaxy_uuid, meta: {refs: t.galaxy_refs}}
+       END AS attack_pattern,
+       [(g:IntrusionSet:GalaxyCluster)-[:GALAXY_USES]->(t) |
+           {name: g.name, description: g.galaxy_description, uuid: g.galaxy_uuid,
+            aliases: g.galaxy_synonyms, country: g.galaxy_country}] AS groups,
+       [(s:Tool:GalaxyCluster)-[:GALAXY_USES]->(t) |
+           {name: s.name, description: s.galaxy_description, uuid: s.galaxy_uuid}] AS tools,
+       [(m:Malware:GalaxyCluster)-[:GALAXY_USES]->(t) |
+           {name: m.name, description: m.galaxy_description, uuid: m.galaxy_uuid}] AS malware
+"""
+
+# ──────────────────────────────────────────────────────────────
+# Query 13: Technique Candidates for Tactics + Platforms (planner)
+# ──────────────────────────────────────────────────────────────
+# Techniques and sub-techniques in any of $tactics that run on any of
+# $platforms, with the prevalence counts the graph-first planner scores on.
+TECHNIQUE_CANDIDATES = """
+MATCH (t)-[:PART_OF]->(tac:Tactic)
+WHERE (t:Technique OR t:SubTechnique)
+  AND tac.shortname IN $tactics
+  AND any(p IN coalesce(t.platforms, []) WHERE p IN $platforms)
+WITH t, collect(DISTINCT tac.shortname) AS tactics
+RETURN t.attack_id AS attack_id, t.name AS name,
+       t.is_subtechnique AS is_subtechnique,
+       t.platforms AS platforms, tactics,
+       size([(g:IntrusionSet)-[:USES]->(t) | g.stix_id]) AS group_count,
+       size([(c:Campaign)-[:CAMPAIGN_USES]->(t) | c.stix_id]) AS campaign_count,
+       size([(s)-[:USES]->(t) WHERE s:Tool OR s:Malware | s.stix_id]) AS software_count
+ORDER BY attack_id
+"""
+
+# ──────────────────────────────────────────────────────────────
+# Query 14: Techniques by ATT&CK ID (existence check)
+# ──────────────────────────────────────────────────────────────
+TECHNIQUES_BY_IDS = """
+MATCH (t)
+WHERE (t:Technique OR t:SubTechnique) AND t.attack_id IN $technique_ids
+RETURN t.attack_id AS attack_id, t.name AS name, t.platforms AS platforms
+"""
+
+# ──────────────────────────────────────────────────────────────
+# Query 15: Graph Content Version
+# ──────────────────────────────────────────────────────────────
+# ``version`` is stamped by src.graph.loader.record_graph_version(); the
+# node/relationship counts (served from the count store) are a fallback
+# fingerprint for graphs ingested before the stamp existed.
+GRAPH_VERSION = """
+CALL { MATCH (n) RETURN count(n) AS nodes }
+CALL { MATCH ()-[r]->() RETURN count(r) AS rels }
+OPTIONAL MATCH (m:GraphMeta {name: 'attack'})
+RETURN m.version AS version, nodes, rels
+"""
+
 # ──────────────────────────────────────────────────────────────
 # Verification Queries (used by ingestion script)
 # ──────────────────────────────────────────────────────────────
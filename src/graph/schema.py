@@ -46,6 +46,8 @@ INDEX_STATEMENTS = [
     "CREATE INDEX idx_malware_name IF NOT EXISTS FOR (m:Malware) ON (m.name)",
     "CREATE INDEX idx_campaign_name IF NOT EXISTS FOR (c:Campaign) ON (c.name)",
     "CREATE INDEX idx_campaign_external_id IF NOT EXISTS FOR (c:Campaign) ON (c.external_id)",
+    # MISP Galaxy cluster index
+    "CREATE INDEX idx_galaxy_cluster_uuid IF NOT EXISTS FOR (g:GalaxyCluster) ON (g.galaxy_uuid)",
     # Generated ability indexes
     "CREATE INDEX idx_ability_id IF NOT EXISTS FOR (a:Ability) ON (a.id)",
     "CREATE INDEX idx_ability_category IF NOT EXISTS FOR (a:Ability) ON (a.attack_category)",
@@ -0,0 +1,139 @@
+"""Graph query snapshots — run the pipeline without a live Neo4j.
+
+``SnapshotConnection`` is a drop-in for ``Neo4jConnection`` on the read
+path (``run_query``).  Given a live connection it *records*: queries are
+forwarded and their results stored, keyed by a hash of the Cypher text and
+parameters.  Without one it *replays* those results from the snapshot
+file, so tool closures, the planner and MISP enrichment run against an
+in-memory copy of exactly the graph data a recorded run touched.
+
+Together with ``src.llm.cassette`` this makes ``ReasoningEngine`` runs
+reproducible offline (benchmarks, CI).
+
+Usage:
+    from src.graph.snapshot import SnapshotConnection
+
+    # Record
+    with SnapshotConnection("output/cassettes/ci/graph.json", Neo4jConnection()) as conn:
+        engine = ReasoningEngine(llm=llm, conn=conn)
+        ...
+
+    # Replay
+    conn = SnapshotConnection("output/cassettes/ci/graph.json")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any
+
+from src.graph.connection import Neo4jConnection
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotMissError(LookupError):
+    """Raised in replay mode when a query is not in the snapshot."""
+
+
+class SnapshotConnection:
+    """Record or replay ``run_query`` results.
+
+    Args:
+        path: Snapshot JSON file.
+        conn: Live connection to record from; ``None`` replays.
+    """
+
+    def __init__(self, path: str | Path, conn: Neo4jConnection | None = None) -> None:
+        self._path = Path(path)
+        self._conn = conn
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._results: dict[str, dict[str, Any]] = {}
+        if self._path.exists():
+            self._results = json.loads(self._path.read_text(encoding="utf-8"))
+        logger.info(
+            "Graph snapshot (%s): %s, %d queries",
+            "record" if conn is not None else "replay",
+            self._path,
+            len(self._results),
+        )
+
+    @property
+    def recording(self) -> bool:
+        return self._conn is not None
+
+    # --- Context manager ---
+
+    def __enter__(self) -> SnapshotConnection:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # --- Query methods ---
+
+    def run_query(
+        self, cypher: str, params: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """Return recorded results, recording them first in record mode."""
+        params = params or {}
+        key = _query_key(cypher, params)
+        with self._lock:
+            entry = self._results.get(key)
+        if entry is not None and not self.recording:
+            return entry["rows"]
+        if not self.recording:
+            raise SnapshotMissError(
+                f"Query not in snapshot {self._path}: {' '.join(cypher.split())[:120]}"
+            )
+
+        rows = self._conn.run_query(cypher, params)  # type: ignore[union-attr]
+        # Round-trip through JSON so recorded and replayed rows are identical
+        rows = json.loads(json.dumps(rows, default=str))
+        with self._lock:
+            self._results[key] = {"cypher": cypher, "params": params, "rows": rows}
+            self._dirty = True
+        return rows
+
+    def run_write(
+        self, cypher: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Snapshots are read-only."""
+        raise RuntimeError("SnapshotConnection does not support writes")
+
+    def is_active(self) -> bool:
+        return True
+
+    def save(self) -> None:
+        """Write recorded results to the snapshot file."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._path.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps(self._results, indent=1, ensure_ascii=False, default=str),
+                encoding="utf-8",
+            )
+            tmp.replace(self._path)
+            self._dirty = False
+        logger.info("Graph snapshot saved: %s (%d queries)", self._path, len(self._results))
+
+    def close(self) -> None:
+        """Save the snapshot (record mode); the wrapped connection stays open."""
+        self.save()
+
+
+def _query_key(cypher: str, params: dict[str, Any]) -> str:
+    """Stable key for a query (whitespace-insensitive Cypher + params)."""
+    blob = json.dumps(
+        {"cypher": " ".join(cypher.split()), "params": params},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
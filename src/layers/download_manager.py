@@ -0,0 +1,529 @@
+"""Shared download layer — conditional, compressed, resumable HTTP fetches.
+
+Used by Layer 1 (STIX bundle) and Layer 2 (MISP Galaxy files) so both
+share one pooled ``httpx.Client`` and the same caching rules:
+
+- **Revalidation** — cached files carry a ``.meta.json`` sidecar with the
+  server's ``ETag`` / ``Last-Modified``.  Once the freshness window has
+  passed (or ``force=True``), the next fetch sends ``If-None-Match`` /
+  ``If-Modified-Since`` and an unchanged file costs a 304.
+- **Compression** — ``gzip`` (and ``br`` when ``brotli`` is installed) is
+  accepted on the wire, and caches whose path ends in ``.gz`` are stored
+  gzip-compressed on disk.
+- **Resume** — bytes are streamed to a ``.part`` file; an interrupted
+  transfer resumes with a ``Range`` request (guarded by ``If-Range``).
+- **Checksums** — the SHA-256 of every completed download is verified
+  against the expected digest (when given) and recorded in the sidecar,
+  so a corrupted cache is detected and re-downloaded.
+- **Seeding** — a missing cache is created from a local copy (the files
+  shipped in ``src/data`` or a legacy uncompressed cache) and then
+  revalidated, so a fresh checkout works offline.  Revalidation of an
+  existing cache is a single attempt with a short connect timeout; after
+  it fails the cache is used without retrying for a while.
+
+Usage:
+    from src.layers.download_manager import DownloadManager, read_cached_json
+
+    path = DownloadManager().fetch(url, Path("cache/file.json.gz"))
+    data = read_cached_json(path)
+
+For tests, pass ``client=httpx.Client(transport=...)`` or point the URL at
+a local HTTP server.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import asdict, dataclass
+from email.utils import formatdate
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from src.config import (
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_CONNECT_TIMEOUT,
+    DOWNLOAD_FRESHNESS_SECONDS,
+    DOWNLOAD_MAX_ATTEMPTS,
+    DOWNLOAD_OFFLINE_RETRY_SECONDS,
+    DOWNLOAD_POOL_SIZE,
+    STIX_DOWNLOAD_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+try:  # httpx decodes br transparently when a brotli package is importable
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "gzip, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip"
+
+
+class ChecksumMismatchError(ValueError):
+    """Raised when a downloaded file does not match its expected SHA-256."""
+
+
+# ──────────────────────────────────────────────────────────────
+# Shared HTTP client
+# ──────────────────────────────────────────────────────────────
+
+
+@lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """Return the process-wide pooled HTTP client (created on first call)."""
+    return httpx.Client(
+        timeout=STIX_DOWNLOAD_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=DOWNLOAD_POOL_SIZE,
+            max_keepalive_connections=DOWNLOAD_POOL_SIZE,
+        ),
+    )
+
+
+# ──────────────────────────────────────────────────────────────
+# Cache metadata sidecar
+# ──────────────────────────────────────────────────────────────
+
+
+@dataclass
+class CacheMetadata:
+    """Validators and integrity data stored next to a cached file."""
+
+    url: str
+    sha256: str
+    size: int  # uncompressed bytes
+    fetched_at: float  # epoch seconds of the last successful (re)validation
+    etag: str | None = None
+    last_modified: str | None = None
+    failed_at: float | None = None  # last revalidation that could not connect
+    # On-disk size / mtime when the digest was last verified; while they
+    # match, the file is trusted without re-hashing
+    disk_size: int = 0
+    mtime: float = 0.0
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_name(path.name + ".meta.json")
+
+
+def _part_path(path: Path) -> Path:
+    return path.with_name(path.name + ".part")
+
+
+def read_metadata(path: Path) -> CacheMetadata | None:
+    """Load the sidecar metadata for a cached file, if present."""
+    meta_path = _meta_path(path)
+    if not meta_path.exists():
+        return None
+    try:
+        return CacheMetadata(**json.loads(meta_path.read_text(encoding="utf-8")))
+    except (ValueError, TypeError) as exc:
+        logger.warning("Ignoring unreadable cache metadata %s: %s", meta_path, exc)
+        return None
+
+
+def _write_metadata(path: Path, meta: CacheMetadata) -> None:
+    """Write the sidecar, stamping the file's current size and mtime.
+
+    Callers write metadata only after downloading, seeding or verifying
+    the file, so the stamp marks the content the digest belongs to.
+    """
+    try:
+        stat = path.stat()
+        meta.disk_size, meta.mtime = stat.st_size, stat.st_mtime
+    except OSError:
+        meta.disk_size, meta.mtime = 0, 0.0
+    _meta_path(path).write_text(json.dumps(asdict(meta), indent=2), encoding="utf-8")
+
+
+# ──────────────────────────────────────────────────────────────
+# Cache readers
+# ──────────────────────────────────────────────────────────────
+
+
+def _is_gzip(path: Path) -> bool:
+    with open(path, "rb") as f:
+        return f.read(2) == _GZIP_MAGIC
+
+
+def read_cached_bytes(path: Path) -> bytes:
+    """Read a cached file, transparently decompressing gzip content."""
+    raw = Path(path).read_bytes()
+    if raw[:2] == _GZIP_MAGIC:
+        return gzip.decompress(raw)
+    return raw
+
+
+def read_cached_json(path: Path) -> Any:
+    """Read and parse a cached JSON file (plain or gzip-compressed)."""
+    return json.loads(read_cached_bytes(path))
+
+
+def _sha256_file(path: Path) -> tuple[str, int]:
+    """Return (hex digest, size) of a file's uncompressed content."""
+    digest = hashlib.sha256()
+    size = 0
+    opener = gzip.open if _is_gzip(path) else open
+    with opener(path, "rb") as f:
+        while chunk := f.read(DOWNLOAD_CHUNK_SIZE * 16):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def content_digest(path: Path) -> str:
+    """Return the sha256 of a cached file's uncompressed content.
+
+    Uses the digest recorded in the sidecar when present (no re-read),
+    otherwise hashes the file.
+    """
+    meta = read_metadata(Path(path))
+    if meta is not None:
+        return meta.sha256
+    return _sha256_file(Path(path))[0]
+
+
+# ──────────────────────────────────────────────────────────────
+# Download Manager
+# ──────────────────────────────────────────────────────────────
+
+
+class DownloadManager:
+    """Fetches remote files into a validated, optionally compressed cache.
+
+    Args:
+        client: HTTP client to use.  Defaults to the shared pooled client.
+        freshness_seconds: Skip revalidation for caches validated more
+            recently than this.  ``0`` revalidates on every fetch.
+        max_attempts: Attempts per fetch; interrupted attempts resume.
+        timeout: Per-request timeout in seconds.
+    """
+
+    def __init__(
+        self,
+        client: httpx.Client | None = None,
+        freshness_seconds: float = DOWNLOAD_FRESHNESS_SECONDS,
+        max_attempts: int = DOWNLOAD_MAX_ATTEMPTS,
+        timeout: float = STIX_DOWNLOAD_TIMEOUT,
+    ) -> None:
+        self._client = client or get_http_client()
+        self._freshness = freshness_seconds
+        self._max_attempts = max_attempts
+        self._timeout = timeout
+
+    def fetch(
+        self,
+        url: str,
+        dest: Path,
+        *,
+        force: bool = False,
+        sha256: str | None = None,
+        fallback: Path | None = None,
+    ) -> Path:
+        """Return a local, validated copy of *url* at *dest*.
+
+        Args:
+            url: Remote URL.
+            dest: Cache path.  Stored gzip-compressed if it ends in ``.gz``.
+            force: Revalidate even inside the freshness window.  Unchanged
+                files still cost only a 304.
+            sha256: Expected SHA-256 of the uncompressed content.
+            fallback: Local copy that seeds *dest* when it has never been
+                downloaded (bundled data or a legacy cache); it is used as
+                is if seeding fails and the network is unavailable.
+
+        Returns:
+            Path to the cached file (*dest*, or *fallback* when offline).
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        meta = read_metadata(dest) if dest.exists() else None
+
+        if meta is not None and not self._cache_intact(dest, meta, sha256):
+            meta = None
+
+        if meta is None and fallback is not None and Path(fallback).exists():
+            meta = self._seed(url, dest, Path(fallback), sha256)
+
+        if meta is not None and not force:
+            now = time.time()
+            age = now - meta.fetched_at
+            if age < self._freshness:
+                logger.info("Using fresh cache: %s (validated %.0fs ago)", dest.name, age)
+                return dest
+            if meta.failed_at and now - meta.failed_at < DOWNLOAD_OFFLINE_RETRY_SECONDS:
+                logger.info(
+                    "Using cached %s (revalidation failed %.0fs ago).",
+                    dest.name,
+                    now - meta.failed_at,
+                )
+                return dest
+
+        try:
+            return self._download(url, dest, meta, sha256)
+        except (httpx.HTTPError, OSError) as exc:
+            if meta is not None:
+                logger.warning(
+                    "Revalidation of %s failed (%s) — using cached copy.", url, exc
+                )
+                meta.failed_at = time.time()
+                _write_metadata(dest, meta)
+                return dest
+            if fallback is not None and Path(fallback).exists():
+                logger.warning(
+                    "Download of %s failed (%s) — using fallback %s.", url, exc, fallback
+                )
+                return Path(fallback)
+            raise
+
+    # --- Internals ---
+
+    @staticmethod
+    def _seed(
+        url: str, dest: Path, source: Path, expected: str | None
+    ) -> CacheMetadata | None:
+        """Install a local copy of *url* as the (stale) cache entry *dest*.
+
+        The entry carries *source*'s mtime as ``Last-Modified`` and is
+        revalidated on the next fetch.
+        """
+        try:
+            digest, size = _sha256_file(source)
+            if expected and digest != expected.lower():
+                logger.warning("Local copy %s failed checksum — not seeding.", source)
+                return None
+            _install(source, dest)
+            last_modified = formatdate(source.stat().st_mtime, usegmt=True)
+        except (OSError, EOFError, gzip.BadGzipFile) as exc:
+            logger.warning("Could not seed %s from %s: %s", dest.name, source, exc)
+            return None
+        meta = CacheMetadata(
+            url=url,
+            sha256=digest,
+            size=size,
+            fetched_at=0.0,
+            last_modified=last_modified,
+        )
+        _write_metadata(dest, meta)
+        logger.info("Seeded %s from %s.", dest.name, source)
+        return meta
+
+    @staticmethod
+    def _cache_intact(dest: Path, meta: CacheMetadata, expected: str | None) -> bool:
+        """Verify the cached file against its recorded (and expected) digest.
+
+        The file is re-hashed only when its size or mtime differs from the
+        stamp taken when it was written or last verified.
+        """
+        if expected and expected.lower() != meta.sha256:
+            logger.warning("Cached %s has another checksum — re-downloading.", dest.name)
+            return False
+        try:
+            stat = dest.stat()
+            if meta.disk_size == stat.st_size and meta.mtime == stat.st_mtime:
+                return True
+            digest, _ = _sha256_file(dest)
+        except (OSError, EOFError, gzip.BadGzipFile) as exc:
+            logger.warning("Cached %s unreadable (%s) — re-downloading.", dest.name, exc)
+            return False
+        if digest != meta.sha256:
+            logger.warning("Cached %s failed checksum — re-downloading.", dest.name)
+            return False
+        _write_metadata(dest, meta)  # verified: refresh the stamp
+        return True
+
+    def _download(
+        self,
+        url: str,
+        dest: Path,
+        meta: CacheMetadata | None,
+        expected_sha256: str | None,
+    ) -> Path:
+        """Conditional GET with resume; finalize into the compressed cache."""
+        part = _part_path(dest)
+        part_meta = read_metadata(part)  # validators of the partial body
+        response_headers: httpx.Headers | None = None
+        delay = 1.0
+        timeout = httpx.Timeout(
+            self._timeout, connect=min(self._timeout, DOWNLOAD_CONNECT_TIMEOUT)
+        )
+
+        for attempt in range(1, self._max_attempts + 1):
+            offset = part.stat().st_size if part.exists() else 0
+            headers = {"Accept-Encoding": ACCEPT_ENCODING}
+
+            if offset and part_meta is not None:
+                # Ranges address the identity representation, so resume
+                # without transfer compression.
+                headers["Accept-Encoding"] = "identity"
+                headers["Range"] = f"bytes={offset}-"
+                if part_meta.etag or part_meta.last_modified:
+                    headers["If-Range"] = part_meta.etag or part_meta.last_modified or ""
+            else:
+                offset = 0
+                headers.update(_conditional_headers(dest, meta))
+
+            try:
+                with self._client.stream(
+                    "GET", url, headers=headers, timeout=timeout
+                ) as resp:
+                    if resp.status_code == 304 and meta is not None:
+                        meta.fetched_at = time.time()
+                        meta.failed_at = None
+                        _write_metadata(dest, meta)
+                        logger.info("Not modified (304): %s", dest.name)
+                        return dest
+                    if resp.status_code == 416:
+                        logger.warning("Range not satisfiable — restarting %s.", dest.name)
+                        part.unlink(missing_ok=True)
+                        part_meta = None
+                        continue
+                    resp.raise_for_status()
+
+                    response_headers = resp.headers
+                    resumed = resp.status_code == 206
+                    if not resumed:
+                        offset = 0
+                    part_meta = CacheMetadata(
+                        url=url,
+                        sha256="",
+                        size=0,
+                        fetched_at=time.time(),
+                        etag=resp.headers.get("etag"),
+                        last_modified=resp.headers.get("last-modified"),
+                    )
+                    _write_metadata(part, part_meta)
+
+                    expected_total = _expected_total(resp, offset)
+                    if resumed:
+                        logger.info("Resuming %s at %d bytes.", dest.name, offset)
+                    else:
+                        logger.info("Downloading %s ...", url)
+
+                    with open(part, "ab" if resumed else "wb") as f:
+                        for chunk in resp.iter_bytes(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            f.write(chunk)
+
+                received = part.stat().st_size
+                if expected_total is not None and received != expected_total:
+                    raise httpx.ReadError(
+                        f"incomplete body: {received}/{expected_total} bytes"
+                    )
+                break
+            except httpx.TransportError as exc:
+                # No connectivity while a usable cache exists: don't retry
+                offline = isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout))
+                if attempt == self._max_attempts or (offline and meta is not None):
+                    raise
+                logger.warning(
+                    "Download of %s interrupted (attempt %d/%d): %s — retrying in %.1fs",
+                    dest.name,
+                    attempt,
+                    self._max_attempts,
+                    exc,
+                    delay,
+                )
+                time.sleep(delay)
+                delay *= 2
+        else:
+            raise httpx.HTTPError(f"Download of {url} failed after {self._max_attempts} attempts")
+
+        return self._finalize(url, dest, part, response_headers, expected_sha256)
+
+    @staticmethod
+    def _finalize(
+        url: str,
+        dest: Path,
+        part: Path,
+        headers: httpx.Headers | None,
+        expected_sha256: str | None,
+    ) -> Path:
+        """Verify the completed ``.part`` file and move it into the cache."""
+        digest, size = _sha256_file(part)
+        if expected_sha256 and digest != expected_sha256.lower():
+            part.unlink(missing_ok=True)
+            _meta_path(part).unlink(missing_ok=True)
+            raise ChecksumMismatchError(
+                f"Checksum mismatch for {url}: expected {expected_sha256}, got {digest}"
+            )
+
+        _install(part, dest)
+
+        _write_metadata(
+            dest,
+            CacheMetadata(
+                url=url,
+                sha256=digest,
+                size=size,
+                fetched_at=time.time(),
+                etag=headers.get("etag") if headers else None,
+                last_modified=headers.get("last-modified") if headers else None,
+            ),
+        )
+        part.unlink(missing_ok=True)
+        _meta_path(part).unlink(missing_ok=True)
+
+        logger.info(
+            "Saved %s (%.1f MB, %.1f MB on disk, sha256=%s…)",
+            dest.name,
+            size / (1024 * 1024),
+            dest.stat().st_size / (1024 * 1024),
+            digest[:12],
+        )
+        return dest
+
+
+# ──────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────
+
+
+def _install(source: Path, dest: Path) -> None:
+    """Atomically copy *source* to *dest*, gzip-compressing for ``.gz``."""
+    tmp = dest.with_name(dest.name + ".tmp")
+    if dest.suffix == ".gz":
+        opener = gzip.open if _is_gzip(source) else open
+        with opener(source, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as out:
+            shutil.copyfileobj(src, out, DOWNLOAD_CHUNK_SIZE * 16)
+    else:
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, dest)
+
+
+def _conditional_headers(dest: Path, meta: CacheMetadata | None) -> dict[str, str]:
+    """Build revalidation headers for an existing cache entry."""
+    if meta is None:
+        return {}
+    headers: dict[str, str] = {}
+    if meta.etag:
+        headers["If-None-Match"] = meta.etag
+    if meta.last_modified:
+        headers["If-Modified-Since"] = meta.last_modified
+    elif dest.exists():
+        headers["If-Modified-Since"] = formatdate(dest.stat().st_mtime, usegmt=True)
+    return headers
+
+
+def _expected_total(resp: httpx.Response, offset: int) -> int | None:
+    """Total size of the identity body, when the response lets us know it."""
+    content_range = resp.headers.get("content-range", "")
+    if resp.status_code == 206 and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    encoding = resp.headers.get("content-encoding", "identity").lower()
+    length = resp.headers.get("content-length")
+    if encoding == "identity" and length and length.isdigit():
+        return offset + int(length)
+    return None
@@ -16,23 +16,19 @@ Usage:
 
 from __future__ import annotations
 
-import json
 import logging
 from pathlib import Path
 from typing import Any
 
-import requests
-from requests.adapters import HTTPAdapter
 from stix2 import MemoryStore, Filter
-from urllib3.util.retry import Retry
 
 from src.config import (
     DEFAULT_STIX_CACHE_PATH,
-    DOWNLOAD_CHUNK_SIZE,
     STIX_DOWNLOAD_TIMEOUT,
     STIX_FILTERS,
     STIX_GITHUB_URL,
 )
+from src.layers.download_manager import DownloadManager, read_cached_json
 
 logger = logging.getLogger(__name__)
 
@@ -46,57 +42,61 @@ def download_stix_bundle(
     url: str = STIX_GITHUB_URL,
     cache_path: Path = DEFAULT_STIX_CACHE_PATH,
     force: bool = False,
+    downloader: DownloadManager | None = None,
 ) -> Path:
     """Download the enterprise-attack STIX bundle and cache locally.
 
+    The bundle is cached gzip-compressed and revalidated with
+    ETag/Last-Modified, so an unchanged bundle costs a 304.  A legacy
+    uncompressed cache seeds the compressed one.
+
     Args:
         url: GitHub raw URL for enterprise-attack.json.
-        cache_path: Local file path to save the bundle.
-        force: Re-download even if cached file exists.
+        cache_path: Local cache path (compressed when it ends in ``.gz``).
+        force: Revalidate even if the cache is within its freshness window.
+        downloader: Optional DownloadManager (defaults to the shared client).
 
     Returns:
         Path to the local cached file.
     """
-    if cache_path.exists() and not force:
-        size_mb = cache_path.stat().st_size / (1024 * 1024)
-        logger.info("Using cached STIX bundle: %s (%.1f MB)", cache_path, size_mb)
-        return cache_path
-
-    logger.info("Downloading STIX bundle from %s ...", url)
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Retry transient failures (429, 500, 502, 503, 504) with backoff
-    session = requests.Session()
-    retries = Retry(total=3, backoff_factor=1.0, status_forcelist=[429, 500, 502, 503, 504])
-    session.mount("https://", HTTPAdapter(max_retries=retries))
-    session.mount("http://", HTTPAdapter(max_retries=retries))
-
-    response = session.get(url, timeout=STIX_DOWNLOAD_TIMEOUT, stream=True)
-    response.raise_for_status()
-
-    total_bytes = 0
-    with open(cache_path, "wb") as f:
-        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
-            f.write(chunk)
-            total_bytes += len(chunk)
-
-    size_mb = total_bytes / (1024 * 1024)
-    logger.info("Downloaded %.1f MB → %s", size_mb, cache_path)
+    downloader = downloader or DownloadManager(timeout=STIX_DOWNLOAD_TIMEOUT)
+    return downloader.fetch(url, cache_path, force=force, fallback=_legacy_path(cache_path))
+
+
+def local_stix_bundle(cache_path: Path = DEFAULT_STIX_CACHE_PATH) -> Path:
+    """Return the cached STIX bundle without touching the network.
+
+    Prefers the compressed cache and falls back to a legacy uncompressed
+    ``enterprise-attack.json`` next to it.
+
+    Args:
+        cache_path: Compressed cache path.
+
+    Returns:
+        Path to the cached bundle (*cache_path* when neither file exists).
+    """
+    legacy = _legacy_path(cache_path)
+    if not cache_path.exists() and legacy is not None and legacy.exists():
+        return legacy
     return cache_path
 
 
+def _legacy_path(cache_path: Path) -> Path | None:
+    """Uncompressed pre-``.gz`` cache location for *cache_path*."""
+    return cache_path.with_suffix("") if cache_path.suffix == ".gz" else None
+
+
 def load_stix_store(path: Path) -> MemoryStore:
     """Load a STIX JSON bundle file into a MemoryStore.
 
     Args:
-        path: Path to enterprise-attack.json.
+        path: Path to enterprise-attack.json (plain or gzip-compressed).
 
     Returns:
         stix2.MemoryStore populated with all STIX objects.
     """
     logger.info("Loading STIX bundle from %s ...", path)
-    with open(path, "r", encoding="utf-8") as f:
-        bundle = json.load(f)
+    bundle = read_cached_json(path)
 
     objects = bundle.get("objects", [])
     src = MemoryStore(stix_data=objects, allow_custom=True)
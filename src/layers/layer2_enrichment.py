@@ -14,20 +14,19 @@ Usage:
 
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
-import httpx
-
 from src.config import (
     DEFAULT_GALAXY_CACHE_DIR,
     GALAXY_BASE_URL,
     GALAXY_DOWNLOAD_TIMEOUT,
     GALAXY_FILES,
 )
+from src.layers.download_manager import DownloadManager, content_digest, read_cached_json
 
 logger = logging.getLogger(__name__)
 
@@ -40,13 +39,19 @@ logger = logging.getLogger(__name__)
 class GalaxyManager:
     """Downloads, caches, and provides lookup access to MISP Galaxy data.
 
-    Galaxy cluster files are downloaded once from GitHub and cached locally.
-    Subsequent loads read from the cache directory.
+    Galaxy cluster files are downloaded from GitHub and cached locally
+    (gzip-compressed).  Subsequent loads read from the cache directory and
+    revalidate it with conditional requests once it goes stale.
     """
 
-    def __init__(self, cache_dir: str | Path | None = None) -> None:
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        downloader: DownloadManager | None = None,
+    ) -> None:
         self._cache_dir = Path(cache_dir) if cache_dir else DEFAULT_GALAXY_CACHE_DIR
         self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._downloader = downloader or DownloadManager(timeout=GALAXY_DOWNLOAD_TIMEOUT)
 
         # Lookup indexes: technique_id → list of related items
         self._attack_patterns: dict[str, dict[str, Any]] = {}
@@ -54,38 +59,33 @@ class GalaxyManager:
         self._intrusion_sets: dict[str, list[dict[str, Any]]] = {}
         self._tools: dict[str, list[dict[str, Any]]] = {}
         self._malware: dict[str, list[dict[str, Any]]] = {}
+        # Graph export: galaxy_key → list of cluster records (one per value)
+        self._clusters: dict[str, list[dict[str, Any]]] = {}
+        self._version = ""
         self._loaded = False
 
     # --- Download ---
 
     def download_file(self, galaxy_key: str, force: bool = False) -> Path:
-        """Download a single galaxy file from GitHub.
+        """Download (or revalidate) a single galaxy file from GitHub.
 
         Args:
             galaxy_key: Key from GALAXY_FILES dict (e.g. 'attack_pattern').
-            force: Re-download even if cached file exists.
+            force: Revalidate even if the cache is within its freshness window.
 
         Returns:
-            Path to the cached file.
+            Path to the cached file.  A missing cache is seeded from the
+            uncompressed copy shipped in the cache directory, so loading
+            never waits on the network when that copy exists.
         """
         filename = GALAXY_FILES[galaxy_key]
-        local_path = self._cache_dir / filename
-
-        if local_path.exists() and not force:
-            logger.info("Galaxy file already cached: %s", local_path.name)
-            return local_path
-
         url = f"{GALAXY_BASE_URL}/{filename}"
-        logger.info("Downloading %s ...", url)
-
-        with httpx.Client(timeout=GALAXY_DOWNLOAD_TIMEOUT, follow_redirects=True) as client:
-            resp = client.get(url)
-            resp.raise_for_status()
-            local_path.write_bytes(resp.content)
-
-        size_mb = local_path.stat().st_size / (1024 * 1024)
-        logger.info("Saved %s (%.1f MB)", local_path.name, size_mb)
-        return local_path
+        return self._downloader.fetch(
+            url,
+            self._cache_dir / f"{filename}.gz",
+            force=force,
+            fallback=self._cache_dir / filename,
+        )
 
     def download_all(self, force: bool = False) -> dict[str, Path]:
         """Download all required galaxy files in parallel.
@@ -140,12 +140,55 @@ class GalaxyManager:
 
         return ids
 
+    def _resolve_related_techniques(self, cluster_value: dict[str, Any]) -> list[str]:
+        """Resolve a cluster's ``uses`` relations to ATT&CK technique IDs.
+
+        Relations reference attack-pattern UUIDs, so attack patterns must
+        be parsed first to populate the reverse index.
+        """
+        technique_ids: list[str] = []
+        for rel in cluster_value.get("related", []):
+            dest_uuid = rel.get("dest-uuid", "")
+            if rel.get("type", "") == "uses" and dest_uuid:
+                tid = self._uuid_to_tid.get(dest_uuid)
+                if tid and tid not in technique_ids:
+                    technique_ids.append(tid)
+        return technique_ids
+
+    def _add_cluster(
+        self,
+        galaxy_key: str,
+        cluster_value: dict[str, Any],
+        technique_ids: list[str],
+    ) -> None:
+        """Record one galaxy cluster value for export to the knowledge graph."""
+        meta = cluster_value.get("meta", {})
+        external_id = meta.get("external_id", "")
+        if isinstance(external_id, list):
+            external_id = external_id[0] if external_id else ""
+
+        # Galaxy values are named "<Name> - <ATT&CK ID>"; strip the suffix
+        # so the name lines up with the STIX object name in Neo4j.
+        name = cluster_value.get("value", "")
+        if external_id and name.endswith(f" - {external_id}"):
+            name = name[: -len(f" - {external_id}")]
+
+        self._clusters.setdefault(galaxy_key, []).append({
+            "uuid": cluster_value.get("uuid", ""),
+            "name": name,
+            "external_id": external_id,
+            "description": cluster_value.get("description", ""),
+            "aliases": meta.get("synonyms", []),
+            "country": meta.get("country", ""),
+            "technique_ids": technique_ids,
+        })
+
     def _parse_attack_patterns(self, path: Path) -> int:
         """Parse mitre-attack-pattern.json into lookup dict.
 
         Builds: self._attack_patterns[technique_id] = {name, description, ...}
         """
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = read_cached_json(path)
         count = 0
         for val in data.get("values", []):
             technique_ids = self._extract_attack_ids(val)
@@ -173,7 +216,7 @@ class GalaxyManager:
         MISP galaxy intrusion-set values have 'related' entries that
         reference attack-pattern UUIDs. We cross-reference these.
         """
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = read_cached_json(path)
         count = 0
         for val in data.get("values", []):
             group_info = {
@@ -185,20 +228,17 @@ class GalaxyManager:
             }
 
             # Map this group to techniques via 'related' cross-references
-            for rel in val.get("related", []):
-                dest_uuid = rel.get("dest-uuid", "")
-                rel_type = rel.get("type", "")
-                if rel_type == "uses" and dest_uuid:
-                    tid = self._uuid_to_tid.get(dest_uuid)
-                    if tid:
-                        self._intrusion_sets.setdefault(tid, []).append(group_info)
-                        count += 1
+            technique_ids = self._resolve_related_techniques(val)
+            for tid in technique_ids:
+                self._intrusion_sets.setdefault(tid, []).append(group_info)
+                count += 1
+            self._add_cluster("intrusion_set", val, technique_ids)
         logger.info("Indexed %d intrusion-set→technique links.", count)
         return count
 
     def _parse_tools(self, path: Path) -> int:
         """Parse mitre-tool.json into technique → tools lookup."""
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = read_cached_json(path)
         count = 0
         for val in data.get("values", []):
             tool_info = {
@@ -206,20 +246,17 @@ class GalaxyManager:
                 "description": val.get("description", ""),
                 "uuid": val.get("uuid", ""),
             }
-            for rel in val.get("related", []):
-                dest_uuid = rel.get("dest-uuid", "")
-                rel_type = rel.get("type", "")
-                if rel_type == "uses" and dest_uuid:
-                    tid = self._uuid_to_tid.get(dest_uuid)
-                    if tid:
-                        self._tools.setdefault(tid, []).append(tool_info)
-                        count += 1
+            technique_ids = self._resolve_related_techniques(val)
+            for tid in technique_ids:
+                self._tools.setdefault(tid, []).append(tool_info)
+                count += 1
+            self._add_cluster("tool", val, technique_ids)
         logger.info("Indexed %d tool→technique links.", count)
         return count
 
     def _parse_malware(self, path: Path) -> int:
         """Parse mitre-malware.json into technique → malware lookup."""
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = read_cached_json(path)
         count = 0
         for val in data.get("values", []):
             mal_info = {
@@ -227,14 +264,11 @@ class GalaxyManager:
                 "description": val.get("description", ""),
                 "uuid": val.get("uuid", ""),
             }
-            for rel in val.get("related", []):
-                dest_uuid = rel.get("dest-uuid", "")
-                rel_type = rel.get("type", "")
-                if rel_type == "uses" and dest_uuid:
-                    tid = self._uuid_to_tid.get(dest_uuid)
-                    if tid:
-                        self._malware.setdefault(tid, []).append(mal_info)
-                        count += 1
+            technique_ids = self._resolve_related_techniques(val)
+            for tid in technique_ids:
+                self._malware.setdefault(tid, []).append(mal_info)
+                count += 1
+            self._add_cluster("malware", val, technique_ids)
         logger.info("Indexed %d malware→technique links.", count)
         return count
 
@@ -249,16 +283,27 @@ class GalaxyManager:
         paths = self.download_all(force=force_download)
 
         # Parse attack patterns FIRST (needed for UUID cross-references)
+        self._clusters = {}
         counts: dict[str, int] = {}
         counts["attack_patterns"] = self._parse_attack_patterns(paths["attack_pattern"])
         counts["intrusion_sets"] = self._parse_intrusion_sets(paths["intrusion_set"])
         counts["tools"] = self._parse_tools(paths["tool"])
         counts["malware"] = self._parse_malware(paths["malware"])
 
+        digest = hashlib.sha256()
+        for key in sorted(paths):
+            digest.update(f"{key}:{content_digest(paths[key])}\n".encode("utf-8"))
+        self._version = digest.hexdigest()
+
         self._loaded = True
         logger.info("Galaxy data loaded: %s", counts)
         return counts
 
+    @property
+    def version(self) -> str:
+        """Content digest of the loaded galaxy files ('' before ``load_all``)."""
+        return self._version
+
     # --- Lookup Methods ---
 
     def _ensure_loaded(self) -> None:
@@ -334,6 +379,39 @@ class GalaxyManager:
             "malware": self.get_malware_for_technique(technique_id),
         }
 
+    # --- Graph Export ---
+
+    def cluster_records(self) -> dict[str, list[dict[str, Any]]]:
+        """Return galaxy clusters in a loader-friendly shape.
+
+        Used by ``src.graph.loader.load_galaxy`` to write clusters and their
+        technique links into Neo4j.
+
+        Returns:
+            Dict mapping galaxy_key ('intrusion_set', 'tool', 'malware') to
+            a list of dicts with uuid, name, external_id, description,
+            aliases, country, technique_ids.
+        """
+        self._ensure_loaded()
+        return {key: list(records) for key, records in self._clusters.items()}
+
+    def attack_pattern_records(self) -> list[dict[str, Any]]:
+        """Return attack-pattern galaxy metadata keyed by technique ID.
+
+        Returns:
+            List of dicts with technique_id, uuid, name, refs.
+        """
+        self._ensure_loaded()
+        return [
+            {
+                "technique_id": tid,
+                "uuid": ap.get("uuid", ""),
+                "name": ap.get("name", ""),
+                "refs": ap.get("meta", {}).get("refs", []),
+            }
+            for tid, ap in self._attack_patterns.items()
+        ]
+
     # --- Stats ---
 
     def stats(self) -> dict[str, int]:
@@ -0,0 +1,139 @@
+"""Layer 3 — Persistent Phase A research cache.
+
+Phase A (the tool-calling exploration) is the most expensive step of a
+generation request, yet identical ``(category, platform)`` requests against
+an unchanged graph repeat it every time.  ``ResearchCache`` stores Phase A
+outputs (reasoning text, tool-call log, token usage) in a small SQLite
+database, keyed by everything that could change the research:
+
+    category, platform, LLM model, Phase A prompt version, graph version,
+    MISP Galaxy version
+
+Entries expire after a TTL and the table is bounded to ``max_entries``
+(least-recently-used entries are evicted first).
+
+Usage:
+    from src.layers.layer3_cache import ResearchCache, make_cache_key
+
+    cache = ResearchCache()
+    key = make_cache_key(category="credential_access", platform="windows", ...)
+    entry = cache.get(key)
+    if entry is None:
+        cache.put(key, {"text": ..., "tool_calls": [...]})
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from src.config import RESEARCH_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS research (
+    key        TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    last_used  REAL NOT NULL,
+    payload    TEXT NOT NULL
+)
+"""
+
+
+def make_cache_key(**parts: Any) -> str:
+    """Build a stable cache key from named parts (order-independent)."""
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResearchCache:
+    """SQLite-backed Phase A cache with TTL and LRU size bound.
+
+    Every operation opens its own short-lived connection, so one instance
+    can be shared by concurrent requests (SQLite serialises the writes).
+
+    Args:
+        path: SQLite database file (created with parent directories).
+        ttl_seconds: Entry lifetime; expired entries are treated as misses.
+        max_entries: Maximum rows kept; least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = RESEARCH_CACHE_PATH,
+        ttl_seconds: float = 86400,
+        max_entries: int = 256,
+    ) -> None:
+        self._path = Path(path)
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.execute(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection, commit on success, always close."""
+        db = sqlite3.connect(self._path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached payload for *key*, or ``None`` on miss/expiry."""
+        now = time.time()
+        try:
+            with self._connect() as db:
+                row = db.execute(
+                    "SELECT created_at, payload FROM research WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                created_at, payload = row
+                if now - created_at > self._ttl:
+                    db.execute("DELETE FROM research WHERE key = ?", (key,))
+                    logger.info("Research cache entry expired: %s", key[:12])
+                    return None
+                db.execute(
+                    "UPDATE research SET last_used = ? WHERE key = ?", (now, key)
+                )
+            return json.loads(payload)
+        except (sqlite3.Error, json.JSONDecodeError) as exc:
+            logger.warning("Research cache read failed (%s) — treating as miss", exc)
+            return None
+
+    def put(self, key: str, payload: dict[str, Any]) -> None:
+        """Store *payload* under *key* and evict beyond ``max_entries``."""
+        now = time.time()
+        try:
+            with self._connect() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO research (key, created_at, last_used, payload) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, now, now, json.dumps(payload, default=str)),
+                )
+                db.execute(
+                    "DELETE FROM research WHERE created_at < ?", (now - self._ttl,)
+                )
+                db.execute(
+                    "DELETE FROM research WHERE key NOT IN "
+                    "(SELECT key FROM research ORDER BY last_used DESC LIMIT ?)",
+                    (self._max_entries,),
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Research cache write failed: %s", exc)
+
+    def clear(self) -> int:
+        """Delete every entry.  Returns the number of rows removed."""
+        with self._connect() as db:
+            return db.execute("DELETE FROM research").rowcount
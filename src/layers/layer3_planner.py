@@ -0,0 +1,431 @@
+"""Layer 3 — Graph-first technique planner.
+
+Deterministic alternative to the Phase A tool loop.  Instead of letting the
+LLM browse the knowledge graph over several function-calling round trips,
+the planner:
+
+    1. Pulls every technique / sub-technique for the category's tactics
+       (``CATEGORY_TO_TACTICS``) that runs on the requested platform
+       (``PLATFORM_TO_ATTACK_PLATFORMS``) in ONE Cypher query.
+    2. Scores them on platform fit and real-world prevalence
+       (groups, campaigns, software using the technique).
+    3. Greedily selects a diverse set (penalises picks that share a parent
+       technique, prefers covering every tactic of the category).
+    4. Renders the prefetched intel as a compact, structured research
+       context that Phase B consumes directly.
+
+In the agentic mode the same planner binds the techniques Phase A chose
+to ability slots (``TechniquePlanner.assign``): IDs are validated against
+the graph, deduplicated, and the pool is backfilled from the scored
+candidates when Phase A selected too few.
+
+Usage:
+    from src.layers.layer3_planner import TechniquePlanner, build_planned_context
+
+    planner = TechniquePlanner(conn)
+    picks = planner.select("credential_access", "windows", count=3)
+    assignment = planner.assign(["T1003.001", "T1003.001"], "credential_access",
+                                "windows", count=3)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.config import (
+    CATEGORY_TO_TACTICS,
+    MAX_DETECTION_TEXT_LEN,
+    PLANNER_DIVERSITY_PENALTY,
+    PLANNER_MAX_LIST_ITEMS,
+    PLANNER_PLATFORM_WEIGHT,
+    PLANNER_PREVALENCE_WEIGHT,
+    PLANNER_SUBTECHNIQUE_BONUS,
+    PLATFORM_TO_ATTACK_PLATFORMS,
+)
+from src.graph.connection import Neo4jConnection
+from src.tools.cti_tools import CTITools
+
+logger = logging.getLogger(__name__)
+
+
+# ──────────────────────────────────────────────────────────────
+# Candidate model
+# ──────────────────────────────────────────────────────────────
+
+
+@dataclass
+class TechniqueCandidate:
+    """A technique the planner may assign to an ability slot."""
+
+    attack_id: str
+    name: str
+    is_subtechnique: bool = False
+    platforms: list[str] = field(default_factory=list)
+    tactics: list[str] = field(default_factory=list)
+    group_count: int = 0
+    campaign_count: int = 0
+    software_count: int = 0
+    score: float = 0.0
+
+    @property
+    def parent_id(self) -> str:
+        """Parent technique ID (the ID itself for non-sub-techniques)."""
+        return self.attack_id.split(".", 1)[0]
+
+    @property
+    def prevalence(self) -> float:
+        """Raw prevalence signal — campaigns weigh most, software least."""
+        return (
+            math.log1p(self.group_count)
+            + 1.5 * math.log1p(self.campaign_count)
+            + 0.5 * math.log1p(self.software_count)
+        )
+
+
+@dataclass
+class TechniqueAssignment:
+    """Result of binding techniques to ability slots."""
+
+    technique_ids: list[str] = field(default_factory=list)  # one per slot
+    backfilled: list[str] = field(default_factory=list)  # added from the graph
+    rejected: list[str] = field(default_factory=list)  # not found in the graph
+
+
+# ──────────────────────────────────────────────────────────────
+# Planner
+# ──────────────────────────────────────────────────────────────
+
+
+class TechniquePlanner:
+    """Deterministic technique selection straight from the knowledge graph.
+
+    Args:
+        conn: Active Neo4j connection (shared, not owned).
+    """
+
+    def __init__(self, conn: Neo4jConnection) -> None:
+        self._cti = CTITools(conn=conn)
+
+    def candidates(self, category: str, platform: str) -> list[TechniqueCandidate]:
+        """Return all scored candidates for a category/platform, best first.
+
+        Args:
+            category: Attack category value (e.g. 'credential_access').
+            platform: Platform enum value (e.g. 'windows').
+
+        Returns:
+            Candidates sorted by descending score (ties by ATT&CK ID).
+        """
+        tactics = CATEGORY_TO_TACTICS.get(category, [])
+        attack_platforms = PLATFORM_TO_ATTACK_PLATFORMS.get(platform, [])
+        if not tactics or not attack_platforms:
+            logger.warning(
+                "Planner has no tactic/platform mapping for category=%s platform=%s",
+                category,
+                platform,
+            )
+            return []
+
+        rows = self._cti.get_technique_candidates(tactics, attack_platforms)
+        candidates = [
+            TechniqueCandidate(
+                attack_id=row["attack_id"],
+                name=row.get("name") or "",
+                is_subtechnique=bool(row.get("is_subtechnique")),
+                platforms=row.get("platforms") or [],
+                tactics=row.get("tactics") or [],
+                group_count=row.get("group_count") or 0,
+                campaign_count=row.get("campaign_count") or 0,
+                software_count=row.get("software_count") or 0,
+            )
+            for row in rows
+            if row.get("attack_id")
+        ]
+        _score_candidates(candidates, set(attack_platforms))
+        candidates.sort(key=lambda c: (-c.score, c.attack_id))
+        return candidates
+
+    def select(
+        self,
+        category: str,
+        platform: str,
+        count: int,
+    ) -> list[TechniqueCandidate]:
+        """Pick ``count`` diverse, high-scoring techniques.
+
+        Returns:
+            Up to ``count`` candidates in slot order (may be shorter if the
+            graph has fewer matching techniques).
+        """
+        tactics = CATEGORY_TO_TACTICS.get(category, [])
+        picks = select_diverse(self.candidates(category, platform), count, tactics)
+        logger.info(
+            "Planner selected %d/%d techniques for %s/%s: %s",
+            len(picks),
+            count,
+            category,
+            platform,
+            [c.attack_id for c in picks],
+        )
+        return picks
+
+
+    def assign(
+        self,
+        selected_ids: list[str],
+        category: str,
+        platform: str,
+        count: int,
+    ) -> TechniqueAssignment:
+        """Bind one distinct, graph-verified technique to each ability slot.
+
+        Args:
+            selected_ids: Technique IDs chosen by Phase A, in preference order.
+            category: Attack category value.
+            platform: Platform enum value.
+            count: Number of ability slots.
+
+        Returns:
+            ``TechniqueAssignment`` whose ``technique_ids`` has ``count``
+            distinct IDs, or fewer if the graph itself runs out.
+        """
+        assignment = TechniqueAssignment()
+
+        unique_ids = list(dict.fromkeys(selected_ids))
+
+        try:
+            known = {
+                row["attack_id"] for row in self._cti.get_techniques_by_ids(unique_ids)
+            }
+        except Exception as exc:
+            logger.warning("Technique ID validation failed, trusting Phase A: %s", exc)
+            known = set(unique_ids)
+
+        pool = [tid for tid in unique_ids if tid in known]
+        assignment.rejected = [tid for tid in unique_ids if tid not in known]
+        assignment.technique_ids = pool[:count]
+
+        if len(assignment.technique_ids) < count:
+            try:
+                candidates = [
+                    c for c in self.candidates(category, platform)
+                    if c.attack_id not in pool
+                ]
+            except Exception as exc:
+                logger.warning("Backfill candidate lookup failed: %s", exc)
+                candidates = []
+            extra = select_diverse(
+                candidates,
+                count - len(assignment.technique_ids),
+                CATEGORY_TO_TACTICS.get(category, []),
+                already_selected=assignment.technique_ids,
+            )
+            assignment.backfilled = [c.attack_id for c in extra]
+            assignment.technique_ids += assignment.backfilled
+
+        logger.info(
+            "Assigned %d/%d techniques: %s (backfilled=%s, rejected=%s)",
+            len(assignment.technique_ids),
+            count,
+            assignment.technique_ids,
+            assignment.backfilled,
+            assignment.rejected,
+        )
+        return assignment
+
+
+# ──────────────────────────────────────────────────────────────
+# Scoring & selection
+# ──────────────────────────────────────────────────────────────
+
+
+def _score_candidates(
+    candidates: list[TechniqueCandidate],
+    wanted_platforms: set[str],
+) -> None:
+    """Set ``score`` on each candidate (in place).
+
+    * prevalence — normalised against the most prevalent candidate
+    * platform fit — share of the technique's platforms that are wanted,
+      so platform-specific techniques beat cross-platform generic ones
+    * sub-technique bonus — concrete variants give better executors
+    """
+    if not candidates:
+        return
+    max_prevalence = max(c.prevalence for c in candidates) or 1.0
+    for c in candidates:
+        fit = len(wanted_platforms.intersection(c.platforms)) / max(len(c.platforms), 1)
+        c.score = (
+            PLANNER_PREVALENCE_WEIGHT * (c.prevalence / max_prevalence)
+            + PLANNER_PLATFORM_WEIGHT * fit
+            + (PLANNER_SUBTECHNIQUE_BONUS if c.is_subtechnique else 0.0)
+        )
+
+
+def select_diverse(
+    candidates: list[TechniqueCandidate],
+    count: int,
+    tactics: list[str] | None = None,
+    already_selected: list[str] | None = None,
+) -> list[TechniqueCandidate]:
+    """Greedy diverse selection over scored candidates.
+
+    Each pick multiplies the score of remaining candidates that share its
+    parent technique by ``PLANNER_DIVERSITY_PENALTY``.  While some of
+    ``tactics`` are still uncovered, candidates that cover none of them are
+    penalised the same way.  ``already_selected`` IDs (e.g. Phase A picks
+    being backfilled) count as earlier picks for the parent penalty.
+    Fully deterministic for a given input.
+    """
+    remaining = sorted(candidates, key=lambda c: (-c.score, c.attack_id))
+    picks: list[TechniqueCandidate] = []
+    parent_counts: Counter[str] = Counter(
+        tid.split(".", 1)[0] for tid in already_selected or []
+    )
+    uncovered = set(tactics or [])
+
+    while remaining and len(picks) < count:
+        def _adjusted(c: TechniqueCandidate) -> float:
+            value = c.score * PLANNER_DIVERSITY_PENALTY ** parent_counts[c.parent_id]
+            if uncovered and not uncovered.intersection(c.tactics):
+                value *= PLANNER_DIVERSITY_PENALTY
+            return value
+
+        # max() keeps the first of equal values → ties go to the sorted order
+        best = max(remaining, key=_adjusted)
+        remaining.remove(best)
+        picks.append(best)
+        parent_counts[best.parent_id] += 1
+        uncovered.difference_update(best.tactics)
+
+    return picks
+
+
+# ──────────────────────────────────────────────────────────────
+# Context rendering
+# ──────────────────────────────────────────────────────────────
+
+
+def compact_intel(intel: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a ``get_technique_intel`` result to the fields Phase B uses.
+
+    Lists are capped at ``PLANNER_MAX_LIST_ITEMS`` (with a ``*_total``
+    count when truncated), long texts at ``MAX_DETECTION_TEXT_LEN``, and
+    empty fields are dropped.
+    """
+    cap = PLANNER_MAX_LIST_ITEMS
+
+    def _capped(
+        key: str, values: list[Any], out: dict[str, Any], total: int = 0
+    ) -> None:
+        # ``total`` carries the size of a list already cut by tool projection
+        if not values:
+            return
+        out[key] = values[:cap]
+        total = max(total, len(values))
+        if total > len(out[key]):
+            out[f"{key}_total"] = total
+
+    detection = intel.get("detection") or {}
+    galaxy = intel.get("misp_galaxy") or {}
+
+    compact: dict[str, Any] = {
+        "attack_id": intel.get("attack_id", ""),
+        "name": intel.get("name", ""),
+        "platforms": intel.get("platforms", []),
+        "tactics": intel.get("tactics", []),
+        "description": (intel.get("description") or "")[:MAX_DETECTION_TEXT_LEN],
+    }
+    _capped(
+        "groups",
+        [g.get("group_name") for g in intel.get("groups", [])],
+        compact,
+        intel.get("groups_total", 0),
+    )
+    _capped(
+        "tools",
+        [f"{t.get('name')} ({t.get('type')})" for t in intel.get("tools", [])],
+        compact,
+        intel.get("tools_total", 0),
+    )
+    _capped(
+        "campaigns",
+        [
+            {
+                "name": c.get("campaign_name"),
+                "first_seen": c.get("first_seen"),
+                "last_seen": c.get("last_seen"),
+                "groups": c.get("attributed_groups", []),
+            }
+            for c in intel.get("campaigns", [])
+        ],
+        compact,
+        intel.get("campaigns_total", 0),
+    )
+    if detection.get("detection_text"):
+        compact["detection"] = detection["detection_text"][:MAX_DETECTION_TEXT_LEN]
+    _capped(
+        "data_sources",
+        detection.get("data_sources", []),
+        compact,
+        detection.get("data_sources_total", 0),
+    )
+    _capped(
+        "mitigations",
+        [m.get("mitigation_name") for m in intel.get("mitigations", [])],
+        compact,
+        intel.get("mitigations_total", 0),
+    )
+    _capped(
+        "galaxy_groups",
+        [g.get("name") for g in galaxy.get("groups", []) if g.get("name")],
+        compact,
+        galaxy.get("groups_total", 0),
+    )
+    return {k: v for k, v in compact.items() if v or k == "attack_id"}
+
+
+def build_planned_context(
+    category: str,
+    platform: str,
+    picks: list[TechniqueCandidate],
+    intel_by_id: dict[str, dict[str, Any]],
+) -> str:
+    """Render the planner output as the Phase B research context.
+
+    Args:
+        category: Attack category value.
+        platform: Platform enum value.
+        picks: Selected candidates, in ability slot order.
+        intel_by_id: ``get_technique_intel`` results keyed by ATT&CK ID.
+
+    Returns:
+        Markdown with a slot → technique plan followed by one compact JSON
+        intel block per technique.
+    """
+    lines = [
+        "## Technique Plan (graph-first)",
+        "",
+        f"Category: {category} — Platform: {platform}",
+        "",
+    ]
+    for i, pick in enumerate(picks, start=1):
+        lines.append(f"- Ability #{i} → {pick.attack_id} {pick.name}")
+
+    lines += ["", "## Technique Intel"]
+    for pick in picks:
+        intel = intel_by_id.get(pick.attack_id) or {}
+        if "error" in intel or not intel:
+            intel = {"attack_id": pick.attack_id, "name": pick.name,
+                     "platforms": pick.platforms, "tactics": pick.tactics}
+        lines += [
+            "",
+            f"### {pick.attack_id} — {pick.name}",
+            json.dumps(compact_intel(intel), ensure_ascii=False, default=str),
+        ]
+    return "\n".join(lines)
@@ -4,11 +4,27 @@ Orchestrates the generation of ``Ability`` objects through:
 
     Phase A — **Reasoning with tools**: The LLM explores the MITRE ATT&CK
     knowledge graph (via 4 tool closures), selects techniques, and gathers
-    comprehensive threat intelligence.
+    comprehensive threat intelligence.  With ``GENERATION_MODE=graph_first``
+    the ``TechniquePlanner`` replaces this LLM loop with a deterministic
+    graph query plus bulk intel prefetch.
 
     Phase B — **Structured composition**: For each ability, the LLM receives
-    the Phase A reasoning context and produces a validated ``Ability`` JSON
-    conforming to the Pydantic schema.
+    the Phase A research slice for its assigned technique (see
+    ``layer3_research``) and produces a validated ``Ability`` JSON
+    conforming to the Pydantic schema.  Compositions are independent and
+    run concurrently (bounded by ``PHASE_B_CONCURRENCY``), optionally
+    several per structured call (``PHASE_B_BATCH_SIZE``).  With
+    ``PHASE_B_SCHEMA=slim`` the LLM only writes an ``AbilityDraft`` (name,
+    description, executors); the MITRE mapping and threat intel are filled
+    from the graph while the compositions run.
+
+``agenerate_with_report`` runs the same pipeline on an event loop through
+``LLMClient.agenerate``.
+
+Every ability's ``GenerationTrace`` records per-phase wall-clock time, each
+LLM call (token breakdown, retries, repairs), timed tool calls and the
+cache layers consulted, with tokens attributed per ability (shared Phase A
+and batch calls are split across the abilities they served).
 
 Usage:
     from src.layers.layer3_reasoning import ReasoningEngine
@@ -29,30 +45,107 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
 from pydantic import ValidationError
 
+from src import metrics, tracing
 from src.config import (
     AGENT_VERSION,
     BLOCKLIST_VERSION,
     CATEGORY_TO_TACTICS,
+    PHASE_A_PROMPT_VERSION,
+    PLANNER_PREFETCH_WORKERS,
     SCHEMA_VERSION,
     SYSTEM_PROMPT,
     get_settings,
 )
 from src.graph.connection import Neo4jConnection
 from src.layers.layer2_enrichment import GalaxyManager
+from src.layers.layer3_cache import ResearchCache, make_cache_key
+from src.layers.layer3_planner import (
+    TechniqueAssignment,
+    TechniquePlanner,
+    build_planned_context,
+    compact_intel,
+)
+from src.layers.layer3_research import TechniqueResearch, extract_research
 from src.layers.layer6_safety import SafetyValidator
 from src.llm.base import GenerateResult, LLMClient
-from src.models.ability import Ability, GenerationTrace
+from src.llm.repair import validate_with_repair
+from src.llm.usage import UsageScope, current_usage, timed_tool, track_usage
+from src.models.ability import (
+    Ability,
+    AbilityBatch,
+    AbilityDraft,
+    AbilityDraftBatch,
+    GenerationTrace,
+    LLMCallTrace,
+    MitreMapping,
+    PhaseTimings,
+    ThreatIntelContext,
+    ToolCallTrace,
+)
 from src.models.enums import ApprovalStatus, AttackCategory, Platform
-from src.tools.graph_tools import create_reasoning_tools
+from src.tools.cti_tools import CTITools
+from src.tools.graph_tools import create_dispatch_map, create_reasoning_tools
+from src.tools.misp_tools import MISPTools
 
 logger = logging.getLogger(__name__)
 
+# ──────────────────────────────────────────────────────────────
+# Generation report
+# ──────────────────────────────────────────────────────────────
+
+
+@dataclass
+class GenerationReport:
+    """Outcome of one ``generate_with_report`` request."""
+
+    abilities: list[Ability] = field(default_factory=list)
+    requested: int = 0
+    phase_a_tokens: int = 0
+    phase_b_tokens: int = 0
+    assignment: TechniqueAssignment | None = None
+    research_cached: bool = False  # Phase A served from the research cache
+    phase_seconds: dict[str, float] = field(default_factory=dict)  # wall clock per phase
+    cache: dict[str, str] = field(default_factory=dict)  # cache layer → hit / miss / bypass
+    phase_a_calls: list[LLMCallTrace] = field(default_factory=list)
+    tool_calls: list[ToolCallTrace] = field(default_factory=list)  # timed, live calls only
+
+    @property
+    def total_tokens(self) -> int:
+        """Phase A + Phase B token usage."""
+        return self.phase_a_tokens + self.phase_b_tokens
+
+    @property
+    def unique_techniques(self) -> int:
+        """Number of distinct ATT&CK (sub-)techniques among the abilities."""
+        return len({
+            a.mitre_mapping.sub_technique or a.mitre_mapping.technique
+            for a in self.abilities
+        })
+
+    @property
+    def uniqueness_rate(self) -> float:
+        """Share of produced abilities with a distinct technique (1.0 = no duplicates)."""
+        if not self.abilities:
+            return 0.0
+        return self.unique_techniques / len(self.abilities)
+
+
+# Called with (phase name, report so far) as each generation phase completes
+ProgressCallback = Callable[[str, GenerationReport], None]
+
+
 # ──────────────────────────────────────────────────────────────
 # Reasoning Engine
 # ──────────────────────────────────────────────────────────────
@@ -68,7 +161,9 @@ class ReasoningEngine:
     Args:
         llm: Configured LLM client (Gemini, Groq, or Ollama).
         conn: Optional Neo4j connection. Creates one if not provided.
-        galaxy: Optional GalaxyManager. Creates and loads one if not provided.
+        galaxy: Optional GalaxyManager. If not provided, galaxy data is read
+            from the graph when ``GALAXY_SOURCE=graph``, otherwise one is
+            created and loaded.
     """
 
     def __init__(
@@ -83,14 +178,39 @@ class ReasoningEngine:
         self._conn = conn or Neo4jConnection()
         self._owns_conn = conn is None
 
+        self._galaxy: GalaxyManager | None
         if galaxy is not None:
             self._galaxy = galaxy
+        elif get_settings().galaxy_source == "graph":
+            self._galaxy = None
         else:
             self._galaxy = GalaxyManager()
             self._galaxy.load_all()
 
-        # Create tool closures
-        self._tools = create_reasoning_tools(self._conn, self._galaxy)
+        # Create tool closures (timed into the current usage scope)
+        self._tools = [
+            timed_tool(tool) for tool in create_reasoning_tools(self._conn, self._galaxy)
+        ]
+        self._dispatch = create_dispatch_map(self._tools)
+
+        # Deterministic technique planner (GENERATION_MODE=graph_first)
+        self._planner = TechniquePlanner(self._conn)
+        self._cti = CTITools(conn=self._conn)
+
+        # Deterministic threat intel for slim Phase B drafts (PHASE_B_SCHEMA)
+        self._misp = MISPTools(conn=self._conn, galaxy_manager=self._galaxy)
+
+        # Persistent Phase A research cache (TTL 0 disables it)
+        settings = get_settings()
+        self._research_cache: ResearchCache | None = None
+        if settings.research_cache_ttl_seconds > 0:
+            try:
+                self._research_cache = ResearchCache(
+                    ttl_seconds=settings.research_cache_ttl_seconds,
+                    max_entries=settings.research_cache_max_entries,
+                )
+            except (sqlite3.Error, OSError) as exc:
+                logger.warning("Research cache unavailable (%s) — running without it.", exc)
 
         # Safety validator (shares the graph connection for MITRE lookups)
         self._validator = SafetyValidator(conn=self._conn)
@@ -127,32 +247,75 @@ class ReasoningEngine:
         category: AttackCategory | str,
         platform: Platform | str,
         count: int = 3,
+        fresh_research: bool = False,
     ) -> list[Ability]:
         """Generate attack abilities through the two-phase LLM pipeline.
 
+        Convenience wrapper around ``generate_with_report`` that returns
+        only the abilities.
+
+        Args:
+            category: Attack category (enum or string value).
+            platform: Target platform (enum or string value).
+            count: Number of abilities to generate (default: 3).
+            fresh_research: Bypass the Phase A research cache.
+
+        Returns:
+            List of validated ``Ability`` objects. May be shorter than
+            ``count`` if some abilities fail validation after retries.
+        """
+        return self.generate_with_report(
+            category, platform, count, fresh_research=fresh_research
+        ).abilities
+
+    @tracing.traced("engine.generate")
+    def generate_with_report(
+        self,
+        category: AttackCategory | str,
+        platform: Platform | str,
+        count: int = 3,
+        fresh_research: bool = False,
+        progress: ProgressCallback | None = None,
+    ) -> GenerationReport:
+        """Generate abilities and report how the request went.
+
         Phase A: Reasoning with tools — LLM explores the knowledge graph,
-        selects techniques, and gathers CTI context.
+        selects techniques, and gathers CTI context.  Served from the
+        research cache when an identical request ran against the same
+        graph, model and prompt version (unless ``fresh_research``).
+
+        Planning: the techniques Phase A selected are validated against the
+        graph, deduplicated and bound one per ability slot (backfilled from
+        the graph when Phase A selected too few).
 
         Phase B: Structured composition — for each ability, the LLM produces
-        a validated ``Ability`` JSON using the Phase A context.
+        a validated ``Ability`` JSON from its technique's research slice.
+        Abilities are composed concurrently; results keep their slot order.
 
         Args:
             category: Attack category (enum or string value).
             platform: Target platform (enum or string value).
             count: Number of abilities to generate (default: 3).
+            fresh_research: Bypass the Phase A research cache (re-run the
+                exploration, e.g. when variety is wanted).
+            progress: Called with ``(phase, report)`` after each phase
+                (``phase_a``, ``planning``, ``phase_b``, ``finalize``).
 
         Returns:
-            List of validated ``Ability`` objects. May be shorter than
-            ``count`` if some abilities fail validation after retries.
+            ``GenerationReport`` with the abilities, token usage, technique
+            assignment and uniqueness rate.
         """
         # Normalize inputs
         cat_value = category.value if isinstance(category, AttackCategory) else str(category)
         plat_value = platform.value if isinstance(platform, Platform) else str(platform)
 
+        report = GenerationReport(requested=count)
+        _trace_request(cat_value, plat_value, count)
+
         tactics = CATEGORY_TO_TACTICS.get(cat_value, [])
         if not tactics:
             logger.error("No tactic mapping for category: %s", cat_value)
-            return []
+            return report
 
         logger.info(
             "Generating %d abilities: category=%s, platform=%s, tactics=%s",
@@ -162,42 +325,190 @@ class ReasoningEngine:
             tactics,
         )
 
-        # ── Phase A: Reasoning with tools ─────────────────────
-        phase_a_result = self._phase_a_reasoning(cat_value, plat_value, tactics, count)
-        logger.info("Phase A reasoning finished for category=%s, platform=%s", cat_value, plat_value)
-        logger.info("Phase A result: %s", phase_a_result)
+        # ── Phase A: Reasoning with tools (or graph-first plan) ──
+        start = time.perf_counter()
+        with tracing.span("engine.phase_a"), track_usage() as usage:
+            if get_settings().generation_mode == "graph_first":
+                phase_a_result = self._phase_a_graph_first(cat_value, plat_value, count)
+            else:
+                phase_a_result, report.research_cached = self._phase_a_cached(
+                    cat_value, plat_value, tactics, count, fresh=fresh_research
+                )
+        self._record_phase_a(report, usage, start, fresh_research)
+        _notify(progress, "phase_a", report)
         if phase_a_result is None:
-            return []
+            return report
 
-        reasoning_context = phase_a_result.text
-        tool_call_log = phase_a_result.tool_calls
-        phase_a_tokens = phase_a_result.total_tokens
+        # ── Technique assignment + per-technique research slices ──
+        start = time.perf_counter()
+        with tracing.span("engine.planning"), track_usage() as usage:
+            assignments = self._plan_slots(
+                phase_a_result, cat_value, plat_value, count, report
+            )
+        _record_phase(report, "planning", start, usage)
+        _notify(progress, "planning", report)
+
+        # ── Phase B: Structured composition (concurrent) ──────
+        start = time.perf_counter()
+        with tracing.span("engine.phase_b"):
+            compositions = self._phase_b_compose_all(
+                assignments=assignments,
+                reasoning_context=phase_a_result.text,
+                category=cat_value,
+                platform=plat_value,
+            )
+        _record_phase(report, "phase_b", start)
+        _notify(progress, "phase_b", report)
+
+        start = time.perf_counter()
+        with tracing.span("engine.finalize"):
+            report = self._finalize(report, phase_a_result, compositions)
+        _record_phase(report, "finalize", start)
+        _notify(progress, "finalize", report)
+        _trace_report(report)
+        return report
+
+    @tracing.traced("engine.generate")
+    async def agenerate_with_report(
+        self,
+        category: AttackCategory | str,
+        platform: Platform | str,
+        count: int = 3,
+        fresh_research: bool = False,
+        progress: ProgressCallback | None = None,
+    ) -> GenerationReport:
+        """Async ``generate_with_report`` for use on an event loop.
+
+        LLM calls go through ``LLMClient.agenerate`` and Phase B
+        compositions run as concurrent tasks (bounded by
+        ``PHASE_B_CONCURRENCY``), so many generations can share one event
+        loop without a thread per in-flight LLM call.  Blocking graph and
+        cache work (planning, intel prefetch, safety validation) runs in
+        worker threads.  Cancelling the task cancels its LLM calls.
+        """
+        cat_value = category.value if isinstance(category, AttackCategory) else str(category)
+        plat_value = platform.value if isinstance(platform, Platform) else str(platform)
+
+        report = GenerationReport(requested=count)
+        _trace_request(cat_value, plat_value, count)
+
+        tactics = CATEGORY_TO_TACTICS.get(cat_value, [])
+        if not tactics:
+            logger.error("No tactic mapping for category: %s", cat_value)
+            return report
 
         logger.info(
-            "Phase A complete: %d tool calls, %d tokens, context length=%d chars",
-            len(tool_call_log),
-            phase_a_tokens,
-            len(reasoning_context),
+            "Generating %d abilities (async): category=%s, platform=%s, tactics=%s",
+            count,
+            cat_value,
+            plat_value,
+            tactics,
         )
 
-        # ── Phase B: Structured composition ───────────────────
-        abilities: list[Ability] = []
-        total_phase_b_tokens = 0
+        start = time.perf_counter()
+        with tracing.span("engine.phase_a"), track_usage() as usage:
+            if get_settings().generation_mode == "graph_first":
+                phase_a_result = await asyncio.to_thread(
+                    self._phase_a_graph_first, cat_value, plat_value, count
+                )
+            else:
+                phase_a_result, report.research_cached = await self._aphase_a_cached(
+                    cat_value, plat_value, tactics, count, fresh=fresh_research
+                )
+        self._record_phase_a(report, usage, start, fresh_research)
+        _notify(progress, "phase_a", report)
+        if phase_a_result is None:
+            return report
 
-        for i in range(1, count + 1):
-            ability, phase_b_tokens = self._phase_b_compose(
-                reasoning_context=reasoning_context,
+        start = time.perf_counter()
+        with tracing.span("engine.planning"), track_usage() as usage:
+            assignments = await asyncio.to_thread(
+                self._plan_slots, phase_a_result, cat_value, plat_value, count, report
+            )
+        _record_phase(report, "planning", start, usage)
+        _notify(progress, "planning", report)
+
+        start = time.perf_counter()
+        with tracing.span("engine.phase_b"):
+            compositions = await self._aphase_b_compose_all(
+                assignments=assignments,
+                reasoning_context=phase_a_result.text,
                 category=cat_value,
                 platform=plat_value,
-                ability_index=i,
-                total_count=count,
             )
-            total_phase_b_tokens += phase_b_tokens
+        _record_phase(report, "phase_b", start)
+        _notify(progress, "phase_b", report)
+
+        start = time.perf_counter()
+        with tracing.span("engine.finalize"):
+            report = await asyncio.to_thread(
+                self._finalize, report, phase_a_result, compositions
+            )
+        _record_phase(report, "finalize", start)
+        _notify(progress, "finalize", report)
+        _trace_report(report)
+        return report
+
+    # ──────────────────────────────────────────────────────────
+    # Shared pipeline steps (sync and async paths)
+    # ──────────────────────────────────────────────────────────
+
+    def _plan_slots(
+        self,
+        phase_a_result: GenerateResult,
+        category: str,
+        platform: str,
+        count: int,
+        report: GenerationReport,
+    ) -> list[TechniqueResearch | None]:
+        """Extract per-technique research and bind one technique per slot."""
+        report.phase_a_tokens = phase_a_result.total_tokens
+        logger.info(
+            "Phase A complete: %d tool calls, %d tokens, context length=%d chars",
+            len(phase_a_result.tool_calls),
+            phase_a_result.total_tokens,
+            len(phase_a_result.text),
+        )
+
+        research = extract_research(
+            phase_a_result.text,
+            phase_a_result.tool_calls,
+            include_notes=get_settings().generation_mode != "graph_first",
+        )
+        assignments, report.assignment = self._assign_techniques(
+            research, category, platform, count
+        )
+        return assignments
+
+    def _finalize(
+        self,
+        report: GenerationReport,
+        phase_a_result: GenerateResult,
+        compositions: list[tuple[Ability | None, list[LLMCallTrace]]],
+    ) -> GenerationReport:
+        """Enforce safety fields, validate, attach traces and fill *report*.
+
+        Each ability's trace attributes tokens to it: its Phase B calls
+        (batch calls already split per slot) plus an even share of the
+        request's Phase A calls.
+        """
+        count = report.requested
+        tool_call_log = phase_a_result.tool_calls
+        phase_a_tokens = phase_a_result.total_tokens
+        produced = sum(1 for ability, _ in compositions if ability is not None)
+        total_phase_b_tokens = sum(
+            call.attributed_tokens for _, calls in compositions for call in calls
+        )
+
+        abilities: list[Ability] = []
+
+        for i, (ability, phase_b_calls) in enumerate(compositions, start=1):
             if ability is not None:
                 # Post-generation enforcement
                 ability = self._enforce_safety_fields(ability)
 
                 # Safety validation pipeline (18 rules)
+                validation_start = time.perf_counter()
                 if get_settings().enable_safety_layer:
                     validation = self._validator.validate(ability)
 
@@ -220,12 +531,32 @@ class ReasoningEngine:
                     validation = None
                     warning_msgs = []
 
+                validation_seconds = time.perf_counter() - validation_start
+
                 # Attach generation trace
+                llm_calls = [
+                    call.model_copy(update={
+                        "attributed_tokens": _share(call.total_tokens, len(abilities), produced),
+                    })
+                    for call in report.phase_a_calls
+                ] + phase_b_calls
+                phase_b_tokens = sum(call.attributed_tokens for call in phase_b_calls)
                 ability.generation_trace = GenerationTrace(
-                    model=self._llm.model_name,
+                    model=phase_a_result.model or self._llm.model_name,
                     tools_called=[tc["name"] for tc in tool_call_log],
                     reasoning_steps=len(tool_call_log),
-                    total_tokens=phase_a_tokens + total_phase_b_tokens,
+                    total_tokens=sum(call.attributed_tokens for call in llm_calls),
+                    phase_a_tokens=phase_a_tokens,
+                    phase_b_tokens=phase_b_tokens,
+                    timings=PhaseTimings(
+                        phase_a_seconds=report.phase_seconds.get("phase_a", 0.0),
+                        planning_seconds=report.phase_seconds.get("planning", 0.0),
+                        phase_b_seconds=round(sum(c.seconds for c in phase_b_calls), 3),
+                        validation_seconds=round(validation_seconds, 3),
+                    ),
+                    llm_calls=llm_calls,
+                    tool_calls=report.tool_calls,
+                    cache={**report.cache, **_prompt_cache(llm_calls)},
                     blocklist_version=BLOCKLIST_VERSION,
                     validation_warnings=warning_msgs,
                 )
@@ -245,13 +576,18 @@ class ReasoningEngine:
                     count,
                 )
 
+        report.abilities = abilities
+        report.phase_b_tokens = total_phase_b_tokens
+
         logger.info(
-            "Generation complete: %d/%d abilities produced, total_tokens=%d",
+            "Generation complete: %d/%d abilities produced, total_tokens=%d, "
+            "technique uniqueness=%.0f%%",
             len(abilities),
             count,
-            phase_a_tokens + total_phase_b_tokens,
+            report.total_tokens,
+            report.uniqueness_rate * 100,
         )
-        return abilities
+        return report
 
     # ──────────────────────────────────────────────────────────
     # Phase A — Reasoning with tools
@@ -273,32 +609,11 @@ class ReasoningEngine:
             ``GenerateResult`` with reasoning text and tool call log,
             or ``None`` if Phase A fails.
         """
-        tactics_str = ", ".join(tactics)
-        user_prompt = (
-            f"Generate {count} {category} abilities targeting {platform}.\n"
-            f"Primary tactic(s): {tactics_str}.\n\n"
-            f"Requirements:\n"
-            f"- Each ability must be atomic (single technique or 2-3 step scenario)\n"
-            f"- Each ability must be simulation-safe with cleanup procedures\n"
-            f"- Select {count} DIFFERENT techniques — avoid duplicates\n"
-            f"- Use the tools to discover techniques, explore sub-techniques, "
-            f"and gather comprehensive threat intelligence\n"
-            f"- For each selected technique, call get_technique_intel ONCE "
-            f"to get full enrichment data\n\n"
-            f"After researching, summarize your findings including:\n"
-            f"- Which techniques you selected and why\n"
-            f"- Key threat intel for each (groups, tools, campaigns)\n"
-            f"- Detection guidance and mitigations\n"
-            f"- Platform-specific execution approaches"
-        )
-
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt},
-        ]
+        messages = _build_phase_a_messages(category, platform, tactics, count)
 
         try:
-            result = self._llm.generate(
+            result = self._generate(
+                "phase_a",
                 messages,
                 tools=self._tools,
                 max_iterations=10,
@@ -310,10 +625,551 @@ class ReasoningEngine:
             )
             return None
 
+    async def _aphase_a_reasoning(
+        self,
+        category: str,
+        platform: str,
+        tactics: list[str],
+        count: int,
+    ) -> GenerateResult | None:
+        """Async ``_phase_a_reasoning``."""
+        messages = _build_phase_a_messages(category, platform, tactics, count)
+        try:
+            return await self._agenerate(
+                "phase_a",
+                messages,
+                tools=self._tools,
+                max_iterations=10,
+            )
+        except Exception as exc:
+            logger.error("Phase A reasoning failed: %s", exc, exc_info=True)
+            return None
+
+    def _phase_a_cached(
+        self,
+        category: str,
+        platform: str,
+        tactics: list[str],
+        count: int,
+        fresh: bool = False,
+    ) -> tuple[GenerateResult | None, bool]:
+        """Phase A through the persistent research cache.
+
+        A cached entry is only reused if it was researched for at least
+        ``count`` abilities.  Cache hits report zero Phase A tokens (none
+        were spent).  Any cache problem degrades to a normal Phase A run.
+
+        Returns:
+            Tuple of (Phase A result or ``None``, served-from-cache flag).
+        """
+        key, hit = self._research_lookup(category, platform, count, fresh)
+        if hit is not None:
+            return hit, True
+
+        result = self._phase_a_reasoning(category, platform, tactics, count)
+        if key is not None:
+            self._research_store(key, result, count)
+        return result, False
+
+    async def _aphase_a_cached(
+        self,
+        category: str,
+        platform: str,
+        tactics: list[str],
+        count: int,
+        fresh: bool = False,
+    ) -> tuple[GenerateResult | None, bool]:
+        """Async ``_phase_a_cached`` (cache I/O runs in worker threads)."""
+        key, hit = await asyncio.to_thread(
+            self._research_lookup, category, platform, count, fresh
+        )
+        if hit is not None:
+            return hit, True
+
+        result = await self._aphase_a_reasoning(category, platform, tactics, count)
+        if key is not None:
+            await asyncio.to_thread(self._research_store, key, result, count)
+        return result, False
+
+    def _research_lookup(
+        self,
+        category: str,
+        platform: str,
+        count: int,
+        fresh: bool,
+    ) -> tuple[str | None, GenerateResult | None]:
+        """Look up cached Phase A research.
+
+        Returns:
+            Tuple of (cache key or ``None`` when caching is unavailable,
+            cached Phase A result or ``None`` on miss).
+        """
+        if self._research_cache is None:
+            return None, None
+
+        try:
+            key = self._research_cache_key(category, platform)
+        except Exception as exc:
+            logger.warning("Research cache key unavailable, skipping cache: %s", exc)
+            return None, None
+
+        if not fresh:
+            entry = self._research_cache.get(key)
+            if entry and entry.get("count", 0) >= count:
+                logger.info(
+                    "Phase A research cache hit for %s/%s (%d techniques)",
+                    category,
+                    platform,
+                    len(entry.get("techniques", [])),
+                )
+                return key, GenerateResult(
+                    text=entry.get("text", ""),
+                    tool_calls=entry.get("tool_calls", []),
+                )
+        return key, None
+
+    def _research_store(
+        self,
+        key: str,
+        result: GenerateResult | None,
+        count: int,
+    ) -> None:
+        """Store a successful Phase A result in the research cache."""
+        if self._research_cache is None or result is None or not result.text:
+            return
+        research = extract_research(result.text, result.tool_calls)
+        self._research_cache.put(key, {
+            "text": result.text,
+            "tool_calls": result.tool_calls,
+            "techniques": [record.attack_id for record in research],
+            "total_tokens": result.total_tokens,
+            "count": count,
+        })
+
+    def _research_cache_key(self, category: str, platform: str) -> str:
+        """Cache key covering everything that can change Phase A research."""
+        return make_cache_key(
+            category=category,
+            platform=platform,
+            model=self._llm.model_name,
+            prompt_version=PHASE_A_PROMPT_VERSION,
+            system_prompt=hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest(),
+            graph_version=self._cti.get_graph_version(),
+            galaxy_version=self._galaxy.version if self._galaxy else "graph",
+        )
+
+    def _phase_a_graph_first(
+        self,
+        category: str,
+        platform: str,
+        count: int,
+    ) -> GenerateResult | None:
+        """Graph-first replacement for Phase A (no LLM call).
+
+        The ``TechniquePlanner`` selects techniques straight from the graph,
+        their intel is prefetched concurrently through the same
+        ``get_technique_intel`` tool the LLM would call, and the result is
+        rendered as a compact structured research context.
+
+        Returns:
+            ``GenerateResult`` shaped like a Phase A result (context text +
+            tool call log, zero tokens), or ``None`` if nothing was planned.
+        """
+        try:
+            picks = self._planner.select(category, platform, count)
+        except Exception as exc:
+            logger.error("Graph-first planning failed: %s", exc, exc_info=True)
+            return None
+        if not picks:
+            logger.error(
+                "Graph-first planner found no techniques for %s/%s", category, platform
+            )
+            return None
+
+        ids = list(dict.fromkeys(pick.attack_id for pick in picks))
+        intel_by_id = self._prefetch_intel(ids)
+
+        tool_calls = [
+            {
+                "name": "get_technique_intel",
+                "arguments": {"technique_id": technique_id},
+                "result": intel_by_id[technique_id],
+            }
+            for technique_id in ids
+        ]
+        return GenerateResult(
+            text=build_planned_context(category, platform, picks, intel_by_id),
+            tool_calls=tool_calls,
+        )
+
+    def _prefetch_intel(self, technique_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """Fetch ``get_technique_intel`` for several techniques concurrently.
+
+        Goes through the same tool closure the LLM calls, so the intel is
+        identical to what Phase A would have gathered.
+
+        Returns:
+            Intel dicts keyed by technique ID (``{"error": ...}`` on failure).
+        """
+        if not technique_ids:
+            return {}
+        get_intel = self._dispatch["get_technique_intel"]
+
+        def _fetch(technique_id: str) -> dict[str, Any]:
+            try:
+                return get_intel(technique_id=technique_id)
+            except Exception as exc:
+                logger.error("Intel prefetch failed for %s: %s", technique_id, exc)
+                return {"error": str(exc)}
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(len(technique_ids), PLANNER_PREFETCH_WORKERS)),
+            thread_name_prefix="intel-prefetch",
+        ) as pool:
+            # Copied contexts keep the tool timings in the caller's usage scope
+            futures = [
+                tracing.submit(pool, _fetch, technique_id)
+                for technique_id in technique_ids
+            ]
+            return dict(zip(technique_ids, (f.result() for f in futures)))
+
+    def _fill_threat_intel(self, technique_ids: list[str]) -> dict[str, ThreatIntelContext]:
+        """Build the ``ThreatIntelContext`` of several techniques concurrently.
+
+        Uses ``MISPTools.enrich_technique_context`` (graph + MISP galaxy +
+        STIX campaigns), the deterministic replacement for LLM-written intel
+        in slim Phase B drafts.  A failed lookup yields an empty context.
+        """
+        if not technique_ids:
+            return {}
+
+        def _fetch(technique_id: str) -> ThreatIntelContext:
+            try:
+                return self._misp.enrich_technique_context(technique_id)
+            except Exception as exc:
+                logger.error("Threat intel fill failed for %s: %s", technique_id, exc)
+                return ThreatIntelContext()
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(len(technique_ids), PLANNER_PREFETCH_WORKERS)),
+            thread_name_prefix="intel-fill",
+        ) as pool:
+            return dict(zip(technique_ids, pool.map(tracing.in_context(_fetch), technique_ids)))
+
+    # ──────────────────────────────────────────────────────────
+    # Planning — bind techniques to ability slots
+    # ──────────────────────────────────────────────────────────
+
+    def _assign_techniques(
+        self,
+        research: list[TechniqueResearch],
+        category: str,
+        platform: str,
+        count: int,
+    ) -> tuple[list[TechniqueResearch | None], TechniqueAssignment]:
+        """Bind one distinct technique (and its research slice) to each slot.
+
+        Phase A's selections are validated and deduplicated by
+        ``TechniquePlanner.assign``; backfilled techniques get their intel
+        prefetched so their slice is as complete as a Phase A one.  If even
+        the graph runs out of distinct techniques, the remaining slots reuse
+        assigned techniques (logged) rather than being dropped.
+
+        Returns:
+            Tuple of (one research record or ``None`` per slot, assignment).
+            Slots are ``None`` (full Phase A context) only when no technique
+            could be assigned at all.
+        """
+        assignment = self._planner.assign(
+            [record.attack_id for record in research], category, platform, count
+        )
+
+        by_id = {record.attack_id: record for record in research}
+        backfill_intel = self._prefetch_intel(assignment.backfilled)
+        for technique_id, intel in backfill_intel.items():
+            ok = intel and "error" not in intel
+            by_id[technique_id] = TechniqueResearch(
+                attack_id=technique_id,
+                name=intel.get("name", "") if ok else "",
+                intel=compact_intel(intel) if ok else {},
+            )
+
+        records = [by_id[tid] for tid in assignment.technique_ids if tid in by_id]
+        if not records:
+            logger.warning(
+                "No technique could be assigned — Phase B uses the full context"
+            )
+            return [None] * count, assignment
+        if len(records) < count:
+            logger.warning(
+                "Only %d distinct techniques available for %d slots — reusing",
+                len(records),
+                count,
+            )
+        return [records[i % len(records)] for i in range(count)], assignment
+
     # ──────────────────────────────────────────────────────────
     # Phase B — Structured composition
     # ──────────────────────────────────────────────────────────
 
+    def _phase_b_compose_all(
+        self,
+        assignments: list[TechniqueResearch | None],
+        reasoning_context: str,
+        category: str,
+        platform: str,
+    ) -> list[tuple[Ability | None, list[LLMCallTrace]]]:
+        """Run all Phase B compositions concurrently, preserving order.
+
+        Compositions are independent, so up to ``PHASE_B_CONCURRENCY`` LLM
+        calls are in flight at once (keep this within the provider's rate
+        limit).  Each composition handles its own failures, so one failed
+        ability never affects the others.
+
+        Each slot only receives the research slice for its assigned
+        technique; unassigned slots fall back to the full Phase A context.
+
+        With ``PHASE_B_SCHEMA=slim``, slots with an assigned technique are
+        composed as ``AbilityDraft`` objects while their threat intel is
+        fetched in the background; drafts are then completed into
+        ``Ability`` objects (``_complete_drafts``).
+
+        When ``PHASE_B_BATCH_SIZE`` is greater than 1, slots are grouped
+        into batches that are each composed in a single structured call
+        (see ``_phase_b_compose_batch``); the batches themselves run
+        concurrently.
+
+        Args:
+            assignments: One research record (or ``None``) per slot.
+            reasoning_context: Full Phase A context (fallback).
+            category: Attack category value.
+            platform: Platform value.
+
+        Returns:
+            One ``(ability or None, LLM call traces)`` tuple per ability
+            slot, in slot order.
+        """
+        count = len(assignments)
+        chunks = _phase_b_chunks(count)
+        contexts, technique_ids = _slot_inputs(assignments, reasoning_context)
+        slim = _slim_slots(technique_ids)
+
+        def _compose(
+            chunk: list[int],
+        ) -> list[tuple[Ability | AbilityDraft | None, list[LLMCallTrace]]]:
+            if len(chunk) == 1:
+                return [
+                    self._phase_b_compose(
+                        reasoning_context=contexts[chunk[0] - 1],
+                        category=category,
+                        platform=platform,
+                        ability_index=chunk[0],
+                        total_count=count,
+                        technique_id=technique_ids[chunk[0] - 1],
+                        slim=slim[chunk[0] - 1],
+                    )
+                ]
+            return self._phase_b_compose_batch(
+                slot_contexts=[contexts[i - 1] for i in chunk],
+                category=category,
+                platform=platform,
+                ability_indices=chunk,
+                total_count=count,
+                technique_ids=[technique_ids[i - 1] for i in chunk],
+                slim=[slim[i - 1] for i in chunk],
+            )
+
+        max_workers = max(1, min(len(chunks), get_settings().phase_b_concurrency))
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="intel-fill") as fill:
+            intel_future = tracing.submit(
+                fill, self._fill_threat_intel, _slim_technique_ids(technique_ids, slim)
+            )
+            if max_workers == 1:
+                compositions = [item for chunk in chunks for item in _compose(chunk)]
+            else:
+                logger.info(
+                    "Phase B: composing %d abilities in %d call(s) with concurrency=%d",
+                    count,
+                    len(chunks),
+                    max_workers,
+                )
+                with ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="phase-b"
+                ) as pool:
+                    futures = [tracing.submit(pool, _compose, chunk) for chunk in chunks]
+                    compositions = [item for future in futures for item in future.result()]
+            intel = intel_future.result()
+        return _complete_drafts(compositions, assignments, category, intel)
+
+    async def _aphase_b_compose_all(
+        self,
+        assignments: list[TechniqueResearch | None],
+        reasoning_context: str,
+        category: str,
+        platform: str,
+    ) -> list[tuple[Ability | None, list[LLMCallTrace]]]:
+        """Async ``_phase_b_compose_all``: one task per call, bounded by a
+        ``PHASE_B_CONCURRENCY`` semaphore, results in slot order."""
+        count = len(assignments)
+        chunks = _phase_b_chunks(count)
+        contexts, technique_ids = _slot_inputs(assignments, reasoning_context)
+        slim = _slim_slots(technique_ids)
+        semaphore = asyncio.Semaphore(max(1, get_settings().phase_b_concurrency))
+
+        async def _compose(
+            chunk: list[int],
+        ) -> list[tuple[Ability | AbilityDraft | None, list[LLMCallTrace]]]:
+            async with semaphore:
+                if len(chunk) == 1:
+                    return [
+                        await self._aphase_b_compose(
+                            reasoning_context=contexts[chunk[0] - 1],
+                            category=category,
+                            platform=platform,
+                            ability_index=chunk[0],
+                            total_count=count,
+                            technique_id=technique_ids[chunk[0] - 1],
+                            slim=slim[chunk[0] - 1],
+                        )
+                    ]
+                return await self._aphase_b_compose_batch(
+                    slot_contexts=[contexts[i - 1] for i in chunk],
+                    category=category,
+                    platform=platform,
+                    ability_indices=chunk,
+                    total_count=count,
+                    technique_ids=[technique_ids[i - 1] for i in chunk],
+                    slim=[slim[i - 1] for i in chunk],
+                )
+
+        intel_task = asyncio.ensure_future(asyncio.to_thread(
+            self._fill_threat_intel, _slim_technique_ids(technique_ids, slim)
+        ))
+        try:
+            results = await asyncio.gather(*(_compose(chunk) for chunk in chunks))
+            intel = await intel_task
+        finally:
+            intel_task.cancel()
+        compositions = [item for chunk_result in results for item in chunk_result]
+        return _complete_drafts(compositions, assignments, category, intel)
+
+    def _phase_b_compose_batch(
+        self,
+        slot_contexts: list[str],
+        category: str,
+        platform: str,
+        ability_indices: list[int],
+        total_count: int,
+        technique_ids: list[str | None],
+        slim: list[bool] | None = None,
+    ) -> list[tuple[Ability | AbilityDraft | None, list[LLMCallTrace]]]:
+        """Execute Phase B for several abilities in one structured call.
+
+        The system prompt, research context and schema are sent once for
+        the whole batch.  Returned items are validated individually against
+        ``Ability`` (``AbilityDraft`` when every slot is *slim*); only the
+        items that are missing or invalid are regenerated with a
+        single-ability ``_phase_b_compose`` call.
+
+        Batch tokens are split evenly across the batch slots so per-slot
+        token totals still add up to the real usage.
+
+        Returns:
+            One ``(ability or None, LLM call traces)`` tuple per index, in
+            order.
+        """
+        slim = slim or [False] * len(ability_indices)
+        batch_slim = all(slim)
+        messages = _batch_messages(
+            slot_contexts, category, platform, ability_indices, total_count,
+            technique_ids, batch_slim,
+        )
+
+        raw_items: list[Any] = []
+        with track_usage() as usage:
+            try:
+                result = self._generate(
+                    "phase_b",
+                    messages,
+                    batch_size=len(ability_indices),
+                    schema=AbilityDraftBatch if batch_slim else AbilityBatch,
+                )
+                if result.parsed is not None:
+                    raw_items = list(result.parsed.abilities)
+            except Exception as exc:
+                _log_batch_failure(ability_indices, exc)
+
+        results = _split_batch(
+            raw_items, usage.calls, ability_indices, total_count,
+            AbilityDraft if batch_slim else Ability,
+        )
+        for pos, (ability, calls) in enumerate(results):
+            if ability is None:
+                ability, retry_calls = self._phase_b_compose(
+                    reasoning_context=slot_contexts[pos],
+                    category=category,
+                    platform=platform,
+                    ability_index=ability_indices[pos],
+                    total_count=total_count,
+                    technique_id=technique_ids[pos],
+                    slim=slim[pos],
+                )
+                results[pos] = (ability, calls + retry_calls)
+        return results
+
+    async def _aphase_b_compose_batch(
+        self,
+        slot_contexts: list[str],
+        category: str,
+        platform: str,
+        ability_indices: list[int],
+        total_count: int,
+        technique_ids: list[str | None],
+        slim: list[bool] | None = None,
+    ) -> list[tuple[Ability | AbilityDraft | None, list[LLMCallTrace]]]:
+        """Async ``_phase_b_compose_batch`` (regenerations run concurrently)."""
+        slim = slim or [False] * len(ability_indices)
+        batch_slim = all(slim)
+        messages = _batch_messages(
+            slot_contexts, category, platform, ability_indices, total_count,
+            technique_ids, batch_slim,
+        )
+
+        raw_items: list[Any] = []
+        with track_usage() as usage:
+            try:
+                result = await self._agenerate(
+                    "phase_b",
+                    messages,
+                    batch_size=len(ability_indices),
+                    schema=AbilityDraftBatch if batch_slim else AbilityBatch,
+                )
+                if result.parsed is not None:
+                    raw_items = list(result.parsed.abilities)
+            except Exception as exc:
+                _log_batch_failure(ability_indices, exc)
+
+        results = _split_batch(
+            raw_items, usage.calls, ability_indices, total_count,
+            AbilityDraft if batch_slim else Ability,
+        )
+        missing = [pos for pos, (ability, _) in enumerate(results) if ability is None]
+        retries = await asyncio.gather(*(
+            self._aphase_b_compose(
+                reasoning_context=slot_contexts[pos],
+                category=category,
+                platform=platform,
+                ability_index=ability_indices[pos],
+                total_count=total_count,
+                technique_id=technique_ids[pos],
+                slim=slim[pos],
+            )
+            for pos in missing
+        ))
+        for pos, (ability, retry_calls) in zip(missing, retries):
+            results[pos] = (ability, results[pos][1] + retry_calls)
+        return results
+
     def _phase_b_compose(
         self,
         reasoning_context: str,
@@ -321,48 +1177,156 @@ class ReasoningEngine:
         platform: str,
         ability_index: int,
         total_count: int,
-    ) -> tuple[Ability | None, int]:
+        technique_id: str | None = None,
+        slim: bool = False,
+    ) -> tuple[Ability | AbilityDraft | None, list[LLMCallTrace]]:
         """Execute Phase B: generate a single structured Ability.
 
         Uses ``generate(schema=Ability)`` to produce
-        a validated Pydantic instance.
+        a validated Pydantic instance — ``schema=AbilityDraft`` when *slim*
+        (the caller completes the draft from the graph).
 
         Returns:
-            Tuple of (validated ``Ability`` or ``None``, token count).
+            Tuple of (validated ``Ability`` / ``AbilityDraft`` or ``None``,
+            LLM call traces).
         """
-        composition_prompt = _build_composition_prompt(
-            reasoning_context=reasoning_context,
-            category=category,
-            platform=platform,
-            ability_index=ability_index,
-            total_count=total_count,
+        messages = _composition_messages(
+            reasoning_context, category, platform, ability_index, total_count,
+            technique_id, slim,
         )
+        with track_usage() as usage:
+            try:
+                result = self._generate(
+                    "phase_b", messages, schema=AbilityDraft if slim else Ability
+                )
+                return result.parsed, usage.calls  # type: ignore[return-value]
+            except Exception as exc:
+                _log_composition_failure(ability_index, total_count, exc)
+                return None, usage.calls
 
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": composition_prompt},
-        ]
+    async def _aphase_b_compose(
+        self,
+        reasoning_context: str,
+        category: str,
+        platform: str,
+        ability_index: int,
+        total_count: int,
+        technique_id: str | None = None,
+        slim: bool = False,
+    ) -> tuple[Ability | AbilityDraft | None, list[LLMCallTrace]]:
+        """Async ``_phase_b_compose``."""
+        messages = _composition_messages(
+            reasoning_context, category, platform, ability_index, total_count,
+            technique_id, slim,
+        )
+        with track_usage() as usage:
+            try:
+                result = await self._agenerate(
+                    "phase_b", messages, schema=AbilityDraft if slim else Ability
+                )
+                return result.parsed, usage.calls  # type: ignore[return-value]
+            except Exception as exc:
+                _log_composition_failure(ability_index, total_count, exc)
+                return None, usage.calls
 
-        try:
-            result = self._llm.generate(messages, schema=Ability)
-            return result.parsed, result.total_tokens  # type: ignore[return-value]
-        except ValidationError as exc:
-            logger.error(
-                "Phase B validation failed for ability %d/%d after retries: %s",
-                ability_index,
-                total_count,
-                exc.error_count(),
-            )
-            return None, 0
-        except Exception as exc:
-            logger.error(
-                "Phase B composition failed for ability %d/%d: %s",
-                ability_index,
-                total_count,
-                exc,
-                exc_info=True,
+    # ──────────────────────────────────────────────────────────
+    # Traced LLM calls and phase telemetry
+    # ──────────────────────────────────────────────────────────
+
+    def _generate(
+        self,
+        phase: str,
+        messages: list[dict[str, str]],
+        batch_size: int = 1,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """``LLMClient.generate`` that appends an ``LLMCallTrace`` to the
+        enclosing usage scope's ``calls`` (also when the call fails) and
+        traces it as an ``llm.generate`` span."""
+        enclosing = current_usage()
+        result: GenerateResult | None = None
+        start = time.perf_counter()
+        span = tracing.span("llm.generate", {"llm.phase": phase})
+        with span, track_usage(phase) as usage:
+            try:
+                result = self._llm.generate(messages, **kwargs)
+                return result
+            finally:
+                trace = self._call_trace(
+                    phase, result, usage, time.perf_counter() - start, batch_size
+                )
+                span.set_attributes(_trace_attributes(trace))
+                if enclosing is not None:
+                    enclosing.calls.append(trace)
+
+    async def _agenerate(
+        self,
+        phase: str,
+        messages: list[dict[str, str]],
+        batch_size: int = 1,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Async ``_generate``."""
+        enclosing = current_usage()
+        result: GenerateResult | None = None
+        start = time.perf_counter()
+        span = tracing.span("llm.generate", {"llm.phase": phase})
+        with span, track_usage(phase) as usage:
+            try:
+                result = await self._llm.agenerate(messages, **kwargs)
+                return result
+            finally:
+                trace = self._call_trace(
+                    phase, result, usage, time.perf_counter() - start, batch_size
+                )
+                span.set_attributes(_trace_attributes(trace))
+                if enclosing is not None:
+                    enclosing.calls.append(trace)
+
+    def _call_trace(
+        self,
+        phase: str,
+        result: GenerateResult | None,
+        usage: UsageScope,
+        seconds: float,
+        batch_size: int,
+    ) -> LLMCallTrace:
+        """Build the trace of one call (``result`` is ``None`` if it failed).
+
+        Token totals prefer the client's count; the breakdown comes from
+        the provider responses seen in the call's usage scope.
+        """
+        total = (result.total_tokens if result is not None else 0) or usage.total_tokens
+        return LLMCallTrace(
+            phase=phase,
+            model=(result.model if result is not None else "") or self._llm.model_name,
+            seconds=round(seconds, 3),
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cached_tokens=usage.cached_tokens,
+            total_tokens=total,
+            attributed_tokens=total,
+            batch_size=batch_size,
+            retries=usage.retries,
+            repairs=len(result.repairs) if result is not None else 0,
+            failed=result is None,
+        )
+
+    def _record_phase_a(
+        self,
+        report: GenerationReport,
+        usage: UsageScope,
+        start: float,
+        fresh: bool,
+    ) -> None:
+        """Store Phase A time, calls and research-cache outcome on *report*."""
+        _record_phase(report, "phase_a", start, usage)
+        report.phase_a_calls = list(usage.calls)
+        if self._research_cache is not None and get_settings().generation_mode != "graph_first":
+            report.cache["research"] = (
+                "hit" if report.research_cached else "bypass" if fresh else "miss"
             )
-            return None, 0
+            metrics.CACHE_REQUESTS.inc(cache="research", outcome=report.cache["research"])
 
     # ──────────────────────────────────────────────────────────
     # Post-generation enforcement
@@ -384,6 +1348,340 @@ class ReasoningEngine:
         return ability
 
 
+# ──────────────────────────────────────────────────────────────
+# Phase B helpers (shared by the sync and async paths)
+# ──────────────────────────────────────────────────────────────
+
+def _phase_b_chunks(count: int) -> list[list[int]]:
+    """Group 1-based slot indices into Phase B calls (``PHASE_B_BATCH_SIZE``)."""
+    indices = list(range(1, count + 1))
+    batch_size = get_settings().phase_b_batch_size
+    if batch_size > 1 and count > 1:
+        return [indices[start:start + batch_size] for start in range(0, count, batch_size)]
+    return [[i] for i in indices]
+
+
+def _slot_inputs(
+    assignments: list[TechniqueResearch | None],
+    reasoning_context: str,
+) -> tuple[list[str], list[str | None]]:
+    """Per-slot research context and technique ID.
+
+    Unassigned slots fall back to the full Phase A context.
+    """
+    contexts = [
+        record.to_context() if record else reasoning_context for record in assignments
+    ]
+    technique_ids = [record.attack_id if record else None for record in assignments]
+    return contexts, technique_ids
+
+
+def _slim_slots(technique_ids: list[str | None]) -> list[bool]:
+    """Which slots are composed as slim ``AbilityDraft`` objects.
+
+    Needs ``PHASE_B_SCHEMA=slim`` and an assigned technique (the mapping
+    and intel are filled from it); other slots use the full schema.
+    """
+    slim = get_settings().phase_b_schema == "slim"
+    return [slim and technique_id is not None for technique_id in technique_ids]
+
+
+def _slim_technique_ids(
+    technique_ids: list[str | None], slim: list[bool]
+) -> list[str]:
+    """Distinct techniques whose threat intel must be filled."""
+    return list(dict.fromkeys(
+        technique_id
+        for technique_id, is_slim in zip(technique_ids, slim)
+        if is_slim and technique_id
+    ))
+
+
+def _complete_drafts(
+    compositions: list[tuple[Ability | AbilityDraft | None, list[LLMCallTrace]]],
+    assignments: list[TechniqueResearch | None],
+    category: str,
+    intel: dict[str, ThreatIntelContext],
+) -> list[tuple[Ability | None, list[LLMCallTrace]]]:
+    """Turn slim drafts into full abilities using graph data.
+
+    ``attack_category`` comes from the request, ``mitre_mapping`` from the
+    assigned technique and ``threat_intel_context`` from
+    ``_fill_threat_intel``; safety and metadata fields keep their defaults
+    (and are enforced again in ``_finalize``).
+    """
+    completed: list[tuple[Ability | None, list[LLMCallTrace]]] = []
+    for (item, calls), record in zip(compositions, assignments):
+        if isinstance(item, AbilityDraft) and record is not None:
+            item = Ability(
+                name=item.name,
+                description=item.description,
+                attack_category=category,
+                mitre_mapping=_mitre_mapping(record, category),
+                threat_intel_context=(
+                    intel.get(record.attack_id) or ThreatIntelContext()
+                ).model_copy(deep=True),
+                executors=item.executors,
+            )
+        completed.append((item, calls))  # type: ignore[arg-type]
+    return completed
+
+
+def _mitre_mapping(record: TechniqueResearch, category: str) -> MitreMapping:
+    """MITRE mapping for an assigned technique.
+
+    The tactic is the first of the category's tactics the technique belongs
+    to (from its graph intel), falling back to the technique's own first
+    tactic and then the category's primary tactic.
+    """
+    category_tactics = CATEGORY_TO_TACTICS.get(category, [])
+    technique_tactics = record.intel.get("tactics") or []
+    tactic = next(
+        (t for t in category_tactics if t in technique_tactics),
+        technique_tactics[0] if technique_tactics else (
+            category_tactics[0] if category_tactics else ""
+        ),
+    )
+    technique, _, _ = record.attack_id.partition(".")
+    return MitreMapping(
+        tactic=tactic,
+        technique=technique,
+        sub_technique=record.attack_id if "." in record.attack_id else None,
+    )
+
+
+def _composition_messages(
+    reasoning_context: str,
+    category: str,
+    platform: str,
+    ability_index: int,
+    total_count: int,
+    technique_id: str | None,
+    slim: bool = False,
+) -> list[dict[str, str]]:
+    """Conversation for a single-ability Phase B call."""
+    composition_prompt = _build_composition_prompt(
+        reasoning_context=reasoning_context,
+        category=category,
+        platform=platform,
+        ability_index=ability_index,
+        total_count=total_count,
+        technique_id=technique_id,
+        slim=slim,
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": composition_prompt},
+    ]
+
+
+def _batch_messages(
+    slot_contexts: list[str],
+    category: str,
+    platform: str,
+    ability_indices: list[int],
+    total_count: int,
+    technique_ids: list[str | None],
+    slim: bool = False,
+) -> list[dict[str, str]]:
+    """Conversation for a batched Phase B call (unique contexts sent once)."""
+    composition_prompt = _build_batch_composition_prompt(
+        reasoning_context="\n\n".join(dict.fromkeys(slot_contexts)),
+        category=category,
+        platform=platform,
+        ability_indices=ability_indices,
+        total_count=total_count,
+        technique_ids=technique_ids,
+        slim=slim,
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": composition_prompt},
+    ]
+
+
+def _split_batch(
+    raw_items: list[Any],
+    batch_calls: list[LLMCallTrace],
+    ability_indices: list[int],
+    total_count: int,
+    schema: type[Ability] | type[AbilityDraft] = Ability,
+) -> list[tuple[Ability | AbilityDraft | None, list[LLMCallTrace]]]:
+    """Validate batch items per slot and share the batch tokens evenly.
+
+    Every slot gets a copy of the batch call traces with its share of
+    their tokens as ``attributed_tokens``.  Missing or invalid items come
+    back as ``None`` for regeneration.
+    """
+    slots = len(ability_indices)
+    results: list[tuple[Ability | AbilityDraft | None, list[LLMCallTrace]]] = []
+
+    for pos, index in enumerate(ability_indices):
+        calls = [
+            call.model_copy(update={
+                "attributed_tokens": _share(call.total_tokens, pos, slots),
+            })
+            for call in batch_calls
+        ]
+        ability: Ability | AbilityDraft | None = None
+
+        if pos < len(raw_items):
+            try:
+                ability, _ = validate_with_repair(raw_items[pos], schema)
+            except ValidationError as exc:
+                logger.warning(
+                    "Batched ability %d/%d invalid (%d errors) — regenerating",
+                    index,
+                    total_count,
+                    exc.error_count(),
+                )
+        else:
+            logger.warning(
+                "Batched ability %d/%d missing from batch response — regenerating",
+                index,
+                total_count,
+            )
+        results.append((ability, calls))
+
+    return results
+
+
+def _share(tokens: int, position: int, parts: int) -> int:
+    """Even integer share of *tokens* for *position* of *parts* (sums exactly)."""
+    if parts <= 0:
+        return 0
+    share, remainder = divmod(tokens, parts)
+    return share + (1 if position < remainder else 0)
+
+
+def _record_phase(
+    report: GenerationReport,
+    phase: str,
+    start: float,
+    usage: UsageScope | None = None,
+) -> None:
+    """Store a phase's wall-clock time (and timed tool calls) on *report*."""
+    report.phase_seconds[phase] = round(time.perf_counter() - start, 3)
+    if usage is not None:
+        report.tool_calls.extend(
+            ToolCallTrace(name=name, seconds=round(seconds, 3))
+            for name, seconds in usage.tools
+        )
+
+
+def _notify(progress: ProgressCallback | None, phase: str, report: GenerationReport) -> None:
+    if progress is not None:
+        progress(phase, report)
+
+
+def _trace_request(category: str, platform: str, count: int) -> None:
+    tracing.current_span().set_attributes({
+        "generation.category": category,
+        "generation.platform": platform,
+        "generation.count": count,
+        "generation.mode": get_settings().generation_mode,
+    })
+
+
+def _trace_report(report: GenerationReport) -> None:
+    tracing.current_span().set_attributes({
+        "generation.produced": len(report.abilities),
+        "generation.research_cached": report.research_cached,
+        "llm.total_tokens": report.total_tokens,
+    })
+
+
+def _trace_attributes(call: LLMCallTrace) -> dict[str, Any]:
+    """Span attributes of one traced LLM call."""
+    return {
+        "llm.model": call.model,
+        "llm.batch_size": call.batch_size,
+        "llm.input_tokens": call.input_tokens,
+        "llm.output_tokens": call.output_tokens,
+        "llm.cached_tokens": call.cached_tokens,
+        "llm.total_tokens": call.total_tokens,
+        "llm.retries": call.retries,
+        "llm.repairs": call.repairs,
+    }
+
+
+def _prompt_cache(calls: list[LLMCallTrace]) -> dict[str, str]:
+    """Provider prompt-cache outcome, when the provider reports input tokens."""
+    if not any(call.input_tokens for call in calls):
+        return {}
+    return {"llm_prompt": "hit" if any(call.cached_tokens for call in calls) else "miss"}
+
+
+def _log_batch_failure(ability_indices: list[int], exc: Exception) -> None:
+    if isinstance(exc, ValidationError):
+        logger.error(
+            "Phase B batch validation failed for abilities %s after retries: %s",
+            ability_indices,
+            exc.error_count(),
+        )
+    else:
+        logger.error(
+            "Phase B batch composition failed for abilities %s: %s",
+            ability_indices,
+            exc,
+            exc_info=True,
+        )
+
+
+def _log_composition_failure(ability_index: int, total_count: int, exc: Exception) -> None:
+    if isinstance(exc, ValidationError):
+        logger.error(
+            "Phase B validation failed for ability %d/%d after retries: %s",
+            ability_index,
+            total_count,
+            exc.error_count(),
+        )
+    else:
+        logger.error(
+            "Phase B composition failed for ability %d/%d: %s",
+            ability_index,
+            total_count,
+            exc,
+            exc_info=True,
+        )
+
+
+# ──────────────────────────────────────────────────────────────
+# Phase A prompt builder
+# ──────────────────────────────────────────────────────────────
+
+def _build_phase_a_messages(
+    category: str,
+    platform: str,
+    tactics: list[str],
+    count: int,
+) -> list[dict[str, str]]:
+    """Build the Phase A (tool-augmented research) conversation."""
+    tactics_str = ", ".join(tactics)
+    user_prompt = (
+        f"Generate {count} {category} abilities targeting {platform}.\n"
+        f"Primary tactic(s): {tactics_str}.\n\n"
+        f"Requirements:\n"
+        f"- Each ability must be atomic (single technique or 2-3 step scenario)\n"
+        f"- Each ability must be simulation-safe with cleanup procedures\n"
+        f"- Select {count} DIFFERENT techniques — avoid duplicates\n"
+        f"- Use the tools to discover techniques, explore sub-techniques, "
+        f"and gather comprehensive threat intelligence\n"
+        f"- For each selected technique, call get_technique_intel ONCE "
+        f"to get full enrichment data\n\n"
+        f"After researching, summarize your findings including:\n"
+        f"- Which techniques you selected and why\n"
+        f"- Key threat intel for each (groups, tools, campaigns)\n"
+        f"- Detection guidance and mitigations\n"
+        f"- Platform-specific execution approaches"
+    )
+
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
 # ──────────────────────────────────────────────────────────────
 # Composition prompt builder
 # ──────────────────────────────────────────────────────────────
@@ -394,23 +1692,41 @@ def _build_composition_prompt(
     platform: str,
     ability_index: int,
     total_count: int,
+    technique_id: str | None = None,
+    slim: bool = False,
 ) -> str:
     """Build the Phase B prompt for structured ability generation.
 
-    Includes the full reasoning context from Phase A plus explicit
-    instructions to produce a single valid Ability JSON.
+    Includes the research context (the slice for the assigned technique,
+    or the full Phase A output) plus explicit instructions to produce a
+    single valid Ability JSON.
 
     Args:
-        reasoning_context: Full text output from Phase A (technique details,
-            CTI data, campaigns, detection guidance).
+        reasoning_context: Research for this ability — the assigned
+            technique's ``TechniqueResearch`` slice, or the full Phase A
+            text when no technique could be assigned.
         category: Attack category string (e.g., 'credential_access').
         platform: Target platform string (e.g., 'windows').
         ability_index: 1-based index of this ability in the batch.
         total_count: Total number of abilities being generated.
+        technique_id: ATT&CK ID assigned to this ability, if any.
+        slim: Ask for an ``AbilityDraft`` (creative fields only).
 
     Returns:
         Formatted composition prompt string.
     """
+    if technique_id and slim:
+        selection = f"This ability MUST simulate technique **{technique_id}**.\n\n"
+    elif technique_id:
+        selection = (
+            f"This ability MUST simulate technique **{technique_id}** — "
+            f"use it for **mitre_mapping**.\n\n"
+        )
+    else:
+        selection = (
+            f"Choose a DIFFERENT technique from the research for each ability — "
+            f"this is ability #{ability_index}.\n\n"
+        )
     return (
         f"## Research Context\n\n"
         f"{reasoning_context}\n\n"
@@ -418,8 +1734,86 @@ def _build_composition_prompt(
         f"## Task\n\n"
         f"Using the research context above, generate ability **{ability_index} of "
         f"{total_count}** for the **{category}** category targeting **{platform}**.\n\n"
-        f"Choose a DIFFERENT technique from the research for each ability — "
-        f"this is ability #{ability_index}.\n\n"
+        f"{selection}"
+        f"{_composition_requirements(category, platform, slim)}"
+        f"Return a single {'AbilityDraft' if slim else 'Ability'} JSON object."
+    )
+
+
+def _build_batch_composition_prompt(
+    reasoning_context: str,
+    category: str,
+    platform: str,
+    ability_indices: list[int],
+    total_count: int,
+    technique_ids: list[str | None] | None = None,
+    slim: bool = False,
+) -> str:
+    """Build the Phase B prompt for a batch of abilities in one call.
+
+    Same research context and requirements as
+    ``_build_composition_prompt``, but asks for an ``AbilityBatch``
+    containing one ability per requested slot.
+
+    Args:
+        reasoning_context: Research for the batch (the slices of its
+            assigned techniques, or the full Phase A text).
+        category: Attack category string (e.g., 'credential_access').
+        platform: Target platform string (e.g., 'windows').
+        ability_indices: 1-based indices of the abilities in this batch.
+        total_count: Total number of abilities being generated.
+        technique_ids: ATT&CK ID assigned to each ability, if any.
+        slim: Ask for ``AbilityDraft`` items (creative fields only).
+
+    Returns:
+        Formatted batch composition prompt string.
+    """
+    slots = ", ".join(f"#{i}" for i in ability_indices)
+    if technique_ids and all(technique_ids):
+        selection = "Each ability MUST simulate its assigned technique:\n" + "".join(
+            f"- Ability #{i} → {tid}\n" for i, tid in zip(ability_indices, technique_ids)
+        ) + "\n"
+    else:
+        selection = (
+            "Choose a DIFFERENT technique from the research for each ability — "
+            "no two abilities may share a technique.\n\n"
+        )
+    return (
+        f"## Research Context\n\n"
+        f"{reasoning_context}\n\n"
+        f"---\n\n"
+        f"## Task\n\n"
+        f"Using the research context above, generate abilities **{slots}** "
+        f"(of {total_count} total) for the **{category}** category targeting "
+        f"**{platform}**.\n\n"
+        f"{selection}"
+        f"{_composition_requirements(category, platform, slim)}"
+        f"Return an object whose `abilities` array contains exactly "
+        f"{len(ability_indices)} {'AbilityDraft' if slim else 'Ability'} JSON "
+        f"objects, in the order listed above."
+    )
+
+
+def _composition_requirements(category: str, platform: str, slim: bool = False) -> str:
+    """Return the per-ability requirements section shared by Phase B prompts.
+
+    Slim drafts only carry name, description and executors — the mapping,
+    threat intel and safety fields are filled in afterwards.
+    """
+    if slim:
+        return (
+            f"## Requirements\n\n"
+            f"1. **name** and **description** must describe this technique as real "
+            f"attackers use it, grounded in the research above\n"
+            f"2. **executors** must include at least one {platform}-specific executor with:\n"
+            f"   - A complete, syntactically valid, directly executable command\n"
+            f"   - Real OS binary names, correct flags, proper escaping, real filesystem paths\n"
+            f"   - Do NOT insert inline comments inside command or cleanup_procedure strings\n"
+            f"   - Do NOT use placeholder values like `<target>` or `$VICTIM_IP`\n"
+            f"   - A cleanup_procedure that reverses all changes (also directly executable)\n"
+            f"3. **payload_description** must contain all explanatory/contextual text\n\n"
+        )
+    return (
         f"## Requirements\n\n"
         f"1. **attack_category** must be `{category}`\n"
         f"2. **mitre_mapping** must reference a real technique from the research\n"
@@ -435,5 +1829,4 @@ def _build_composition_prompt(
         f"6. **simulation_only** must be `true`\n"
         f"7. **approval_status** must be `PENDING`\n"
         f"8. **created_by** must be `AI`\n\n"
-        f"Return a single Ability JSON object."
     )
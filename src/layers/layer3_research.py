@@ -0,0 +1,134 @@
+"""Layer 3 — Structured per-technique research records.
+
+Turns a Phase A result (free-text reasoning + tool-call log) into one
+``TechniqueResearch`` record per technique, so each Phase B composition
+receives only the research for the technique it was assigned instead of
+the whole Phase A context.
+
+Usage:
+    from src.layers.layer3_research import extract_research
+
+    records = extract_research(phase_a_result.text, phase_a_result.tool_calls)
+    prompt_context = records[0].to_context()
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.layers.layer3_planner import compact_intel
+
+logger = logging.getLogger(__name__)
+
+TECHNIQUE_ID_PATTERN = re.compile(r"\bT\d{4}(?:\.\d{3})?\b")
+
+
+@dataclass
+class TechniqueResearch:
+    """Phase A research for a single technique."""
+
+    attack_id: str
+    name: str = ""
+    intel: dict[str, Any] = field(default_factory=dict)  # compact_intel() output
+    notes: list[str] = field(default_factory=list)  # Phase A paragraphs about it
+
+    def to_context(self) -> str:
+        """Render the record as the Phase B research context."""
+        title = f"{self.attack_id} — {self.name}" if self.name else self.attack_id
+        parts = [f"### {title}"]
+        if self.intel:
+            parts.append(json.dumps(self.intel, ensure_ascii=False, default=str))
+        if self.notes:
+            parts.append("Research notes:\n\n" + "\n\n".join(self.notes))
+        return "\n\n".join(parts)
+
+
+def extract_research(
+    text: str,
+    tool_calls: list[dict[str, Any]],
+    *,
+    include_notes: bool = True,
+) -> list[TechniqueResearch]:
+    """Build per-technique research records from a Phase A result.
+
+    Techniques enriched via ``get_technique_intel`` come first, in order of
+    first mention in the Phase A text (the LLM's selection order), followed
+    by techniques that were only mentioned in the text.
+
+    Args:
+        text: Phase A reasoning text.
+        tool_calls: Phase A tool-call log (``name`` / ``arguments`` /
+            ``result`` dicts, as produced by every ``LLMClient``).
+        include_notes: Attach Phase A paragraphs that mention each
+            technique.  Disable when the text is already structured
+            (graph-first plan) to avoid repeating the intel.
+
+    Returns:
+        List of ``TechniqueResearch`` records (empty if Phase A mentioned
+        no technique IDs and fetched no intel).
+    """
+    intel_by_id: dict[str, dict[str, Any]] = {}
+    for call in tool_calls:
+        if call.get("name") != "get_technique_intel":
+            continue
+        intel = _tool_result_dict(call.get("result"))
+        if not intel or "error" in intel:
+            continue
+        attack_id = intel.get("attack_id") or call.get("arguments", {}).get("technique_id")
+        if attack_id:
+            intel_by_id.setdefault(attack_id, intel)
+
+    # Enriched techniques are the ones Phase A actually selected; IDs that
+    # are only mentioned in passing (parents, alternatives) go last.
+    mentioned = list(dict.fromkeys(TECHNIQUE_ID_PATTERN.findall(text or "")))
+    ordered_ids = [tid for tid in mentioned if tid in intel_by_id]
+    ordered_ids += [tid for tid in intel_by_id if tid not in ordered_ids]
+    ordered_ids += [tid for tid in mentioned if tid not in intel_by_id]
+
+    paragraphs = _paragraphs(text) if include_notes else []
+
+    records: list[TechniqueResearch] = []
+    for attack_id in ordered_ids:
+        intel = intel_by_id.get(attack_id, {})
+        mention = re.compile(rf"\b{re.escape(attack_id)}\b(?!\.\d)")
+        records.append(
+            TechniqueResearch(
+                attack_id=attack_id,
+                name=intel.get("name", ""),
+                intel=compact_intel(intel) if intel else {},
+                notes=[p for p in paragraphs if mention.search(p)],
+            )
+        )
+
+    logger.info(
+        "Extracted research for %d techniques (%d with intel)",
+        len(records),
+        len(intel_by_id),
+    )
+    return records
+
+
+def _tool_result_dict(result: Any) -> dict[str, Any]:
+    """Normalise a logged tool result to a dict.
+
+    OpenAI-compatible clients log the JSON string sent back to the model;
+    Gemini logs the function response, which the SDK wraps as
+    ``{"result": <return value>}``.
+    """
+    if isinstance(result, str):
+        try:
+            result = json.loads(result)
+        except json.JSONDecodeError:
+            return {}
+    if isinstance(result, dict) and set(result) == {"result"}:
+        result = result["result"]
+    return result if isinstance(result, dict) else {}
+
+
+def _paragraphs(text: str) -> list[str]:
+    """Split Phase A text into blank-line separated paragraphs."""
+    return [p.strip() for p in re.split(r"\n\s*\n", text or "") if p.strip()]
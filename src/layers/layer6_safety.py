@@ -27,6 +27,7 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
+from src import tracing
 from src.config import (
     AUDIT_LOG_PATH,
     BLOCKLIST_VERSION,
@@ -133,6 +134,16 @@ class SafetyValidator:
         Returns a ``ValidationResult`` with pass/fail status, hard
         failures, and soft warnings.
         """
+        with tracing.span("safety.validate", {"ability.id": ability.id}) as span:
+            result = self._validate(ability)
+            span.set_attributes({
+                "safety.passed": result.passed,
+                "safety.hard_failures": len(result.hard_failures),
+                "safety.warnings": len(result.warnings),
+            })
+        return result
+
+    def _validate(self, ability: Ability) -> ValidationResult:
         hard_failures: list[RuleResult] = []
         warnings: list[RuleResult] = []
         all_results: list[RuleResult] = []
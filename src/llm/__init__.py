@@ -11,11 +11,19 @@ Usage:
 from src.config import Settings
 from src.llm.base import GenerateResult, LLMClient
 from src.llm.gemini_client import GeminiClient
+from src.llm.rate_limit import RateLimiter, shared_rate_limiter
 
 
 def create_llm_client(settings: Settings) -> LLMClient:
     """Create LLM client based on provider setting.
 
+    Clients of the same provider share one process-wide rate limiter
+    (``<PROVIDER>_RPM`` / ``<PROVIDER>_TPM``).  ``LLM_PROVIDER=router``
+    returns a ``RoutingLLMClient`` over ``LLM_ROUTER_PROVIDERS``;
+    ``LLM_HEDGING=true`` wraps the result in a ``HedgedLLMClient``.
+    ``LLM_CASSETTE_MODE=record|replay`` wraps it in a ``CassetteLLMClient``
+    (replay needs no provider at all).
+
     Args:
         settings: Application settings with provider config.
 
@@ -25,11 +33,70 @@ def create_llm_client(settings: Settings) -> LLMClient:
     Raises:
         ValueError: If settings.llm_provider is not recognized.
     """
-    match settings.llm_provider:
+    if settings.llm_cassette_mode == "replay":
+        return _cassette(None, settings)
+
+    if settings.llm_provider == "router":
+        from src.llm.router import RoutingLLMClient
+
+        names = [
+            name.strip()
+            for name in settings.llm_router_providers.split(",")
+            if name.strip()
+        ]
+        client: LLMClient = RoutingLLMClient(
+            {name: _create_provider(name, settings) for name in names}
+        )
+    else:
+        client = _create_provider(settings.llm_provider, settings)
+
+    if settings.llm_hedging:
+        from src.llm.hedging import HedgedLLMClient
+
+        secondary = (
+            _create_provider(settings.llm_hedge_provider, settings)
+            if settings.llm_hedge_provider
+            else None
+        )
+        client = HedgedLLMClient(client, secondary=secondary)
+
+    if settings.llm_cassette_mode == "record":
+        return _cassette(client, settings)
+    return client
+
+
+def _cassette(inner: LLMClient | None, settings: Settings) -> LLMClient:
+    """Wrap *inner* in the configured record / replay cassette."""
+    from src.config import CASSETTE_DIR
+    from src.llm.cassette import CassetteLLMClient
+
+    return CassetteLLMClient(
+        inner,
+        CASSETTE_DIR / settings.llm_cassette_name,
+        mode=settings.llm_cassette_mode,
+        latency=(
+            settings.llm_cassette_latency if settings.llm_cassette_latency >= 0 else None
+        ),
+    )
+
+
+def _create_provider(provider: str, settings: Settings) -> LLMClient:
+    """Create the client for a single named provider."""
+    client = _build_provider(provider, settings)
+    client.provider = provider
+    return client
+
+
+def _build_provider(provider: str, settings: Settings) -> LLMClient:
+    match provider:
         case "gemini":
             return GeminiClient(
                 api_key=settings.gemini_api_key,
                 model=settings.gemini_model,
+                manual_function_calling=settings.gemini_manual_function_calling,
+                rate_limiter=shared_rate_limiter(
+                    "gemini", settings.gemini_rpm, settings.gemini_tpm
+                ),
             )
         case "groq":
             from src.llm.openai_compat import OpenAICompatClient
@@ -37,6 +104,9 @@ def create_llm_client(settings: Settings) -> LLMClient:
                 api_key=settings.groq_api_key,
                 base_url=settings.groq_base_url,
                 model=settings.groq_model,
+                rate_limiter=shared_rate_limiter(
+                    "groq", settings.groq_rpm, settings.groq_tpm
+                ),
             )
         case "ollama":
             from src.llm.openai_compat import OpenAICompatClient
@@ -44,9 +114,28 @@ def create_llm_client(settings: Settings) -> LLMClient:
                 api_key="ollama",
                 base_url=settings.ollama_base_url,
                 model=settings.ollama_model,
+                rate_limiter=shared_rate_limiter(
+                    "ollama", settings.ollama_rpm, settings.ollama_tpm
+                ),
+            )
+        case "local":
+            from src.llm.local_client import LocalLLMClient
+            return LocalLLMClient(
+                latency_ms=settings.local_latency_ms,
+                latency_sigma=settings.local_latency_sigma,
+                tokens_mean=settings.local_tokens_mean,
+                tokens_std=settings.local_tokens_std,
+                fault_rate_limit=settings.local_fault_rate_limit,
+                fault_timeout=settings.local_fault_timeout,
+                fault_invalid_json=settings.local_fault_invalid_json,
+                timeout_seconds=settings.local_timeout_seconds,
+                seed=settings.local_seed if settings.local_seed >= 0 else None,
+                rate_limiter=shared_rate_limiter(
+                    "local", settings.local_rpm, settings.local_tpm
+                ),
             )
         case _:
-            raise ValueError(f"Unknown LLM provider: {settings.llm_provider}")
+            raise ValueError(f"Unknown LLM provider: {provider}")
 
 
 __all__ = [
@@ -54,4 +143,5 @@ __all__ = [
     "LLMClient",
     "GenerateResult",
     "GeminiClient",
+    "RateLimiter",
 ]
@@ -3,7 +3,7 @@
 Defines the base class that all LLM clients (Gemini, Groq, Ollama) must
 implement.  Uses a **single unified ``generate()`` method** that handles
 plain text, tool calling, and structured output depending on the
-arguments provided.
+arguments provided, plus its async counterpart ``agenerate()``.
 
 Usage:
     # Concrete clients are obtained via the factory in ``src.llm``:
@@ -12,20 +12,28 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import random
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Any
 
 from pydantic import BaseModel
 
+from src import metrics, tracing
 from src.config import (
     LLM_BACKOFF_FACTOR,
+    LLM_BACKOFF_JITTER,
     LLM_BASE_DELAY,
     LLM_MAX_DELAY,
     LLM_MAX_RETRIES,
 )
+from src.llm.rate_limit import RateLimiter, retry_after_seconds
+from src.llm.usage import current_phase, current_usage, response_usage
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +44,7 @@ MAX_RETRIES = LLM_MAX_RETRIES
 BASE_DELAY = LLM_BASE_DELAY
 MAX_DELAY = LLM_MAX_DELAY
 BACKOFF_FACTOR = LLM_BACKOFF_FACTOR
+BACKOFF_JITTER = LLM_BACKOFF_JITTER
 
 
 # ──────────────────────────────────────────────────────────────
@@ -55,6 +64,8 @@ class GenerateResult:
     tool_calls: list[dict[str, Any]] = field(default_factory=list)
     raw_response: Any = None
     total_tokens: int = 0
+    model: str = ""  # serving model, set when it can differ (router)
+    repairs: list[str] = field(default_factory=list)  # local structured-output fixes
 
     @property
     def has_tool_calls(self) -> bool:
@@ -76,8 +87,15 @@ class LLMClient(ABC):
     * **tools provided** → function-calling loop (automatic or manual)
     * **schema provided** → structured output with Pydantic validation
     * **tools + schema** → tool-augmented structured output (Gemini 3)
+
+    Provider calls made through ``_retry_with_backoff`` queue on the
+    client's shared ``rate_limiter`` (if one is configured) before they
+    are sent.
     """
 
+    rate_limiter: RateLimiter | None = None
+    provider: str = ""  # set by the factory; labels provider metrics
+
     @property
     @abstractmethod
     def model_name(self) -> str:
@@ -113,12 +131,37 @@ class LLMClient(ABC):
             and token count.
         """
 
-    # ── Retry helper ──────────────────────────────────────────
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Async counterpart of ``generate()`` (same arguments and result).
+
+        The default runs ``generate()`` in a worker thread; providers with
+        an async SDK override it so no thread is held while waiting on the
+        network.  Cancelling the awaiting task abandons the call.
+        """
+        return await asyncio.to_thread(
+            self.generate,
+            messages,
+            tools=tools,
+            schema=schema,
+            max_iterations=max_iterations,
+            **kwargs,
+        )
+
+    # ── Retry helpers ─────────────────────────────────────────
 
     def _retry_with_backoff(
         self,
         func: Any,
         *args: Any,
+        estimated_tokens: int = 0,
         **kwargs: Any,
     ) -> Any:
         """Execute *func* with exponential backoff on transient failures.
@@ -126,47 +169,208 @@ class LLMClient(ABC):
         Retryable: HTTP 429 (rate limit), HTTP 5xx (server error),
         connection / timeout errors.  Non-retryable: 401/403 (auth),
         unknown errors — propagated immediately.
+
+        Each attempt first waits on ``rate_limiter`` for one request of
+        *estimated_tokens* prompt tokens.  Backoff delays are jittered and
+        never shorter than the provider's ``Retry-After``, which also
+        pauses the shared limiter for every other caller.  Each attempt is
+        traced as an ``llm.attempt`` span (attempt number, tokens) and
+        counted in the provider metrics (``src.metrics``).
         """
         delay = BASE_DELAY
         last_exc: Exception | None = None
 
         for attempt in range(1, MAX_RETRIES + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(estimated_tokens)
             try:
-                return func(*args, **kwargs)
+                with self._attempt(attempt) as span:
+                    result = func(*args, **kwargs)
+                    span.set_attributes(_usage_attributes(result))
             except Exception as exc:
                 last_exc = exc
-                exc_str = str(exc).lower()
-
-                # Non-retryable auth errors
-                if "401" in exc_str or "403" in exc_str or "unauthorized" in exc_str:
-                    logger.error("Auth error (non-retryable): %s", exc)
+                if not _is_retryable(exc):
                     raise
+                if attempt < MAX_RETRIES:
+                    wait = self._backoff_delay(delay, exc)
+                    _log_backoff(attempt, wait, exc)
+                    self._count_retry()
+                    time.sleep(wait)
+                    delay = min(delay * BACKOFF_FACTOR, MAX_DELAY)
+                else:
+                    _log_exhausted(exc)
+            else:
+                self._record_usage(estimated_tokens, result)
+                return result
 
-                # Retryable conditions
-                is_retryable = any(
-                    keyword in exc_str
-                    for keyword in ("429", "rate", "500", "502", "503", "504", "timeout", "connection")
-                )
+        raise last_exc  # type: ignore[misc]
 
-                if not is_retryable:
-                    logger.error("Non-retryable error: %s", exc)
-                    raise
+    async def _aretry_with_backoff(
+        self,
+        func: Any,
+        *args: Any,
+        estimated_tokens: int = 0,
+        **kwargs: Any,
+    ) -> Any:
+        """Async ``_retry_with_backoff``: awaits ``func(*args, **kwargs)``.
 
+        Backs off (and queues on the rate limiter) with ``asyncio.sleep``
+        so the event loop keeps serving other requests.
+        ``asyncio.CancelledError`` is never retried — a cancelled task
+        stops at the current attempt or sleep.
+        """
+        delay = BASE_DELAY
+        last_exc: Exception | None = None
+
+        for attempt in range(1, MAX_RETRIES + 1):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire(estimated_tokens)
+            try:
+                with self._attempt(attempt) as span:
+                    result = await func(*args, **kwargs)
+                    span.set_attributes(_usage_attributes(result))
+            except Exception as exc:
+                last_exc = exc
+                if not _is_retryable(exc):
+                    raise
                 if attempt < MAX_RETRIES:
-                    logger.warning(
-                        "Retryable error (attempt %d/%d), backing off %.1fs: %s",
-                        attempt,
-                        MAX_RETRIES,
-                        delay,
-                        exc,
-                    )
-                    time.sleep(delay)
+                    wait = self._backoff_delay(delay, exc)
+                    _log_backoff(attempt, wait, exc)
+                    self._count_retry()
+                    await asyncio.sleep(wait)
                     delay = min(delay * BACKOFF_FACTOR, MAX_DELAY)
                 else:
-                    logger.error(
-                        "All %d retries exhausted. Last error: %s",
-                        MAX_RETRIES,
-                        exc,
-                    )
+                    _log_exhausted(exc)
+            else:
+                self._record_usage(estimated_tokens, result)
+                return result
 
         raise last_exc  # type: ignore[misc]
+
+    @contextmanager
+    def _attempt(self, attempt: int) -> Iterator[Any]:
+        """Trace and time one provider request; yields its span.
+
+        HTTP 429 rejections are counted here, retried or not.
+        """
+        provider = self.provider or "unknown"
+        start = time.perf_counter()
+        metrics.LLM_IN_FLIGHT.inc(provider=provider)
+        try:
+            with tracing.span(
+                "llm.attempt", {"llm.model": self.model_name, "llm.attempt": attempt}
+            ) as span:
+                yield span
+        except Exception as exc:
+            if _is_rate_limit(exc):
+                metrics.LLM_RATE_LIMITED.inc(provider=provider)
+            raise
+        finally:
+            metrics.LLM_IN_FLIGHT.dec(provider=provider)
+            metrics.LLM_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, provider=provider, phase=current_phase()
+            )
+
+    def _count_retry(self) -> None:
+        metrics.LLM_RETRIES.inc(provider=self.provider or "unknown")
+        scope = current_usage()
+        if scope is not None:
+            scope.add_retry()
+
+    def _backoff_delay(self, delay: float, exc: Exception) -> float:
+        """Jittered backoff, honouring (and propagating) ``Retry-After``."""
+        wait = min(delay * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER), MAX_DELAY)
+        retry_after = retry_after_seconds(exc)
+        if retry_after is None:
+            return wait
+        if self.rate_limiter is not None:
+            self.rate_limiter.pause(retry_after)
+        return max(wait, retry_after)
+
+    def _record_usage(self, estimated_tokens: int, response: Any) -> None:
+        """Correct the rate limiter's token estimate with the real usage.
+
+        The response's token breakdown is also counted in the current
+        ``UsageScope`` (see ``src.llm.usage``) and the token metrics.
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_usage(estimated_tokens, _response_tokens(response))
+        scope = current_usage()
+        if scope is not None:
+            scope.add_response(response)
+        _count_tokens(self.provider or "unknown", response)
+
+
+# ──────────────────────────────────────────────────────────────
+# Retry classification
+# ──────────────────────────────────────────────────────────────
+
+def _is_retryable(exc: Exception) -> bool:
+    """Classify a provider error (logs non-retryable ones)."""
+    exc_str = str(exc).lower()
+
+    # Non-retryable auth errors
+    if "401" in exc_str or "403" in exc_str or "unauthorized" in exc_str:
+        logger.error("Auth error (non-retryable): %s", exc)
+        return False
+
+    # Retryable conditions
+    is_retryable = any(
+        keyword in exc_str
+        for keyword in ("429", "rate", "500", "502", "503", "504", "timeout", "connection")
+    )
+    if not is_retryable:
+        logger.error("Non-retryable error: %s", exc)
+    return is_retryable
+
+
+def _response_tokens(response: Any) -> int:
+    """Total tokens reported by an OpenAI or Gemini response (0 if unknown)."""
+    return response_usage(response)[3]
+
+
+def _usage_attributes(response: Any) -> dict[str, Any]:
+    """Token breakdown of *response* as span attributes."""
+    input_tokens, output_tokens, cached_tokens, total_tokens = response_usage(response)
+    return {
+        "llm.input_tokens": input_tokens,
+        "llm.output_tokens": output_tokens,
+        "llm.cached_tokens": cached_tokens,
+        "llm.total_tokens": total_tokens,
+    }
+
+
+def _is_rate_limit(exc: Exception) -> bool:
+    exc_str = str(exc).lower()
+    return "429" in exc_str or "resource_exhausted" in exc_str or "rate limit" in exc_str
+
+
+def _count_tokens(provider: str, response: Any) -> None:
+    """Token and prompt-cache metrics of one provider response."""
+    input_tokens, output_tokens, cached_tokens, _ = response_usage(response)
+    phase = current_phase()
+    metrics.LLM_TOKENS.inc(input_tokens, provider=provider, phase=phase, type="input")
+    metrics.LLM_TOKENS.inc(output_tokens, provider=provider, phase=phase, type="output")
+    metrics.LLM_TOKENS.inc(cached_tokens, provider=provider, phase=phase, type="cached")
+    if input_tokens:
+        metrics.CACHE_REQUESTS.inc(
+            cache="llm_prompt", outcome="hit" if cached_tokens else "miss"
+        )
+
+
+def _log_backoff(attempt: int, delay: float, exc: Exception) -> None:
+    logger.warning(
+        "Retryable error (attempt %d/%d), backing off %.1fs: %s",
+        attempt,
+        MAX_RETRIES,
+        delay,
+        exc,
+    )
+
+
+def _log_exhausted(exc: Exception) -> None:
+    logger.error(
+        "All %d retries exhausted. Last error: %s",
+        MAX_RETRIES,
+        exc,
+    )
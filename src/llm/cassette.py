@@ -0,0 +1,297 @@
+"""Record / replay cassettes for LLM calls — offline benchmarks and CI.
+
+``CassetteLLMClient`` wraps an ``LLMClient``:
+
+``record``
+    Calls go to the wrapped client.  Each request (messages, tool
+    signatures, response schema, options) is stored with its response —
+    text, parsed object, tool-call sequence, tokens, latency — under a
+    stable request hash, one JSON file per hash.
+``replay``
+    Responses are served from the cassette; no wrapped client (and no API
+    key) is needed.  The recorded tool-call sequence is re-executed against
+    the *tools passed to the call*, so tool closures still run against the
+    real graph or a graph snapshot (``src.graph.snapshot``).  Latency is
+    simulated: the recorded latency, or a fixed value.
+
+Identical requests recorded several times (e.g. regenerations) are
+replayed in recording order.  A request missing from the cassette raises
+``CassetteMissError``.
+
+Usage:
+    from src.llm.cassette import CassetteLLMClient
+
+    llm = CassetteLLMClient(create_llm_client(settings), "output/cassettes/ci",
+                            mode="record")
+    ...
+    llm = CassetteLLMClient(None, "output/cassettes/ci", mode="replay",
+                            latency=0.0)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from src.llm.base import GenerateResult, LLMClient
+from src.llm.tool_executor import run_tool_calls
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("record", "replay")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request is not in the cassette."""
+
+
+class CassetteLLMClient(LLMClient):
+    """Record LLM interactions to disk or replay them deterministically.
+
+    Args:
+        inner: Client that serves recorded calls (``None`` in replay mode).
+        path: Cassette directory (created on first recording).
+        mode: ``"record"`` or ``"replay"``.
+        latency: Replay latency in seconds; ``None`` replays the recorded
+            latency of each call.
+    """
+
+    def __init__(
+        self,
+        inner: LLMClient | None,
+        path: str | Path,
+        *,
+        mode: str = "replay",
+        latency: float | None = None,
+    ) -> None:
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        if mode == "record" and inner is None:
+            raise ValueError("Recording needs a client to record from")
+        self._inner = inner
+        self._path = Path(path)
+        self._mode = mode
+        self._latency = latency
+        self._lock = threading.Lock()
+        self._replayed: dict[str, int] = defaultdict(int)
+        logger.info("LLM cassette (%s): %s", mode, self._path)
+
+    @property
+    def model_name(self) -> str:
+        if self._inner is not None:
+            return self._inner.model_name
+        return f"cassette:{self._path.name}"
+
+    # ──────────────────────────────────────────────────────────
+    # generate / agenerate
+    # ──────────────────────────────────────────────────────────
+
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Record or replay one ``generate`` call."""
+        key = request_key(messages, tools, schema, max_iterations, kwargs)
+        if self._mode == "replay":
+            entry = self._next_entry(key)
+            delay = self._replay_delay(entry)
+            if delay > 0:
+                time.sleep(delay)
+            return self._replay(entry, tools, schema)
+
+        start = time.monotonic()
+        result = self._inner.generate(  # type: ignore[union-attr]
+            messages, tools=tools, schema=schema, max_iterations=max_iterations, **kwargs
+        )
+        self._record(key, messages, tools, schema, result, time.monotonic() - start)
+        return result
+
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Async ``generate`` (replayed tool calls run in a worker thread)."""
+        key = request_key(messages, tools, schema, max_iterations, kwargs)
+        if self._mode == "replay":
+            entry = self._next_entry(key)
+            delay = self._replay_delay(entry)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            return await asyncio.to_thread(self._replay, entry, tools, schema)
+
+        start = time.monotonic()
+        result = await self._inner.agenerate(  # type: ignore[union-attr]
+            messages, tools=tools, schema=schema, max_iterations=max_iterations, **kwargs
+        )
+        await asyncio.to_thread(
+            self._record, key, messages, tools, schema, result, time.monotonic() - start
+        )
+        return result
+
+    # ──────────────────────────────────────────────────────────
+    # Record
+    # ──────────────────────────────────────────────────────────
+
+    def _record(
+        self,
+        key: str,
+        messages: list[dict[str, str]],
+        tools: list[Any] | None,
+        schema: type[BaseModel] | None,
+        result: GenerateResult,
+        latency: float,
+    ) -> None:
+        """Append one interaction to the cassette file for *key*."""
+        parsed = result.parsed
+        entry = {
+            "request": {
+                "messages": messages,
+                "tools": _tool_signatures(tools),
+                "schema": schema.__name__ if schema else None,
+            },
+            "response": {
+                "text": result.text,
+                "parsed": (
+                    parsed.model_dump(mode="json") if isinstance(parsed, BaseModel) else parsed
+                ),
+                "tool_calls": [
+                    {"name": call["name"], "arguments": call.get("arguments", {})}
+                    for call in result.tool_calls
+                ],
+                "total_tokens": result.total_tokens,
+                "model": result.model or self.model_name,
+                "repairs": result.repairs,
+            },
+            "latency_s": round(latency, 3),
+        }
+        with self._lock:
+            file = self._file(key)
+            entries = _load(file)
+            entries.append(entry)
+            file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = file.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps(entries, indent=2, ensure_ascii=False, default=str),
+                encoding="utf-8",
+            )
+            tmp.replace(file)
+
+    # ──────────────────────────────────────────────────────────
+    # Replay
+    # ──────────────────────────────────────────────────────────
+
+    def _next_entry(self, key: str) -> dict[str, Any]:
+        """Next recorded interaction for *key* (cycles when exhausted)."""
+        entries = _load(self._file(key))
+        if not entries:
+            raise CassetteMissError(f"Request {key[:12]} not in cassette {self._path}")
+        with self._lock:
+            index = self._replayed[key]
+            self._replayed[key] = index + 1
+        return entries[index % len(entries)]
+
+    def _replay_delay(self, entry: dict[str, Any]) -> float:
+        return entry.get("latency_s", 0.0) if self._latency is None else self._latency
+
+    def _replay(
+        self,
+        entry: dict[str, Any],
+        tools: list[Any] | None,
+        schema: type[BaseModel] | None,
+    ) -> GenerateResult:
+        """Rebuild a ``GenerateResult``, re-running recorded tool calls."""
+        response = entry["response"]
+        recorded_calls = response.get("tool_calls", [])
+
+        tool_calls: list[dict[str, Any]] = []
+        if recorded_calls:
+            dispatch = {getattr(tool, "__name__", str(tool)): tool for tool in tools or []}
+            results = run_tool_calls(
+                [(call["name"], call.get("arguments", {})) for call in recorded_calls],
+                dispatch,
+            )
+            tool_calls = [
+                {**call, "result": result}
+                for call, result in zip(recorded_calls, results)
+            ]
+
+        parsed = response.get("parsed")
+        if schema is not None and parsed is not None:
+            parsed = schema.model_validate(parsed)
+
+        return GenerateResult(
+            text=response.get("text", ""),
+            parsed=parsed,
+            tool_calls=tool_calls,
+            total_tokens=response.get("total_tokens", 0),
+            model=response.get("model", ""),
+            repairs=list(response.get("repairs", [])),
+        )
+
+    def _file(self, key: str) -> Path:
+        return self._path / "llm" / f"{key}.json"
+
+
+# ──────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────
+
+def request_key(
+    messages: list[dict[str, str]],
+    tools: list[Any] | None,
+    schema: type[BaseModel] | None,
+    max_iterations: int,
+    kwargs: dict[str, Any],
+) -> str:
+    """Stable hash of everything that shapes an LLM request."""
+    blob = json.dumps(
+        {
+            "messages": messages,
+            "tools": _tool_signatures(tools),
+            "schema": schema.model_json_schema() if schema else None,
+            "max_iterations": max_iterations if tools else None,
+            "options": kwargs,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _tool_signatures(tools: list[Any] | None) -> list[str]:
+    """``name(signature)`` for each tool — what the model is shown."""
+    signatures = []
+    for tool in tools or []:
+        name = getattr(tool, "__name__", str(tool))
+        try:
+            signatures.append(f"{name}{inspect.signature(tool)}")
+        except (TypeError, ValueError):
+            signatures.append(name)
+    return signatures
+
+
+def _load(file: Path) -> list[dict[str, Any]]:
+    if not file.exists():
+        return []
+    return json.loads(file.read_text(encoding="utf-8"))
@@ -2,10 +2,15 @@
 
 Uses a **single** ``client.models.generate_content()`` call for all modes:
 - Plain text (no tools, no schema)
-- Automatic function calling (tools provided — SDK manages the loop)
+- Automatic function calling (tools provided — SDK manages the loop), or
+  a manual loop that runs each turn's tool calls concurrently
+  (``manual_function_calling=True``)
 - Structured output (response_schema — SDK returns ``response.parsed``)
 - Tools + structured output combined (Gemini 3 feature)
 
+``agenerate()`` runs the same modes on the SDK's async client
+(``client.aio``).
+
 Reference: https://ai.google.dev/gemini-api/docs/function-calling
 Reference: https://ai.google.dev/gemini-api/docs/migrate
 
@@ -18,6 +23,7 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -27,6 +33,9 @@ from pydantic import BaseModel, ValidationError
 
 from src.config import MAX_VALIDATION_RETRIES
 from src.llm.base import LLMClient, GenerateResult
+from src.llm.rate_limit import RateLimiter, estimate_tokens
+from src.llm.repair import validate_with_repair
+from src.llm.tool_executor import run_tool_calls
 
 logger = logging.getLogger(__name__)
 
@@ -49,12 +58,28 @@ class GeminiClient(LLMClient):
     +------------+--------+---------------------------------------------+
     | [funcs]    | Model  | Function calling + structured output        |
     +------------+--------+---------------------------------------------+
+
+    With ``manual_function_calling=True`` the tool round-trips run in
+    ``_manual_tool_loop`` instead of the SDK, so calls requested in the
+    same turn execute concurrently.
     """
 
-    def __init__(self, api_key: str, model: str = "gemini-3-flash-preview") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-3-flash-preview",
+        manual_function_calling: bool = False,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
         self._client = genai.Client(api_key=api_key)
         self._model = model
-        logger.info("GeminiClient initialized with model=%s", model)
+        self._manual_function_calling = manual_function_calling
+        self.rate_limiter = rate_limiter
+        logger.info(
+            "GeminiClient initialized with model=%s (manual function calling=%s)",
+            model,
+            manual_function_calling,
+        )
 
     @property
     def model_name(self) -> str:
@@ -92,28 +117,10 @@ class GeminiClient(LLMClient):
         Returns:
             ``GenerateResult`` with text, parsed object, tool calls, tokens.
         """
-        system_instruction, contents = _messages_to_contents(messages)
-
-        # ── Build config conditionally ────────────────────────
-        config_kwargs: dict[str, Any] = {
-            "systemInstruction": system_instruction,
-            **kwargs,
-        }
-
-        if tools:
-            config_kwargs["tools"] = tools
-            config_kwargs["automaticFunctionCalling"] = (
-                types.AutomaticFunctionCallingConfig(
-                    disable=False,
-                    maximumRemoteCalls=max_iterations,
-                )
-            )
-
-        if schema:
-            config_kwargs["responseMimeType"] = "application/json"
-            config_kwargs["responseSchema"] = _strip_schema_examples(schema)
-
-        config = types.GenerateContentConfig(**config_kwargs)
+        manual = bool(tools) and self._manual_function_calling
+        contents, config = _build_request(
+            messages, tools, schema, max_iterations, manual, kwargs
+        )
 
         # ── Call generate_content (handles everything) ────────
         def _call() -> types.GenerateContentResponse:
@@ -123,37 +130,181 @@ class GeminiClient(LLMClient):
                 config=config,
             )
 
-        response = self._retry_with_backoff(_call)
-
         # ── Extract results ───────────────────────────────────
-        text = response.text or ""
-        tool_call_log = _extract_tool_calls(response) if tools else []
-        total_tokens = _extract_tokens(response)
+        if manual:
+            response, tool_call_log, total_tokens = self._manual_tool_loop(
+                contents, config, tools, max_iterations
+            )
+        else:
+            response = self._retry_with_backoff(
+                _call, estimated_tokens=_prompt_tokens(contents, config)
+            )
+            tool_call_log = _extract_tool_calls(response) if tools else []
+            total_tokens = _extract_tokens(response)
+        text = _response_text(response)
 
         # Structured output — parse with the original Pydantic class.
         # We pass a cleaned dict (not the class) as responseSchema, so
         # response.parsed won't be available; always validate manually.
         parsed = None
+        repairs: list[str] = []
         if schema:
-            parsed = self._validate_with_retry(
+            parsed, repairs = self._validate_with_retry(
                 text, schema, contents, config
             )
 
-        logger.info(
-            "Gemini generate: tools=%s schema=%s tool_calls=%d tokens=%d",
-            bool(tools),
-            schema.__name__ if schema else None,
+        return _finish(
+            text, parsed, repairs, tool_call_log, response, total_tokens, tools, schema
+        )
+
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Async ``generate()`` on the SDK's async client (``client.aio``).
+
+        Tool round-trips always use the manual loop here: the SDK's
+        automatic mode would run our blocking (Neo4j) tools on the event
+        loop, so each turn's calls are dispatched to worker threads instead.
+        """
+        contents, config = _build_request(
+            messages, tools, schema, max_iterations, bool(tools), kwargs
+        )
+
+        if tools:
+            response, tool_call_log, total_tokens = await self._amanual_tool_loop(
+                contents, config, tools, max_iterations
+            )
+        else:
+            response = await self._aretry_with_backoff(
+                lambda: self._client.aio.models.generate_content(
+                    model=self._model,
+                    contents=contents,
+                    config=config,
+                ),
+                estimated_tokens=_prompt_tokens(contents, config),
+            )
+            tool_call_log = []
+            total_tokens = _extract_tokens(response)
+        text = _response_text(response)
+
+        parsed = None
+        repairs: list[str] = []
+        if schema:
+            parsed, repairs = await self._avalidate_with_retry(
+                text, schema, contents, config
+            )
+
+        return _finish(
+            text, parsed, repairs, tool_call_log, response, total_tokens, tools, schema
+        )
+
+    # ──────────────────────────────────────────────────────────
+    # Manual function calling
+    # ──────────────────────────────────────────────────────────
+
+    def _manual_tool_loop(
+        self,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+        tools: list[Any],
+        max_iterations: int,
+    ) -> tuple[types.GenerateContentResponse | None, list[dict[str, Any]], int]:
+        """Function-calling loop with concurrent per-turn tool dispatch.
+
+        Mirrors the SDK's automatic mode — function responses are wrapped
+        as ``{"result": <return value>}`` — but executes all calls from one
+        model turn together via ``run_tool_calls``.  *contents* is extended
+        in place with the tool round-trips.
+
+        Returns:
+            Tuple of (final response or ``None`` if *max_iterations* ran
+            out, tool-call log, total tokens).
+        """
+        dispatch_map = {func.__name__: func for func in tools}
+        tool_call_log: list[dict[str, Any]] = []
+        total_tokens = 0
+
+        for iteration in range(1, max_iterations + 1):
+            response = self._retry_with_backoff(
+                lambda: self._client.models.generate_content(
+                    model=self._model,
+                    contents=contents,
+                    config=config,
+                ),
+                estimated_tokens=_prompt_tokens(contents, config),
+            )
+            total_tokens += _extract_tokens(response)
+
+            function_calls = response.function_calls or []
+            if not function_calls:
+                logger.info(
+                    "Gemini tool loop finished: %d iterations, %d calls",
+                    iteration,
+                    len(tool_call_log),
+                )
+                return response, tool_call_log, total_tokens
+
+            contents.append(response.candidates[0].content)
+            calls = _function_calls(function_calls)
+            results = run_tool_calls(calls, dispatch_map)
+            contents.append(_function_responses(calls, results, tool_call_log))
+
+        logger.warning(
+            "Gemini tool loop hit max_iterations=%d with %d calls",
+            max_iterations,
             len(tool_call_log),
-            total_tokens,
         )
+        return None, tool_call_log, total_tokens
+
+    async def _amanual_tool_loop(
+        self,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+        tools: list[Any],
+        max_iterations: int,
+    ) -> tuple[types.GenerateContentResponse | None, list[dict[str, Any]], int]:
+        """Async ``_manual_tool_loop`` (tools run in a worker thread)."""
+        dispatch_map = {func.__name__: func for func in tools}
+        tool_call_log: list[dict[str, Any]] = []
+        total_tokens = 0
+
+        for iteration in range(1, max_iterations + 1):
+            response = await self._aretry_with_backoff(
+                lambda: self._client.aio.models.generate_content(
+                    model=self._model,
+                    contents=contents,
+                    config=config,
+                ),
+                estimated_tokens=_prompt_tokens(contents, config),
+            )
+            total_tokens += _extract_tokens(response)
+
+            function_calls = response.function_calls or []
+            if not function_calls:
+                logger.info(
+                    "Gemini async tool loop finished: %d iterations, %d calls",
+                    iteration,
+                    len(tool_call_log),
+                )
+                return response, tool_call_log, total_tokens
+
+            contents.append(response.candidates[0].content)
+            calls = _function_calls(function_calls)
+            results = await asyncio.to_thread(run_tool_calls, calls, dispatch_map)
+            contents.append(_function_responses(calls, results, tool_call_log))
 
-        return GenerateResult(
-            text=text,
-            parsed=parsed,
-            tool_calls=tool_call_log,
-            raw_response=response,
-            total_tokens=total_tokens,
+        logger.warning(
+            "Gemini async tool loop hit max_iterations=%d with %d calls",
+            max_iterations,
+            len(tool_call_log),
         )
+        return None, tool_call_log, total_tokens
 
     # ──────────────────────────────────────────────────────────
     # Validation retry for structured output
@@ -165,16 +316,20 @@ class GeminiClient(LLMClient):
         schema: type[BaseModel],
         contents: list[types.Content],
         config: types.GenerateContentConfig,
-    ) -> BaseModel:
+    ) -> tuple[BaseModel, list[str]]:
         """Validate JSON against schema with retry on failure.
 
         Only called as a fallback when ``response.parsed`` is unavailable.
-        Appends validation errors to the conversation so the model can
-        self-correct.
+        Mechanical errors are first repaired locally (``src.llm.repair``);
+        otherwise validation errors are appended to the conversation so the
+        model can self-correct.
+
+        Returns:
+            ``(parsed, repairs)`` — the local repairs that were applied.
         """
         for attempt in range(1, MAX_VALIDATION_RETRIES + 1):
             try:
-                return schema.model_validate_json(raw_text)
+                return validate_with_repair(raw_text, schema)
             except ValidationError as exc:
                 logger.warning(
                     "Validation failed (attempt %d/%d): %s",
@@ -186,24 +341,7 @@ class GeminiClient(LLMClient):
                     raise
 
                 # Append error context for self-correction
-                contents.append(
-                    types.Content(
-                        role="model",
-                        parts=[types.Part.from_text(text=raw_text)],
-                    )
-                )
-                contents.append(
-                    types.Content(
-                        role="user",
-                        parts=[types.Part.from_text(
-                            text=(
-                                f"The JSON you produced has validation errors:\n"
-                                f"{exc}\n\n"
-                                f"Fix the errors and return valid JSON matching the schema."
-                            ),
-                        )],
-                    )
-                )
+                contents.extend(_validation_feedback(raw_text, exc))
 
                 # Retry the call
                 response = self._retry_with_backoff(
@@ -211,23 +349,182 @@ class GeminiClient(LLMClient):
                         model=self._model,
                         contents=contents,
                         config=config,
-                    )
+                    ),
+                    estimated_tokens=_prompt_tokens(contents, config),
                 )
                 raw_text = response.text or ""
 
                 # Check response.parsed on retry too
                 parsed = getattr(response, "parsed", None)
                 if parsed is not None:
-                    return parsed
+                    return parsed, []
 
         # Should never reach here (ValidationError raised above)
         raise RuntimeError("Validation retry exhausted")
 
+    async def _avalidate_with_retry(
+        self,
+        raw_text: str,
+        schema: type[BaseModel],
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+    ) -> tuple[BaseModel, list[str]]:
+        """Async ``_validate_with_retry``."""
+        for attempt in range(1, MAX_VALIDATION_RETRIES + 1):
+            try:
+                return validate_with_repair(raw_text, schema)
+            except ValidationError as exc:
+                logger.warning(
+                    "Validation failed (attempt %d/%d): %s",
+                    attempt,
+                    MAX_VALIDATION_RETRIES,
+                    exc.error_count(),
+                )
+                if attempt == MAX_VALIDATION_RETRIES:
+                    raise
+
+                contents.extend(_validation_feedback(raw_text, exc))
+                response = await self._aretry_with_backoff(
+                    lambda: self._client.aio.models.generate_content(
+                        model=self._model,
+                        contents=contents,
+                        config=config,
+                    ),
+                    estimated_tokens=_prompt_tokens(contents, config),
+                )
+                raw_text = response.text or ""
+
+                parsed = getattr(response, "parsed", None)
+                if parsed is not None:
+                    return parsed, []
+
+        raise RuntimeError("Validation retry exhausted")
+
 
 # ──────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────
 
+def _build_request(
+    messages: list[dict[str, str]],
+    tools: list[Any] | None,
+    schema: type[BaseModel] | None,
+    max_iterations: int,
+    manual: bool,
+    kwargs: dict[str, Any],
+) -> tuple[list[types.Content], types.GenerateContentConfig]:
+    """Build contents + a ``GenerateContentConfig`` for the requested mode."""
+    system_instruction, contents = _messages_to_contents(messages)
+
+    config_kwargs: dict[str, Any] = {
+        "systemInstruction": system_instruction,
+        **kwargs,
+    }
+
+    if tools:
+        config_kwargs["tools"] = tools
+        config_kwargs["automaticFunctionCalling"] = (
+            types.AutomaticFunctionCallingConfig(disable=True)
+            if manual
+            else types.AutomaticFunctionCallingConfig(
+                disable=False,
+                maximumRemoteCalls=max_iterations,
+            )
+        )
+
+    if schema:
+        config_kwargs["responseMimeType"] = "application/json"
+        config_kwargs["responseSchema"] = _strip_schema_examples(schema)
+
+    return contents, types.GenerateContentConfig(**config_kwargs)
+
+
+def _prompt_tokens(
+    contents: list[types.Content],
+    config: types.GenerateContentConfig,
+) -> int:
+    """Estimated prompt tokens (system instruction + contents) for rate limiting."""
+    return estimate_tokens([config.system_instruction, contents])
+
+
+def _finish(
+    text: str,
+    parsed: Any,
+    repairs: list[str],
+    tool_call_log: list[dict[str, Any]],
+    response: types.GenerateContentResponse | None,
+    total_tokens: int,
+    tools: list[Any] | None,
+    schema: type[BaseModel] | None,
+) -> GenerateResult:
+    """Log and wrap a finished generation."""
+    logger.info(
+        "Gemini generate: tools=%s schema=%s tool_calls=%d tokens=%d",
+        bool(tools),
+        schema.__name__ if schema else None,
+        len(tool_call_log),
+        total_tokens,
+    )
+    return GenerateResult(
+        text=text,
+        parsed=parsed,
+        tool_calls=tool_call_log,
+        raw_response=response,
+        total_tokens=total_tokens,
+        repairs=repairs,
+    )
+
+
+def _function_calls(function_calls: list[types.FunctionCall]) -> list[tuple[str, dict[str, Any]]]:
+    """``(name, arguments)`` pairs from a turn's function calls."""
+    return [(fc.name, dict(fc.args) if fc.args else {}) for fc in function_calls]
+
+
+def _function_responses(
+    calls: list[tuple[str, dict[str, Any]]],
+    results: list[Any],
+    tool_call_log: list[dict[str, Any]],
+) -> types.Content:
+    """Log one turn's tool results and wrap them as function responses.
+
+    Results are wrapped as ``{"result": ...}`` (errors as ``{"error": ...}``)
+    like the SDK's automatic mode.
+    """
+    parts: list[types.Part] = []
+    for (name, arguments), result in zip(calls, results):
+        response_dict = (
+            result if isinstance(result, dict) and "error" in result
+            else {"result": result}
+        )
+        tool_call_log.append({
+            "name": name,
+            "arguments": arguments,
+            "result": response_dict,
+        })
+        parts.append(types.Part.from_function_response(name=name, response=response_dict))
+    return types.Content(role="user", parts=parts)
+
+
+def _validation_feedback(raw_text: str, exc: ValidationError) -> list[types.Content]:
+    """Turns asking the model to fix its invalid JSON."""
+    return [
+        types.Content(
+            role="model",
+            parts=[types.Part.from_text(text=raw_text)],
+        ),
+        types.Content(
+            role="user",
+            parts=[types.Part.from_text(
+                text=(
+                    f"The JSON you produced has validation errors:\n"
+                    f"{exc}\n\n"
+                    f"Fix the errors and return valid JSON matching the schema."
+                ),
+            )],
+        ),
+    ]
+
+
 def _messages_to_contents(
     messages: list[dict[str, str]],
 ) -> tuple[str | None, list[types.Content]]:
@@ -323,6 +620,13 @@ def _extract_tool_calls(response: types.GenerateContentResponse) -> list[dict[st
     return tool_calls
 
 
+def _response_text(response: types.GenerateContentResponse | None) -> str:
+    """Return the response text, or ``""`` when there is no final response."""
+    if response is None:
+        return ""
+    return response.text or ""
+
+
 def _extract_tokens(response: types.GenerateContentResponse) -> int:
     """Extract total token count from Gemini response metadata."""
     usage = getattr(response, "usage_metadata", None)
@@ -0,0 +1,275 @@
+"""Hedged LLM requests — trade a little extra traffic for a shorter tail.
+
+``HedgedLLMClient`` wraps a primary ``LLMClient`` (and optionally a
+secondary one).  When a call has not returned within a recent latency
+percentile (``HEDGE_LATENCY_PERCENTILE`` of the last
+``HEDGE_LATENCY_WINDOW`` similar calls), a duplicate is sent to the
+secondary provider — or the same provider when none is configured.
+
+Latencies are kept per pipeline phase and response schema
+(``usage.current_phase()``), so short Phase B completions are not judged
+against Phase A's much longer calls.  Calls that pass ``tools`` are never
+hedged: a duplicate would re-run the whole tool loop.  The first
+*valid* result wins; the loser is cancelled (async) or abandoned and its
+result discarded (sync — a running thread cannot be interrupted).
+
+Hedging only starts after ``HEDGE_MIN_SAMPLES`` latencies are known, and
+at most ``HEDGE_MAX_RATIO`` of calls are ever hedged so cost stays
+bounded.  ``stats()`` reports the hedge rate and how often the hedge won,
+for tuning the percentile.
+
+Usage:
+    from src.llm.hedging import HedgedLLMClient
+
+    llm = HedgedLLMClient(gemini_client, secondary=groq_client)
+    result = llm.generate(messages, schema=Ability)
+    llm.stats()  # {"calls": ..., "hedged": ..., "hedge_wins": ..., "thresholds_s": ...}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from pydantic import BaseModel
+
+from src import tracing
+from src.config import (
+    HEDGE_LATENCY_PERCENTILE,
+    HEDGE_LATENCY_WINDOW,
+    HEDGE_MAX_RATIO,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_WORKERS,
+)
+from src.llm.base import GenerateResult, LLMClient
+from src.llm.usage import current_phase
+
+logger = logging.getLogger(__name__)
+
+
+class HedgedLLMClient(LLMClient):
+    """Send a duplicate of slow calls and keep the first valid result.
+
+    Args:
+        primary: Client every call goes to first.
+        secondary: Client for hedge requests (defaults to *primary*).
+    """
+
+    def __init__(self, primary: LLMClient, secondary: LLMClient | None = None) -> None:
+        self._primary = primary
+        self._secondary = secondary or primary
+        # "<phase>:<schema>" → recent caller-observed latencies
+        self._latencies: dict[str, deque[float]] = {}
+        self._calls = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        logger.info(
+            "HedgedLLMClient initialized: primary=%s hedge=%s (p%.0f, max %.0f%% of calls)",
+            primary.model_name,
+            self._secondary.model_name,
+            HEDGE_LATENCY_PERCENTILE,
+            HEDGE_MAX_RATIO * 100,
+        )
+
+    @property
+    def model_name(self) -> str:
+        return self._primary.model_name
+
+    # ──────────────────────────────────────────────────────────
+    # generate / agenerate
+    # ──────────────────────────────────────────────────────────
+
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Generate on the primary, hedging if it exceeds the latency threshold."""
+        call = dict(tools=tools, schema=schema, max_iterations=max_iterations, **kwargs)
+        if tools:
+            return _tag(self._primary.generate(messages, **call), self._primary)
+        key = _latency_key(schema)
+        start = time.monotonic()
+        threshold = self._begin_call(key)
+        if threshold is None:
+            result = self._primary.generate(messages, **call)
+            self._finish_call(key, start)
+            return _tag(result, self._primary)
+
+        executor = self._get_executor()
+        primary = executor.submit(
+            contextvars.copy_context().run, self._primary.generate, messages, **call
+        )
+        done, _ = wait([primary], timeout=threshold)
+        if done or not self._reserve_hedge(threshold):
+            result = primary.result()
+            self._finish_call(key, start)
+            return _tag(result, self._primary)
+
+        _trace_hedge(threshold)
+        hedge = executor.submit(
+            contextvars.copy_context().run, self._secondary.generate, messages, **call
+        )
+        clients = {primary: self._primary, hedge: self._secondary}
+        pending: set[Future] = {primary, hedge}
+        errors: list[BaseException] = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    errors.append(error)
+                    continue
+                for loser in pending:
+                    loser.cancel()  # no-op once running: result is discarded
+                self._finish_call(key, start, hedge_won=future is hedge)
+                return _tag(future.result(), clients[future])
+        raise errors[0]
+
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Async ``generate``; the losing request is cancelled."""
+        call = dict(tools=tools, schema=schema, max_iterations=max_iterations, **kwargs)
+        if tools:
+            return _tag(await self._primary.agenerate(messages, **call), self._primary)
+        key = _latency_key(schema)
+        start = time.monotonic()
+        threshold = self._begin_call(key)
+        if threshold is None:
+            result = await self._primary.agenerate(messages, **call)
+            self._finish_call(key, start)
+            return _tag(result, self._primary)
+
+        primary = asyncio.ensure_future(self._primary.agenerate(messages, **call))
+        pending: set[asyncio.Future] = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=threshold)
+            if done or not self._reserve_hedge(threshold):
+                result = await primary
+                self._finish_call(key, start)
+                return _tag(result, self._primary)
+
+            _trace_hedge(threshold)
+            hedge = asyncio.ensure_future(self._secondary.agenerate(messages, **call))
+            clients = {primary: self._primary, hedge: self._secondary}
+            pending = {primary, hedge}
+            errors: list[BaseException] = []
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is not None:
+                        errors.append(error)
+                        continue
+                    self._finish_call(key, start, hedge_won=task is hedge)
+                    return _tag(task.result(), clients[task])
+            raise errors[0]
+        finally:
+            for task in pending:
+                task.cancel()  # loser, or everything if the caller was cancelled
+
+    # ──────────────────────────────────────────────────────────
+    # Stats
+    # ──────────────────────────────────────────────────────────
+
+    def stats(self) -> dict[str, Any]:
+        """Hedging counters and the current latency threshold per call kind."""
+        with self._lock:
+            thresholds = {key: self._threshold(key) for key in self._latencies}
+            return {
+                "calls": self._calls,
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+                "hedge_rate": round(self._hedged / self._calls, 3) if self._calls else 0.0,
+                "hedge_win_rate": (
+                    round(self._hedge_wins / self._hedged, 3) if self._hedged else 0.0
+                ),
+                "thresholds_s": {
+                    key: round(threshold, 3) if threshold is not None else None
+                    for key, threshold in thresholds.items()
+                },
+            }
+
+    def _begin_call(self, key: str) -> float | None:
+        """Count a call; return the hedge threshold (``None`` = no hedging)."""
+        with self._lock:
+            self._calls += 1
+            return self._threshold(key)
+
+    def _threshold(self, key: str) -> float | None:
+        """Nearest-rank percentile of recent *key* latencies (caller holds the lock)."""
+        latencies = self._latencies.get(key, ())
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(latencies)
+        rank = math.ceil(HEDGE_LATENCY_PERCENTILE / 100 * len(ordered)) - 1
+        return ordered[min(max(rank, 0), len(ordered) - 1)]
+
+    def _reserve_hedge(self, threshold: float) -> bool:
+        """Claim a hedge if the traffic budget allows it."""
+        with self._lock:
+            if self._hedged + 1 > HEDGE_MAX_RATIO * self._calls:
+                return False
+            self._hedged += 1
+        logger.info("Call exceeded %.2fs — sending hedge request", threshold)
+        return True
+
+    def _finish_call(self, key: str, start: float, hedge_won: bool = False) -> None:
+        """Record the caller-observed latency of a successful call."""
+        with self._lock:
+            latencies = self._latencies.get(key)
+            if latencies is None:
+                latencies = self._latencies[key] = deque(maxlen=HEDGE_LATENCY_WINDOW)
+            latencies.append(time.monotonic() - start)
+            if hedge_won:
+                self._hedge_wins += 1
+        if hedge_won:
+            logger.info("Hedge request won")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return this client's executor for sync hedged calls."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=HEDGE_WORKERS,
+                    thread_name_prefix="hedge",
+                )
+            return self._executor
+
+
+def _tag(result: GenerateResult, client: LLMClient) -> GenerateResult:
+    """Record which model served *result*."""
+    if not result.model:
+        result.model = client.model_name
+    return result
+
+
+def _latency_key(schema: type[BaseModel] | None) -> str:
+    """Latency window of a call: pipeline phase and response schema."""
+    return f"{current_phase()}:{schema.__name__ if schema is not None else ''}"
+
+
+def _trace_hedge(threshold: float) -> None:
+    tracing.current_span().add_event("llm.hedge", {"llm.hedge_threshold_s": round(threshold, 3)})
@@ -0,0 +1,215 @@
+"""Bounded conversation history for manual tool-calling loops.
+
+``OpenAICompatClient._tool_loop`` resends the whole conversation on every
+iteration, so verbatim tool results make total token spend grow roughly
+quadratically with the number of iterations.  ``ToolHistory`` keeps the
+most recent tool results verbatim and, once the conversation crosses a
+token threshold, replaces older ones with compact summaries that keep the
+identifiers the model reasons with (ATT&CK IDs, names, list sizes) and
+reference the elided call.
+
+Only the messages *sent to the model* are compacted — the tool-call log
+returned in ``GenerateResult.tool_calls`` always holds the full results,
+so downstream research extraction is unaffected.
+
+Usage:
+    from src.llm.history import ToolHistory
+
+    history = ToolHistory(messages)
+    history.append(assistant_message)
+    history.append_tool_result(call_id, name, arguments, content)
+    client.chat.completions.create(messages=history.messages(), ...)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any
+
+from src.config import (
+    TOOL_CHARS_PER_TOKEN,
+    TOOL_HISTORY_KEEP_RECENT,
+    TOOL_HISTORY_MAX_TOKENS,
+)
+
+logger = logging.getLogger(__name__)
+
+_SUMMARY_MAX_IDS = 20      # technique IDs listed in a technique-list summary
+_SUMMARY_MAX_NAMES = 5     # names listed per intel section
+_SUMMARY_FALLBACK_LEN = 200
+
+
+class ToolHistory:
+    """Message list whose older tool results are compacted past a threshold.
+
+    Args:
+        messages: Initial conversation (copied).
+        max_tokens: Estimated-token threshold above which older tool results
+            are summarised; ``0`` disables compaction.
+        keep_recent: Number of most recent tool results kept verbatim.
+    """
+
+    def __init__(
+        self,
+        messages: list[dict[str, Any]],
+        *,
+        max_tokens: int = TOOL_HISTORY_MAX_TOKENS,
+        keep_recent: int = TOOL_HISTORY_KEEP_RECENT,
+    ) -> None:
+        self._messages: list[dict[str, Any]] = [dict(m) for m in messages]
+        self._max_tokens = max_tokens
+        self._keep_recent = keep_recent
+        # Index into ``_messages`` → summary replacing the tool content
+        self._tool_indices: list[int] = []
+        self._summaries: dict[int, str] = {}
+        self._compacted = 0
+
+    @property
+    def compacted(self) -> int:
+        """Number of tool results currently replaced by summaries."""
+        return self._compacted
+
+    def append(self, message: dict[str, Any]) -> None:
+        """Append a non-tool message (e.g. the assistant's tool-call turn)."""
+        self._messages.append(message)
+
+    def append_tool_result(
+        self,
+        tool_call_id: str,
+        name: str,
+        arguments: dict[str, Any],
+        content: str,
+    ) -> None:
+        """Append a tool result and prepare its compact summary."""
+        index = len(self._messages)
+        self._messages.append({
+            "role": "tool",
+            "tool_call_id": tool_call_id,
+            "content": content,
+        })
+        self._tool_indices.append(index)
+        self._summaries[index] = summarize_tool_result(
+            name, arguments, content, call_number=len(self._tool_indices)
+        )
+
+    def messages(self) -> list[dict[str, Any]]:
+        """Return the messages to send, compacting older tool results if needed.
+
+        Tool results are compacted oldest-first until the estimate falls
+        under the threshold or only ``keep_recent`` verbatim results remain.
+        """
+        sent = list(self._messages)
+        if not self._max_tokens:
+            return sent
+
+        tokens = _estimate_tokens(sent)
+        compactable = self._tool_indices[: max(len(self._tool_indices) - self._keep_recent, 0)]
+        compacted = 0
+        for index in compactable:
+            if tokens <= self._max_tokens:
+                break
+            original = sent[index]["content"]
+            summary = self._summaries[index]
+            if len(summary) >= len(original):
+                continue
+            sent[index] = {**sent[index], "content": summary}
+            tokens -= (len(original) - len(summary)) // TOOL_CHARS_PER_TOKEN
+            compacted += 1
+
+        if compacted != self._compacted:
+            logger.info(
+                "Tool history: %d of %d tool results summarised (~%d tokens)",
+                compacted,
+                len(self._tool_indices),
+                tokens,
+            )
+        self._compacted = compacted
+        return sent
+
+
+# ──────────────────────────────────────────────────────────────
+# Summaries
+# ──────────────────────────────────────────────────────────────
+
+
+def summarize_tool_result(
+    name: str,
+    arguments: dict[str, Any],
+    content: str,
+    *,
+    call_number: int = 0,
+) -> str:
+    """Build a compact stand-in for an earlier tool result.
+
+    Keeps what the model needs to stay consistent with what it already
+    saw — technique IDs and names, group/tool names, list sizes — and marks
+    the result as elided so the model can re-call the tool if it needs the
+    detail again.
+    """
+    try:
+        data = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        data = None
+
+    args = ", ".join(f"{k}={v!r}" for k, v in arguments.items())
+    header = f"[summary of earlier tool call #{call_number}: {name}({args}); full result elided]"
+
+    if isinstance(data, dict) and "error" in data:
+        return f"{header} error: {data['error']}"
+    if isinstance(data, dict) and isinstance(data.get("techniques"), list):
+        return f"{header} {_summarize_techniques(data)}"
+    if isinstance(data, dict) and data.get("attack_id"):
+        return f"{header} {_summarize_intel(data)}"
+
+    text = " ".join(str(content).split())
+    if len(text) > _SUMMARY_FALLBACK_LEN:
+        text = text[:_SUMMARY_FALLBACK_LEN] + "…"
+    return f"{header} {text}"
+
+
+def _summarize_techniques(data: dict[str, Any]) -> str:
+    """Summarise a technique-list result as ``ID name`` pairs."""
+    techniques = data["techniques"]
+    total = data.get("techniques_total", len(techniques))
+    listed = "; ".join(
+        f"{t.get('attack_id')} {t.get('name')}" for t in techniques[:_SUMMARY_MAX_IDS]
+    )
+    more = total - min(len(techniques), _SUMMARY_MAX_IDS)
+    suffix = f"; +{more} more" if more > 0 else ""
+    return f"{total} techniques: {listed}{suffix}"
+
+
+def _summarize_intel(data: dict[str, Any]) -> str:
+    """Summarise a ``get_technique_intel`` result as names and counts."""
+    parts = [f"{data['attack_id']} {data.get('name', '')}".strip()]
+    sections = (
+        ("groups", "group_name"),
+        ("tools", "name"),
+        ("mitigations", "mitigation_name"),
+        ("campaigns", "campaign_name"),
+    )
+    for key, name_key in sections:
+        items = data.get(key) or []
+        if not items:
+            continue
+        total = data.get(f"{key}_total", len(items))
+        names = ", ".join(
+            str(item.get(name_key)) for item in items[:_SUMMARY_MAX_NAMES]
+        )
+        parts.append(f"{key} ({total}): {names}")
+    sources = (data.get("detection") or {}).get("data_sources") or []
+    if sources:
+        parts.append(f"data sources: {', '.join(sources[:_SUMMARY_MAX_NAMES])}")
+    return " | ".join(parts)
+
+
+def _estimate_tokens(messages: list[dict[str, Any]]) -> int:
+    """Rough token estimate of a message list."""
+    chars = 0
+    for message in messages:
+        content = message.get("content")
+        chars += len(content) if isinstance(content, str) else 0
+        if message.get("tool_calls"):
+            chars += len(json.dumps(message["tool_calls"], default=str))
+    return chars // TOOL_CHARS_PER_TOKEN
@@ -0,0 +1,548 @@
+"""Synthetic local LLM provider for load testing (``LLM_PROVIDER=local``).
+
+``LocalLLMClient`` answers like a real provider without calling one, so
+the graph, safety and API layers can be driven far beyond any provider
+quota:
+
+- **Latency** per model turn is log-normal around ``local_latency_ms``;
+  **tokens** per turn are normal around ``local_tokens_mean``.
+- **Tool calling** is exercised for real: a Phase A style session calls
+  the discovery tools for the prompt's tactics, then
+  ``get_technique_intel`` for the picked techniques, on the shared tool
+  executor — so the graph is hit exactly like a model-driven run.
+- **Structured output** is schema-valid JSON built from the prompt's
+  research context: ``Ability`` / ``AbilityDraft`` (and their batch
+  envelopes) for the assigned techniques, with threat intel taken from
+  the intel in the prompt.
+- **Faults** are injected per turn: HTTP 429 (retried with backoff like a
+  real provider), timeouts (the call hangs for ``local_timeout_seconds``
+  first) and truncated JSON (triggers the validation retry path).
+
+Usage:
+    from src.llm.local_client import LocalLLMClient
+
+    llm = LocalLLMClient(latency_ms=200, fault_rate_limit=0.05, seed=7)
+    result = llm.generate(messages, schema=Ability)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from src.config import (
+    CATEGORY_TO_TACTICS,
+    MAX_VALIDATION_RETRIES,
+    PLATFORM_TO_ATTACK_PLATFORMS,
+)
+from src.llm.base import GenerateResult, LLMClient
+from src.llm.rate_limit import RateLimiter, estimate_tokens
+from src.llm.repair import validate_with_repair
+from src.llm.tool_executor import run_tool_calls
+from src.models.ability import (
+    Ability,
+    AbilityBatch,
+    AbilityDraft,
+    AbilityDraftBatch,
+)
+
+logger = logging.getLogger(__name__)
+
+# ── Prompt parsing (the engine's Phase A / Phase B prompts) ──
+_PHASE_A_REQUEST = re.compile(r"Generate (\d+) (\w+) abilities targeting (\w+)")
+_TACTICS = re.compile(r"Primary tactic\(s\): ([\w\-, ]+)")
+_TASK = re.compile(r"for the \*\*(\w+)\*\* category targeting \*\*(\w+)\*\*")
+_ASSIGNED = re.compile(r"(?:simulate technique \*\*|→ )(T\d{4}(?:\.\d{3})?)")
+_RESEARCH_BLOCK = re.compile(
+    r"^### (T\d{4}(?:\.\d{3})?)(?: — (.+))?\n\n(\{.*\})$", re.MULTILINE
+)
+_BATCH_SIZE = re.compile(r"contains exactly (\d+)")
+
+# Harmless, reversible synthetic commands per platform
+_EXECUTORS: dict[str, dict[str, str]] = {
+    "windows": {
+        "name": "powershell",
+        "privilege_required": "user",
+        "command": "Get-Process | Out-File -FilePath $env:TEMP\\synthetic_probe.txt",
+        "cleanup_procedure": "Remove-Item -Path $env:TEMP\\synthetic_probe.txt -Force",
+    },
+    "linux": {
+        "name": "bash",
+        "privilege_required": "user",
+        "command": "ps aux > /tmp/synthetic_probe.txt",
+        "cleanup_procedure": "rm -f /tmp/synthetic_probe.txt",
+    },
+    "macos": {
+        "name": "zsh",
+        "privilege_required": "user",
+        "command": "ps aux > /tmp/synthetic_probe.txt",
+        "cleanup_procedure": "rm -f /tmp/synthetic_probe.txt",
+    },
+    "cloud_aws": {
+        "name": "aws_cli",
+        "privilege_required": "user",
+        "command": "aws sts get-caller-identity --output json > /tmp/synthetic_probe.json",
+        "cleanup_procedure": "rm -f /tmp/synthetic_probe.json",
+    },
+    "cloud_azure": {
+        "name": "az_cli",
+        "privilege_required": "user",
+        "command": "az account show --output json > /tmp/synthetic_probe.json",
+        "cleanup_procedure": "rm -f /tmp/synthetic_probe.json",
+    },
+    "cloud_gcp": {
+        "name": "gcloud_cli",
+        "privilege_required": "user",
+        "command": "gcloud config list --format=json > /tmp/synthetic_probe.json",
+        "cleanup_procedure": "rm -f /tmp/synthetic_probe.json",
+    },
+}
+
+
+class SyntheticProviderError(Exception):
+    """Injected provider fault (message mimics the real HTTP error)."""
+
+
+@dataclass
+class _Turn:
+    """One synthetic model turn: how long it takes and how it fails."""
+
+    delay: float
+    tokens: int
+    error: Exception | None = None
+
+
+class LocalLLMClient(LLMClient):
+    """Synthetic ``LLMClient`` with latency / token distributions and faults.
+
+    Args:
+        latency_ms: Median latency of one model turn.
+        latency_sigma: Log-normal spread of the latency (0 = constant).
+        tokens_mean: Mean tokens per model turn (a fifth of them output).
+        tokens_std: Standard deviation of tokens per turn.
+        fault_rate_limit: Share of turns failing with HTTP 429.
+        fault_timeout: Share of turns that hang, then time out.
+        fault_invalid_json: Share of structured turns returning broken JSON.
+        timeout_seconds: How long a timed-out turn hangs.
+        seed: RNG seed for reproducible runs (``None`` = random).
+        rate_limiter: Optional shared ``RateLimiter``.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 800.0,
+        latency_sigma: float = 0.5,
+        tokens_mean: int = 1500,
+        tokens_std: int = 300,
+        fault_rate_limit: float = 0.0,
+        fault_timeout: float = 0.0,
+        fault_invalid_json: float = 0.0,
+        timeout_seconds: float = 30.0,
+        seed: int | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        self._latency_ms = latency_ms
+        self._latency_sigma = latency_sigma
+        self._tokens_mean = tokens_mean
+        self._tokens_std = tokens_std
+        self._fault_rate_limit = fault_rate_limit
+        self._fault_timeout = fault_timeout
+        self._fault_invalid_json = fault_invalid_json
+        self._timeout_seconds = timeout_seconds
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.rate_limiter = rate_limiter
+        logger.info(
+            "LocalLLMClient initialized: latency=%.0fms (sigma %.2f), tokens=%d±%d, "
+            "faults: 429=%.2f timeout=%.2f invalid_json=%.2f",
+            latency_ms,
+            latency_sigma,
+            tokens_mean,
+            tokens_std,
+            fault_rate_limit,
+            fault_timeout,
+            fault_invalid_json,
+        )
+
+    @property
+    def model_name(self) -> str:
+        return "local-synthetic"
+
+    # ──────────────────────────────────────────────────────────
+    # generate / agenerate
+    # ──────────────────────────────────────────────────────────
+
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Synthetic generation: tool session, then text or structured output."""
+        prompt = _prompt(messages)
+        estimated = estimate_tokens(messages)
+        total_tokens = 0
+        tool_call_log: list[dict[str, Any]] = []
+
+        if tools:
+            dispatch = _dispatch(tools)
+            for calls in _tool_turns(prompt, max_iterations, dispatch, tool_call_log):
+                total_tokens += self._retry_with_backoff(
+                    self._run_turn, estimated_tokens=estimated
+                ).usage.total_tokens
+                results = run_tool_calls(calls, dispatch)
+                _log_calls(tool_call_log, calls, results)
+
+        for attempt in range(1, MAX_VALIDATION_RETRIES + 1):
+            response = self._retry_with_backoff(
+                self._run_turn, schema is not None, estimated_tokens=estimated
+            )
+            total_tokens += response.usage.total_tokens
+            result = self._result(prompt, schema, tool_call_log, total_tokens, response, attempt)
+            if result is not None:
+                return result
+        raise _exhausted(schema)
+
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Async ``generate`` (latency via ``asyncio.sleep``; tools in threads)."""
+        prompt = _prompt(messages)
+        estimated = estimate_tokens(messages)
+        total_tokens = 0
+        tool_call_log: list[dict[str, Any]] = []
+
+        if tools:
+            dispatch = _dispatch(tools)
+            for calls in _tool_turns(prompt, max_iterations, dispatch, tool_call_log):
+                response = await self._aretry_with_backoff(
+                    self._arun_turn, estimated_tokens=estimated
+                )
+                total_tokens += response.usage.total_tokens
+                results = await asyncio.to_thread(run_tool_calls, calls, dispatch)
+                _log_calls(tool_call_log, calls, results)
+
+        for attempt in range(1, MAX_VALIDATION_RETRIES + 1):
+            response = await self._aretry_with_backoff(
+                self._arun_turn, schema is not None, estimated_tokens=estimated
+            )
+            total_tokens += response.usage.total_tokens
+            result = self._result(prompt, schema, tool_call_log, total_tokens, response, attempt)
+            if result is not None:
+                return result
+        raise _exhausted(schema)
+
+    # ──────────────────────────────────────────────────────────
+    # Synthetic turns
+    # ──────────────────────────────────────────────────────────
+
+    def _run_turn(self, structured: bool = False) -> SimpleNamespace:
+        turn = self._sample_turn()
+        time.sleep(turn.delay)
+        return self._finish_turn(turn, structured)
+
+    async def _arun_turn(self, structured: bool = False) -> SimpleNamespace:
+        turn = self._sample_turn()
+        await asyncio.sleep(turn.delay)
+        return self._finish_turn(turn, structured)
+
+    def _sample_turn(self) -> _Turn:
+        """Draw latency, tokens and an optional fault for one turn."""
+        with self._random_lock:
+            rng = self._random
+            tokens = max(1, int(rng.gauss(self._tokens_mean, self._tokens_std)))
+            delay = self._latency_ms / 1000 * rng.lognormvariate(0.0, self._latency_sigma)
+            roll = rng.random()
+
+        if roll < self._fault_rate_limit:
+            return _Turn(
+                delay=0.0,
+                tokens=0,
+                error=SyntheticProviderError(
+                    "429 RESOURCE_EXHAUSTED: synthetic rate limit (retry-after 1)"
+                ),
+            )
+        if roll < self._fault_rate_limit + self._fault_timeout:
+            return _Turn(
+                delay=self._timeout_seconds,
+                tokens=0,
+                error=TimeoutError(
+                    f"synthetic timeout after {self._timeout_seconds:g}s"
+                ),
+            )
+        return _Turn(delay=delay, tokens=tokens)
+
+    def _finish_turn(self, turn: _Turn, structured: bool) -> SimpleNamespace:
+        if turn.error is not None:
+            raise turn.error
+        with self._random_lock:
+            broken = structured and self._random.random() < self._fault_invalid_json
+        output_tokens = turn.tokens // 5
+        return SimpleNamespace(
+            usage=SimpleNamespace(
+                prompt_tokens=turn.tokens - output_tokens,
+                completion_tokens=output_tokens,
+                total_tokens=turn.tokens,
+            ),
+            broken_json=broken,
+        )
+
+    # ──────────────────────────────────────────────────────────
+    # Output
+    # ──────────────────────────────────────────────────────────
+
+    def _result(
+        self,
+        prompt: str,
+        schema: type[BaseModel] | None,
+        tool_call_log: list[dict[str, Any]],
+        total_tokens: int,
+        response: SimpleNamespace,
+        attempt: int,
+    ) -> GenerateResult | None:
+        """Final answer of a turn; ``None`` when its JSON failed validation."""
+        if schema is None:
+            return GenerateResult(
+                text=_summary(tool_call_log) if tool_call_log else "Synthetic response.",
+                tool_calls=tool_call_log,
+                total_tokens=total_tokens,
+            )
+
+        text = json.dumps(_synthesize(schema, prompt), ensure_ascii=False)
+        if response.broken_json:
+            text = text[: len(text) // 2]
+        try:
+            parsed, repairs = validate_with_repair(text, schema)
+        except ValidationError as exc:
+            logger.warning(
+                "Validation failed (attempt %d/%d): %s errors",
+                attempt,
+                MAX_VALIDATION_RETRIES,
+                exc.error_count(),
+            )
+            return None
+        return GenerateResult(
+            text=text,
+            parsed=parsed,
+            tool_calls=tool_call_log,
+            total_tokens=total_tokens,
+            repairs=repairs,
+        )
+
+
+# ──────────────────────────────────────────────────────────────
+# Tool session
+# ──────────────────────────────────────────────────────────────
+
+def _tool_turns(
+    prompt: str,
+    max_iterations: int,
+    dispatch: dict[str, Any],
+    tool_call_log: list[dict[str, Any]],
+):
+    """Yield the tool calls of each turn of a Phase A style session.
+
+    Turn 1 discovers techniques for the prompt's tactics; turn 2 fetches
+    intel for as many distinct techniques as abilities were requested.
+    """
+    request = _PHASE_A_REQUEST.search(prompt)
+    count = int(request.group(1)) if request else 3
+    category = request.group(2) if request else ""
+    platform = request.group(3) if request else "windows"
+    tactics_match = _TACTICS.search(prompt)
+    tactics = (
+        [t.strip() for t in tactics_match.group(1).split(",") if t.strip()]
+        if tactics_match
+        else CATEGORY_TO_TACTICS.get(category, [])
+    )
+
+    if max_iterations < 1:
+        return
+    attack_platform = PLATFORM_TO_ATTACK_PLATFORMS.get(platform, ["Windows"])[0]
+    if "get_techniques_for_platform" in dispatch:
+        discovery = [
+            ("get_techniques_for_platform", {"tactic": t, "platform": attack_platform})
+            for t in tactics
+        ]
+    elif "get_techniques_by_tactic" in dispatch:
+        discovery = [("get_techniques_by_tactic", {"tactic": t}) for t in tactics]
+    else:
+        discovery = []
+    if discovery:
+        yield discovery
+
+    if max_iterations < 2 or "get_technique_intel" not in dispatch:
+        return
+    picked: list[str] = []
+    for call in tool_call_log:
+        result = call.get("result")
+        techniques = result.get("techniques", []) if isinstance(result, dict) else []
+        for technique in techniques:
+            attack_id = technique.get("attack_id")
+            if attack_id and attack_id not in picked:
+                picked.append(attack_id)
+    if picked:
+        yield [
+            ("get_technique_intel", {"technique_id": technique_id})
+            for technique_id in picked[:count]
+        ]
+
+
+def _log_calls(
+    tool_call_log: list[dict[str, Any]],
+    calls: list[tuple[str, dict[str, Any]]],
+    results: list[Any],
+) -> None:
+    for (name, arguments), result in zip(calls, results):
+        tool_call_log.append({"name": name, "arguments": arguments, "result": result})
+
+
+def _summary(tool_call_log: list[dict[str, Any]]) -> str:
+    """Phase A style findings text naming the selected techniques."""
+    lines = ["Selected techniques:"]
+    for call in tool_call_log:
+        intel = call.get("result")
+        if call["name"] != "get_technique_intel" or not isinstance(intel, dict):
+            continue
+        groups = ", ".join(g.get("group_name", "") for g in intel.get("groups", [])[:3])
+        lines.append(
+            f"- {intel.get('attack_id', call['arguments'].get('technique_id'))} "
+            f"{intel.get('name', '')}: used by {groups or 'no known groups'}."
+        )
+    return "\n".join(lines)
+
+
+# ──────────────────────────────────────────────────────────────
+# Structured output synthesis
+# ──────────────────────────────────────────────────────────────
+
+def _synthesize(schema: type[BaseModel], prompt: str) -> dict[str, Any]:
+    """Schema-valid JSON for *schema*, built from the prompt's research."""
+    task = _TASK.search(prompt)
+    category = task.group(1) if task else "discovery"
+    platform = task.group(2) if task else "windows"
+    research = {
+        match.group(1): (match.group(2) or "", _json(match.group(3)))
+        for match in _RESEARCH_BLOCK.finditer(prompt)
+    }
+    assigned = _ASSIGNED.findall(prompt) or list(research) or ["T1057"]
+
+    slim = schema in (AbilityDraft, AbilityDraftBatch)
+    if schema in (AbilityBatch, AbilityDraftBatch):
+        size = _BATCH_SIZE.search(prompt)
+        count = int(size.group(1)) if size else len(assigned)
+        return {
+            "abilities": [
+                _ability(assigned[i % len(assigned)], research, category, platform, slim)
+                for i in range(count)
+            ]
+        }
+    if schema in (Ability, AbilityDraft):
+        return _ability(assigned[0], research, category, platform, slim)
+
+    examples = (schema.model_config.get("json_schema_extra") or {}).get("examples")
+    if examples:
+        return examples[0]
+    raise ValueError(f"LocalLLMClient cannot synthesise {schema.__name__}")
+
+
+def _ability(
+    technique_id: str,
+    research: dict[str, tuple[str, dict[str, Any]]],
+    category: str,
+    platform: str,
+    slim: bool,
+) -> dict[str, Any]:
+    name, intel = research.get(technique_id, ("", {}))
+    executor = {
+        **_EXECUTORS.get(platform, _EXECUTORS["linux"]),
+        "platform": platform,
+        "payload_description": (
+            f"Synthetic load-test executor for {technique_id}. Produces a "
+            f"process listing artifact and no other side effects."
+        ),
+    }
+    draft: dict[str, Any] = {
+        "name": f"{name or technique_id} — synthetic {platform} simulation",
+        "description": (
+            f"Synthetic ability for {technique_id} ({name or 'unknown technique'}) "
+            f"generated by the local load-testing provider."
+        ),
+        "executors": [executor],
+    }
+    if slim:
+        return draft
+
+    tactics = intel.get("tactics") or CATEGORY_TO_TACTICS.get(category, []) or [""]
+    return {
+        **draft,
+        "attack_category": category,
+        "mitre_mapping": {
+            "tactic": tactics[0],
+            "technique": technique_id.split(".")[0],
+            "sub_technique": technique_id if "." in technique_id else None,
+        },
+        "threat_intel_context": {
+            "associated_groups": list(intel.get("groups", [])),
+            "associated_tools": [t.split(" (")[0] for t in intel.get("tools", [])],
+            "recent_campaigns": [
+                {
+                    "campaign_name": c.get("name") or "",
+                    "first_seen": c.get("first_seen"),
+                    "last_seen": c.get("last_seen"),
+                    "attributed_groups": c.get("groups") or [],
+                }
+                for c in intel.get("campaigns", [])
+                if isinstance(c, dict)
+            ],
+            "detection_guidance": intel.get("detection"),
+        },
+    }
+
+
+# ──────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────
+
+def _prompt(messages: list[dict[str, str]]) -> str:
+    return "\n\n".join(str(m.get("content", "")) for m in messages)
+
+
+def _dispatch(tools: list[Any]) -> dict[str, Any]:
+    return {getattr(tool, "__name__", str(tool)): tool for tool in tools}
+
+
+def _json(text: str) -> dict[str, Any]:
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+def _exhausted(schema: type[BaseModel] | None) -> Exception:
+    """Error raised when every structured attempt returned broken JSON."""
+    return ValueError(
+        f"Synthetic structured output for {schema.__name__ if schema else '?'} "
+        f"invalid after {MAX_VALIDATION_RETRIES} attempts"
+    )
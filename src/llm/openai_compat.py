@@ -4,7 +4,7 @@ Uses the ``openai`` SDK to communicate with any OpenAI-compatible API
 endpoint.  Implements a **manual** tool-calling loop (the OpenAI SDK
 does not have an automatic mode) and JSON-mode structured output with
 Pydantic post-validation — all via a single unified ``generate()``
-method.
+method, mirrored by a native ``agenerate()`` on ``AsyncOpenAI``.
 
 Usage:
     from src.llm.openai_compat import OpenAICompatClient
@@ -18,6 +18,7 @@ Usage:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from typing import Any
@@ -26,6 +27,10 @@ from pydantic import BaseModel, ValidationError
 
 from src.config import MAX_VALIDATION_RETRIES
 from src.llm.base import GenerateResult, LLMClient
+from src.llm.history import ToolHistory
+from src.llm.rate_limit import RateLimiter, estimate_tokens
+from src.llm.repair import validate_with_repair
+from src.llm.tool_executor import run_tool_calls
 
 logger = logging.getLogger(__name__)
 
@@ -40,16 +45,24 @@ class OpenAICompatClient(LLMClient):
     * ``schema`` provided → JSON mode + Pydantic post-validation
     """
 
-    def __init__(self, api_key: str, base_url: str, model: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str,
+        model: str,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
         try:
-            from openai import OpenAI
+            from openai import AsyncOpenAI, OpenAI
         except ImportError as exc:
             raise ImportError(
                 "openai package is required for Groq/Ollama support. "
                 "Install it with: pip install openai"
             ) from exc
         self._client = OpenAI(api_key=api_key, base_url=base_url)
+        self._aclient = AsyncOpenAI(api_key=api_key, base_url=base_url)
         self._model = model
+        self.rate_limiter = rate_limiter
         logger.info(
             "OpenAICompatClient initialized: model=%s, base_url=%s",
             model,
@@ -95,7 +108,7 @@ class OpenAICompatClient(LLMClient):
             result = self._tool_loop(messages, tools, max_iterations, **kwargs)
             # If schema is also requested, parse the final text
             if schema and result.text:
-                result.parsed = self._validate_structured(
+                result.parsed, result.repairs = self._validate_structured(
                     result.text, schema,
                 )
             return result
@@ -125,13 +138,10 @@ class OpenAICompatClient(LLMClient):
                 **kwargs,
             )
 
-        response = self._retry_with_backoff(_call)
-        tokens = response.usage.total_tokens if response.usage else 0
-        return GenerateResult(
-            text=response.choices[0].message.content or "",
-            raw_response=response,
-            total_tokens=tokens,
+        response = self._retry_with_backoff(
+            _call, estimated_tokens=estimate_tokens(messages)
         )
+        return _plain_result(response)
 
     # ──────────────────────────────────────────────────────────
     # Manual tool-calling loop
@@ -147,28 +157,36 @@ class OpenAICompatClient(LLMClient):
         """Manual tool dispatch loop for OpenAI-compatible APIs.
 
         1. Sends messages + tool definitions to the model
-        2. If the model returns tool_calls, dispatches each one
+        2. If the model returns tool_calls, dispatches them concurrently
         3. Appends tool results and loops back
         4. Breaks when no tool_calls or *max_iterations* reached
+
+        The conversation is held in a ``ToolHistory``: once it grows past
+        ``TOOL_HISTORY_MAX_TOKENS`` older tool results are resent as compact
+        summaries.  The returned tool-call log keeps every full result.
         """
         dispatch_map = {func.__name__: func for func in tools}
         tool_schemas = _build_openai_tool_schemas(tools)
 
-        working_messages: list[dict[str, Any]] = [dict(m) for m in messages]
+        history = ToolHistory(messages)
         tool_call_log: list[dict[str, Any]] = []
         total_tokens = 0
 
         for iteration in range(1, max_iterations + 1):
+            sent = history.messages()
+
             def _call() -> Any:
                 return self._client.chat.completions.create(
                     model=self._model,
-                    messages=working_messages,  # type: ignore[arg-type]
+                    messages=sent,  # type: ignore[arg-type]
                     tools=tool_schemas or None,  # type: ignore[arg-type]
                     tool_choice="auto" if tool_schemas else None,
                     **kwargs,
                 )
 
-            response = self._retry_with_backoff(_call)
+            response = self._retry_with_backoff(
+                _call, estimated_tokens=estimate_tokens(sent)
+            )
 
             if response.usage:
                 total_tokens += response.usage.total_tokens or 0
@@ -178,10 +196,12 @@ class OpenAICompatClient(LLMClient):
             # No tool calls → done
             if not message.tool_calls:
                 logger.info(
-                    "Tool loop finished: %d iterations, %d calls, %d tokens",
+                    "Tool loop finished: %d iterations, %d calls, %d tokens "
+                    "(%d results summarised)",
                     iteration,
                     len(tool_call_log),
                     total_tokens,
+                    history.compacted,
                 )
                 return GenerateResult(
                     text=message.content or "",
@@ -191,53 +211,16 @@ class OpenAICompatClient(LLMClient):
                 )
 
             # Append assistant message with tool calls
-            working_messages.append(message.model_dump())
-
-            for tool_call in message.tool_calls:
-                func_name = tool_call.function.name
-                try:
-                    arguments = json.loads(tool_call.function.arguments)
-                except json.JSONDecodeError:
-                    arguments = {}
-
-                func = dispatch_map.get(func_name)
-                if func is None:
-                    result = json.dumps({"error": f"Unknown tool: {func_name}"})
-                    logger.warning("Unknown tool requested: %s", func_name)
-                else:
-                    try:
-                        raw_result = func(**arguments)
-                        result = json.dumps(raw_result, default=str)
-                    except Exception as exc:
-                        result = json.dumps({"error": str(exc)})
-                        logger.error(
-                            "Tool %s raised: %s", func_name, exc, exc_info=True
-                        )
-
-                tool_call_log.append({
-                    "name": func_name,
-                    "arguments": arguments,
-                    "result": result,
-                })
-
-                working_messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": result,
-                })
-
-        # Max iterations exhausted
-        logger.warning(
-            "Tool loop hit max_iterations=%d with %d calls",
-            max_iterations,
-            len(tool_call_log),
-        )
-        return GenerateResult(
-            text="",
-            tool_calls=tool_call_log,
-            raw_response=None,
-            total_tokens=total_tokens,
-        )
+            history.append(message.model_dump())
+
+            # Calls from one turn run concurrently; results keep call order
+            parsed_calls = _parse_tool_calls(message)
+            raw_results = run_tool_calls(parsed_calls, dispatch_map)
+            _record_tool_results(
+                message, parsed_calls, raw_results, history, tool_call_log
+            )
+
+        return _exhausted_result(max_iterations, tool_call_log, total_tokens)
 
     # ──────────────────────────────────────────────────────────
     # Structured output — JSON mode + Pydantic validation
@@ -254,17 +237,11 @@ class OpenAICompatClient(LLMClient):
         Since Groq/Ollama don't support ``response_schema``, we:
         1. Inject the JSON schema into the system prompt
         2. Enable ``response_format={"type": "json_object"}``
-        3. Post-validate with ``schema.model_validate_json()``
+        3. Post-validate with ``schema.model_validate_json()``, repairing
+           mechanical errors locally first (``src.llm.repair``)
         4. Retry up to 3 times on validation failure
         """
-        schema_json = json.dumps(schema.model_json_schema(), indent=2)
-        schema_prompt = (
-            f"Return ONLY valid JSON matching this exact schema. "
-            f"Do not include any text before or after the JSON.\n\n"
-            f"Schema:\n{schema_json}"
-        )
-
-        working_messages = _inject_schema_prompt(messages, schema_prompt)
+        working_messages = _schema_messages(messages, schema)
         last_error: ValidationError | None = None
         total_tokens = 0
 
@@ -277,14 +254,16 @@ class OpenAICompatClient(LLMClient):
                     **kwargs,
                 )
 
-            response = self._retry_with_backoff(_call)
+            response = self._retry_with_backoff(
+                _call, estimated_tokens=estimate_tokens(working_messages)
+            )
             if response.usage:
                 total_tokens += response.usage.total_tokens or 0
 
             raw_text = response.choices[0].message.content or ""
 
             try:
-                parsed = schema.model_validate_json(raw_text)
+                parsed, repairs = validate_with_repair(raw_text, schema)
                 logger.info(
                     "Structured output validated (attempt %d/%d)",
                     attempt,
@@ -295,6 +274,7 @@ class OpenAICompatClient(LLMClient):
                     parsed=parsed,
                     raw_response=response,
                     total_tokens=total_tokens,
+                    repairs=repairs,
                 )
             except ValidationError as exc:
                 last_error = exc
@@ -304,15 +284,150 @@ class OpenAICompatClient(LLMClient):
                     MAX_VALIDATION_RETRIES,
                     exc.error_count(),
                 )
-                working_messages.append({"role": "assistant", "content": raw_text})
-                working_messages.append({
-                    "role": "user",
-                    "content": (
-                        f"The JSON you produced has validation errors:\n"
-                        f"{exc}\n\n"
-                        f"Fix the errors and return valid JSON matching the schema."
-                    ),
-                })
+                working_messages.extend(_validation_feedback(raw_text, exc))
+
+        raise last_error  # type: ignore[misc]
+
+    # ──────────────────────────────────────────────────────────
+    # Async generate (AsyncOpenAI)
+    # ──────────────────────────────────────────────────────────
+
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Async ``generate()`` on the SDK's ``AsyncOpenAI`` client.
+
+        Same branches and result as ``generate()``.  Tool functions are
+        blocking (Neo4j), so each turn's calls run in a worker thread.
+        """
+        if tools:
+            result = await self._atool_loop(messages, tools, max_iterations, **kwargs)
+            if schema and result.text:
+                result.parsed, result.repairs = self._validate_structured(
+                    result.text, schema
+                )
+            return result
+
+        if schema:
+            return await self._astructured_generate(messages, schema, **kwargs)
+
+        response = await self._aretry_with_backoff(
+            lambda: self._aclient.chat.completions.create(
+                model=self._model,
+                messages=messages,  # type: ignore[arg-type]
+                **kwargs,
+            ),
+            estimated_tokens=estimate_tokens(messages),
+        )
+        return _plain_result(response)
+
+    async def _atool_loop(
+        self,
+        messages: list[dict[str, str]],
+        tools: list[Any],
+        max_iterations: int,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Async ``_tool_loop``."""
+        dispatch_map = {func.__name__: func for func in tools}
+        tool_schemas = _build_openai_tool_schemas(tools)
+
+        history = ToolHistory(messages)
+        tool_call_log: list[dict[str, Any]] = []
+        total_tokens = 0
+
+        for iteration in range(1, max_iterations + 1):
+            sent = history.messages()
+            response = await self._aretry_with_backoff(
+                lambda: self._aclient.chat.completions.create(
+                    model=self._model,
+                    messages=sent,  # type: ignore[arg-type]
+                    tools=tool_schemas or None,  # type: ignore[arg-type]
+                    tool_choice="auto" if tool_schemas else None,
+                    **kwargs,
+                ),
+                estimated_tokens=estimate_tokens(sent),
+            )
+
+            if response.usage:
+                total_tokens += response.usage.total_tokens or 0
+
+            message = response.choices[0].message
+            if not message.tool_calls:
+                logger.info(
+                    "Async tool loop finished: %d iterations, %d calls, %d tokens",
+                    iteration,
+                    len(tool_call_log),
+                    total_tokens,
+                )
+                return GenerateResult(
+                    text=message.content or "",
+                    tool_calls=tool_call_log,
+                    raw_response=response,
+                    total_tokens=total_tokens,
+                )
+
+            history.append(message.model_dump())
+            parsed_calls = _parse_tool_calls(message)
+            raw_results = await asyncio.to_thread(
+                run_tool_calls, parsed_calls, dispatch_map
+            )
+            _record_tool_results(
+                message, parsed_calls, raw_results, history, tool_call_log
+            )
+
+        return _exhausted_result(max_iterations, tool_call_log, total_tokens)
+
+    async def _astructured_generate(
+        self,
+        messages: list[dict[str, str]],
+        schema: type[BaseModel],
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Async ``_structured_generate``."""
+        working_messages = _schema_messages(messages, schema)
+        last_error: ValidationError | None = None
+        total_tokens = 0
+
+        for attempt in range(1, MAX_VALIDATION_RETRIES + 1):
+            response = await self._aretry_with_backoff(
+                lambda: self._aclient.chat.completions.create(
+                    model=self._model,
+                    messages=working_messages,  # type: ignore[arg-type]
+                    response_format={"type": "json_object"},
+                    **kwargs,
+                ),
+                estimated_tokens=estimate_tokens(working_messages),
+            )
+            if response.usage:
+                total_tokens += response.usage.total_tokens or 0
+
+            raw_text = response.choices[0].message.content or ""
+            try:
+                parsed, repairs = validate_with_repair(raw_text, schema)
+            except ValidationError as exc:
+                last_error = exc
+                logger.warning(
+                    "Validation failed (attempt %d/%d): %s errors",
+                    attempt,
+                    MAX_VALIDATION_RETRIES,
+                    exc.error_count(),
+                )
+                working_messages.extend(_validation_feedback(raw_text, exc))
+                continue
+            return GenerateResult(
+                text=raw_text,
+                parsed=parsed,
+                raw_response=response,
+                total_tokens=total_tokens,
+                repairs=repairs,
+            )
 
         raise last_error  # type: ignore[misc]
 
@@ -321,19 +436,115 @@ class OpenAICompatClient(LLMClient):
     # ──────────────────────────────────────────────────────────
 
     @staticmethod
-    def _validate_structured(text: str, schema: type[BaseModel]) -> BaseModel | None:
-        """Try to parse *text* as the given Pydantic *schema*."""
+    def _validate_structured(
+        text: str, schema: type[BaseModel]
+    ) -> tuple[BaseModel | None, list[str]]:
+        """Try to parse *text* as the given Pydantic *schema* (with local repair).
+
+        Returns:
+            ``(parsed, repairs)`` — ``parsed`` is ``None`` on failure.
+        """
         try:
-            return schema.model_validate_json(text)
+            return validate_with_repair(text, schema)
         except (ValidationError, Exception) as exc:
             logger.warning("Post-tool-loop schema validation failed: %s", exc)
-            return None
+            return None, []
 
 
 # ──────────────────────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────────────────────
 
+def _plain_result(response: Any) -> GenerateResult:
+    """Wrap a plain chat completion."""
+    tokens = response.usage.total_tokens if response.usage else 0
+    return GenerateResult(
+        text=response.choices[0].message.content or "",
+        raw_response=response,
+        total_tokens=tokens,
+    )
+
+
+def _parse_tool_calls(message: Any) -> list[tuple[str, dict[str, Any]]]:
+    """Extract ``(name, arguments)`` pairs from an assistant message."""
+    parsed_calls: list[tuple[str, dict[str, Any]]] = []
+    for tool_call in message.tool_calls:
+        try:
+            arguments = json.loads(tool_call.function.arguments)
+        except json.JSONDecodeError:
+            arguments = {}
+        parsed_calls.append((tool_call.function.name, arguments))
+    return parsed_calls
+
+
+def _record_tool_results(
+    message: Any,
+    parsed_calls: list[tuple[str, dict[str, Any]]],
+    raw_results: list[Any],
+    history: ToolHistory,
+    tool_call_log: list[dict[str, Any]],
+) -> None:
+    """Append one turn's tool results to the history and the call log."""
+    for tool_call, (func_name, arguments), raw_result in zip(
+        message.tool_calls, parsed_calls, raw_results
+    ):
+        result = json.dumps(raw_result, default=str)
+        tool_call_log.append({
+            "name": func_name,
+            "arguments": arguments,
+            "result": result,
+        })
+        history.append_tool_result(tool_call.id, func_name, arguments, result)
+
+
+def _exhausted_result(
+    max_iterations: int,
+    tool_call_log: list[dict[str, Any]],
+    total_tokens: int,
+) -> GenerateResult:
+    """Result for a tool loop that hit *max_iterations*."""
+    logger.warning(
+        "Tool loop hit max_iterations=%d with %d calls",
+        max_iterations,
+        len(tool_call_log),
+    )
+    return GenerateResult(
+        text="",
+        tool_calls=tool_call_log,
+        raw_response=None,
+        total_tokens=total_tokens,
+    )
+
+
+def _schema_messages(
+    messages: list[dict[str, str]],
+    schema: type[BaseModel],
+) -> list[dict[str, str]]:
+    """Messages for JSON-mode generation with the schema in the system prompt."""
+    schema_json = json.dumps(schema.model_json_schema(), indent=2)
+    schema_prompt = (
+        f"Return ONLY valid JSON matching this exact schema. "
+        f"Do not include any text before or after the JSON.\n\n"
+        f"Schema:\n{schema_json}"
+    )
+    return _inject_schema_prompt(messages, schema_prompt)
+
+
+def _validation_feedback(raw_text: str, exc: ValidationError) -> list[dict[str, str]]:
+    """Turns asking the model to fix its invalid JSON."""
+    return [
+        {"role": "assistant", "content": raw_text},
+        {
+            "role": "user",
+            "content": (
+                f"The JSON you produced has validation errors:\n"
+                f"{exc}\n\n"
+                f"Fix the errors and return valid JSON matching the schema."
+            ),
+        },
+    ]
+
+
 def _inject_schema_prompt(
     messages: list[dict[str, str]],
     schema_prompt: str,
@@ -0,0 +1,234 @@
+"""Client-side rate limiting for LLM providers.
+
+One ``RateLimiter`` per provider is shared by every ``LLMClient`` in the
+process (``shared_rate_limiter``).  It holds two token buckets — requests
+per minute and tokens per minute — and callers *queue* for capacity
+(``acquire`` / ``aacquire``) instead of firing requests that the provider
+will reject with HTTP 429.
+
+Token usage is pre-estimated from the prompt before the call and
+corrected with the real usage afterwards (``record_usage``).  When the
+provider still answers 429, ``pause`` holds back every caller of that
+provider for the ``Retry-After`` period, so concurrent requests back off
+together instead of producing a retry storm.
+
+Usage:
+    from src.llm.rate_limit import estimate_tokens, shared_rate_limiter
+
+    limiter = shared_rate_limiter("gemini", rpm=60, tpm=250_000)
+    estimate = estimate_tokens(messages)
+    limiter.acquire(estimate)
+    response = call_provider()
+    limiter.record_usage(estimate, actual_tokens)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+import threading
+import time
+from typing import Any
+
+from src import metrics
+from src.config import TOOL_CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+_WINDOW_SECONDS = 60.0
+_RETRY_AFTER_PATTERN = re.compile(
+    r"(?:retry[-_ ]?after|retrydelay)\W*(\d+(?:\.\d+)?)", re.IGNORECASE
+)
+
+
+class RateLimiter:
+    """Requests-per-minute + tokens-per-minute token buckets.
+
+    Buckets start full and refill continuously.  A limit of ``0`` disables
+    that bucket.  Requests larger than a whole bucket are capped at its
+    capacity so they can never wait forever.
+
+    Args:
+        name: Provider name (for logging).
+        rpm: Requests per minute (0 = unlimited).
+        tpm: Tokens per minute (0 = unlimited).
+    """
+
+    def __init__(self, name: str, rpm: int = 0, tpm: int = 0) -> None:
+        self.name = name
+        self._rpm = rpm
+        self._tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._paused_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    # ── Capacity ──────────────────────────────────────────────
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request of ~*tokens* tokens fits.
+
+        Queued callers are counted in ``llm_rate_limit_queue_depth``.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        wait = self._try_take(tokens)
+        if wait <= 0:
+            return 0.0
+        waited = 0.0
+        with metrics.LLM_QUEUED.track(provider=self.name):
+            while wait > 0:
+                time.sleep(wait)
+                waited += wait
+                wait = self._try_take(tokens)
+        self._log_wait(waited)
+        return waited
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """Async ``acquire`` — waits with ``asyncio.sleep``."""
+        wait = self._try_take(tokens)
+        if wait <= 0:
+            return 0.0
+        waited = 0.0
+        with metrics.LLM_QUEUED.track(provider=self.name):
+            while wait > 0:
+                await asyncio.sleep(wait)
+                waited += wait
+                wait = self._try_take(tokens)
+        self._log_wait(waited)
+        return waited
+
+    def wait_estimate(self, tokens: int = 0) -> float:
+        """Seconds until a request of ~*tokens* would fit (without taking it)."""
+        return self._try_take(tokens, take=False)
+
+    def record_usage(self, estimated: int, actual: int) -> None:
+        """Correct the token bucket once the real usage is known."""
+        if not self._tpm or not actual:
+            return
+        with self._lock:
+            self._tokens = min(float(self._tpm), self._tokens + estimated - actual)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for *seconds* (provider ``Retry-After``)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning("Rate limiter %s paused for %.1fs", self.name, seconds)
+
+    # ── Internals ─────────────────────────────────────────────
+
+    def _try_take(self, tokens: int, take: bool = True) -> float:
+        """Take capacity if available; otherwise return the seconds to wait.
+
+        With ``take=False`` only the wait is computed (nothing is consumed).
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._updated = now
+            if self._rpm:
+                self._requests = min(
+                    float(self._rpm), self._requests + elapsed * self._rpm / _WINDOW_SECONDS
+                )
+            if self._tpm:
+                self._tokens = min(
+                    float(self._tpm), self._tokens + elapsed * self._tpm / _WINDOW_SECONDS
+                )
+
+            if now < self._paused_until:
+                return self._paused_until - now
+
+            needed_tokens = min(tokens, self._tpm)
+            wait = 0.0
+            if self._rpm and self._requests < 1:
+                wait = max(wait, (1 - self._requests) * _WINDOW_SECONDS / self._rpm)
+            if self._tpm and self._tokens < needed_tokens:
+                wait = max(
+                    wait, (needed_tokens - self._tokens) * _WINDOW_SECONDS / self._tpm
+                )
+            if wait > 0 or not take:
+                return wait
+
+            if self._rpm:
+                self._requests -= 1
+            if self._tpm:
+                self._tokens -= needed_tokens
+            return 0.0
+
+    def _log_wait(self, waited: float) -> None:
+        if waited > 0:
+            logger.info("Rate limiter %s: queued %.2fs for capacity", self.name, waited)
+
+
+# ──────────────────────────────────────────────────────────────
+# Process-wide registry
+# ──────────────────────────────────────────────────────────────
+
+_limiters: dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(provider: str, rpm: int = 0, tpm: int = 0) -> RateLimiter | None:
+    """Return the process-wide limiter for *provider* (``None`` if unlimited).
+
+    The first call for a provider fixes its limits; later calls share it.
+    """
+    if not rpm and not tpm:
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = RateLimiter(provider, rpm=rpm, tpm=tpm)
+            _limiters[provider] = limiter
+            logger.info(
+                "Rate limiter for %s: rpm=%s tpm=%s",
+                provider,
+                rpm or "unlimited",
+                tpm or "unlimited",
+            )
+        return limiter
+
+
+# ──────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────
+
+def estimate_tokens(payload: Any) -> int:
+    """Rough prompt-token estimate for messages / contents (chars / 4)."""
+    if isinstance(payload, str):
+        text = payload
+    else:
+        text = json.dumps(payload, default=_dump_default, ensure_ascii=False)
+    return len(text) // TOOL_CHARS_PER_TOKEN
+
+
+def _dump_default(value: Any) -> Any:
+    """Serialise SDK objects (pydantic models) for token estimation."""
+    dump = getattr(value, "model_dump", None)
+    if callable(dump):
+        return dump(exclude_none=True)
+    return str(value)
+
+
+def retry_after_seconds(exc: Exception) -> float | None:
+    """Extract a provider's requested retry delay from an error, if any.
+
+    Checks the HTTP ``Retry-After`` header (OpenAI SDK errors carry the
+    response) and falls back to ``Retry-After`` / ``retryDelay`` values in
+    the error text (Gemini ``RetryInfo``).
+    """
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after")
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+    match = _RETRY_AFTER_PATTERN.search(str(exc))
+    return float(match.group(1)) if match else None
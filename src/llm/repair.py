@@ -0,0 +1,271 @@
+"""Deterministic repair of structured LLM output before re-prompting.
+
+Most schema-validation failures are mechanical, and a whole extra LLM
+round trip is an expensive way to fix them.  ``validate_with_repair``
+validates as usual and, on failure, applies local repairs driven by the
+Pydantic schema, then validates again:
+
+Text repairs (before JSON parsing):
+    - strip Markdown code fences (````json ... `````)
+    - drop prose around the outermost JSON object/array
+    - remove trailing commas before ``}`` / ``]``
+
+Data repairs (walking the schema's field annotations):
+    - enum values normalised to the member value (``PowerShell`` →
+      ``powershell``, ``Credential-Access`` → ``credential_access``)
+    - ``null`` for a non-nullable field that has a default → default
+    - missing required nested model whose fields all have defaults →
+      ``{}`` (e.g. an omitted ``threat_intel_context``)
+
+Only when the repaired output still fails is the original
+``ValidationError`` raised, so callers fall back to re-prompting.
+
+Usage:
+    from src.llm.repair import validate_with_repair
+
+    parsed, repairs = validate_with_repair(raw_text, Ability)
+    # repairs == ["code fence", "enum executors[0].name: 'PowerShell' → 'powershell'"]
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import re
+import types
+import typing
+from enum import Enum
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_FENCE_PATTERN = re.compile(r"^\s*```[\w-]*\s*\n?(.*?)\n?\s*```\s*$", re.DOTALL)
+_ENUM_SEPARATORS = re.compile(r"[\s\-./]+")
+
+
+def validate_with_repair(
+    raw: str | Any,
+    schema: type[ModelT],
+) -> tuple[ModelT, list[str]]:
+    """Validate *raw* against *schema*, repairing mechanical errors locally.
+
+    Args:
+        raw: Model output — JSON text, or already-parsed data (batch items).
+        schema: Pydantic model class to validate against.
+
+    Returns:
+        ``(parsed, repairs)`` — *repairs* lists the fixes applied (empty
+        when the output was valid as-is).
+
+    Raises:
+        ValidationError: The original error, if repair did not help.
+    """
+    try:
+        if isinstance(raw, str):
+            return schema.model_validate_json(raw), []
+        return schema.model_validate(raw), []
+    except ValidationError as exc:
+        original = exc
+
+    repairs: list[str] = []
+    if isinstance(raw, str):
+        text, repairs = repair_json_text(raw)
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            raise original from None
+    else:
+        data = copy.deepcopy(raw)
+
+    repairs.extend(repair_data(data, schema))
+    if not repairs:
+        raise original
+
+    try:
+        parsed = schema.model_validate(data)
+    except ValidationError:
+        logger.info(
+            "Local repair insufficient for %s (%s)", schema.__name__, "; ".join(repairs)
+        )
+        raise original from None
+
+    logger.info(
+        "Repaired %s output locally (%d fixes): %s",
+        schema.__name__,
+        len(repairs),
+        "; ".join(repairs),
+    )
+    return parsed, repairs
+
+
+# ──────────────────────────────────────────────────────────────
+# Text repairs
+# ──────────────────────────────────────────────────────────────
+
+def repair_json_text(text: str) -> tuple[str, list[str]]:
+    """Fix code fences, surrounding prose and trailing commas.
+
+    Returns:
+        ``(text, repairs)``.
+    """
+    repairs: list[str] = []
+
+    match = _FENCE_PATTERN.match(text)
+    if match:
+        text = match.group(1)
+        repairs.append("code fence")
+
+    stripped = text.strip()
+    starts = [i for i in (stripped.find("{"), stripped.find("[")) if i >= 0]
+    if starts:
+        start = min(starts)
+        end = stripped.rfind("}" if stripped[start] == "{" else "]")
+        if end > start and (start > 0 or end < len(stripped) - 1):
+            stripped = stripped[start : end + 1]
+            repairs.append("surrounding text")
+
+    cleaned, removed = _remove_trailing_commas(stripped)
+    if removed:
+        repairs.append(f"trailing commas ({removed})")
+    return cleaned, repairs
+
+
+def _remove_trailing_commas(text: str) -> tuple[str, int]:
+    """Drop commas directly before ``}`` / ``]``, outside string literals."""
+    out: list[str] = []
+    removed = 0
+    in_string = False
+    escaped = False
+    pending_comma: int | None = None  # index in ``out`` of a candidate comma
+
+    for char in text:
+        if in_string:
+            out.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char in "}]" and pending_comma is not None:
+            del out[pending_comma]
+            removed += 1
+        if char == ",":
+            pending_comma = len(out)
+        elif not char.isspace():
+            pending_comma = None
+        if char == '"':
+            in_string = True
+        out.append(char)
+
+    return "".join(out), removed
+
+
+# ──────────────────────────────────────────────────────────────
+# Schema-driven data repairs
+# ──────────────────────────────────────────────────────────────
+
+def repair_data(data: Any, schema: type[BaseModel]) -> list[str]:
+    """Repair parsed *data* in place against *schema*; return the fixes."""
+    repairs: list[str] = []
+    _repair_model(data, schema, "", repairs)
+    return repairs
+
+
+def _repair_model(
+    data: Any, model: type[BaseModel], path: str, repairs: list[str]
+) -> None:
+    if not isinstance(data, dict):
+        return
+    for name, field in model.model_fields.items():
+        key = field.alias or name
+        where = f"{path}.{key}" if path else key
+        annotation, nullable = _unwrap(field.annotation)
+
+        if key not in data:
+            if field.is_required() and _defaults_only(annotation):
+                data[key] = {}
+                repairs.append(f"default {where}")
+            continue
+
+        if data[key] is None and not nullable and not field.is_required():
+            del data[key]
+            repairs.append(f"null {where} → default")
+            continue
+
+        _repair_value(data, key, annotation, where, repairs)
+
+
+def _repair_value(
+    container: Any, key: Any, annotation: Any, path: str, repairs: list[str]
+) -> None:
+    """Repair ``container[key]`` against *annotation*."""
+    value = container[key]
+    origin = typing.get_origin(annotation)
+
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        if isinstance(value, str):
+            member = _match_enum(annotation, value)
+            if member is not None and member.value != value:
+                container[key] = member.value
+                repairs.append(f"enum {path}: {value!r} → {member.value!r}")
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        _repair_model(value, annotation, path, repairs)
+    elif origin in (list, tuple, set) and isinstance(value, list):
+        args = typing.get_args(annotation)
+        if args:
+            item_type, _ = _unwrap(args[0])
+            for index in range(len(value)):
+                _repair_value(value, index, item_type, f"{path}[{index}]", repairs)
+    elif origin is dict and isinstance(value, dict):
+        args = typing.get_args(annotation)
+        if len(args) == 2:
+            item_type, _ = _unwrap(args[1])
+            for item_key in list(value):
+                _repair_value(value, item_key, item_type, f"{path}.{item_key}", repairs)
+
+
+def _unwrap(annotation: Any) -> tuple[Any, bool]:
+    """Strip ``Annotated`` / ``Optional``; return ``(type, nullable)``."""
+    nullable = False
+    while True:
+        origin = typing.get_origin(annotation)
+        if origin is typing.Annotated:
+            annotation = typing.get_args(annotation)[0]
+        elif origin in (typing.Union, types.UnionType):
+            args = [a for a in typing.get_args(annotation) if a is not type(None)]
+            nullable = nullable or len(args) < len(typing.get_args(annotation))
+            if len(args) != 1:
+                return annotation, nullable
+            annotation = args[0]
+        else:
+            return annotation, nullable
+
+
+def _defaults_only(annotation: Any) -> bool:
+    """Whether *annotation* is a model constructible from ``{}``."""
+    return (
+        isinstance(annotation, type)
+        and issubclass(annotation, BaseModel)
+        and not any(f.is_required() for f in annotation.model_fields.values())
+    )
+
+
+def _match_enum(enum: type[Enum], value: str) -> Enum | None:
+    """Find the member whose value or name matches *value* loosely."""
+    wanted = _enum_key(value)
+    for member in enum:
+        if _enum_key(str(member.value)) == wanted or _enum_key(member.name) == wanted:
+            return member
+    return None
+
+
+def _enum_key(value: str) -> str:
+    return _ENUM_SEPARATORS.sub("_", value.strip()).lower()
@@ -0,0 +1,280 @@
+"""Multi-provider LLM router with health-based failover.
+
+``RoutingLLMClient`` is an ``LLMClient`` that wraps several configured
+providers (e.g. Gemini, Groq, Ollama).  For every call it:
+
+1. Ranks the providers by health — circuit state, recent failures, and
+   expected wait (rate-limiter queue + latency EWMA, in whole seconds so
+   similar providers keep the configured order).
+2. Tries them in that order, failing over to the next provider when a
+   call raises.
+3. Records latency and outcome.  ``ROUTER_FAILURE_THRESHOLD`` consecutive
+   failures *open* a provider's circuit: it is skipped for
+   ``ROUTER_COOLDOWN_SECONDS``, then gets one half-open trial call.
+
+Schema validation failures (``pydantic.ValidationError``) are the model's
+output, not provider health — they are raised immediately without
+failover or penalty.
+
+Any ``LLMClient`` can be routed, so tests can use local fake providers.
+
+Usage:
+    from src.llm.router import RoutingLLMClient
+
+    llm = RoutingLLMClient({"gemini": gemini_client, "groq": groq_client})
+    result = llm.generate(messages)
+    result.model           # which provider's model served the call
+    llm.health_snapshot()  # per-provider stats
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from src.config import (
+    ROUTER_COOLDOWN_SECONDS,
+    ROUTER_ERROR_WINDOW,
+    ROUTER_FAILURE_THRESHOLD,
+    ROUTER_LATENCY_ALPHA,
+)
+from src.llm.base import GenerateResult, LLMClient
+
+logger = logging.getLogger(__name__)
+
+
+class AllProvidersFailedError(RuntimeError):
+    """Raised when every routed provider failed (or had an open circuit)."""
+
+
+@dataclass
+class ProviderHealth:
+    """Rolling health statistics for one routed provider."""
+
+    name: str
+    latency_ewma: float = 0.0  # seconds; 0 until the first success
+    consecutive_failures: int = 0
+    opened_at: float | None = None  # circuit open time (monotonic)
+    last_failure_at: float = 0.0
+    outcomes: deque[bool] = field(
+        default_factory=lambda: deque(maxlen=ROUTER_ERROR_WINDOW)
+    )
+    calls: int = 0
+    failures: int = 0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def degraded(self, now: float) -> bool:
+        """Failed recently (within the cool-down) without a success since."""
+        return (
+            self.consecutive_failures > 0
+            and now - self.last_failure_at < ROUTER_COOLDOWN_SECONDS
+        )
+
+    def state(self, now: float) -> str:
+        """``closed`` (healthy), ``open`` (skipped) or ``half_open`` (trial)."""
+        if self.opened_at is None:
+            return "closed"
+        if now - self.opened_at >= ROUTER_COOLDOWN_SECONDS:
+            return "half_open"
+        return "open"
+
+
+class RoutingLLMClient(LLMClient):
+    """Route each call to the healthiest provider, failing over on errors.
+
+    Args:
+        providers: Provider name → client, in preference order.
+    """
+
+    def __init__(self, providers: dict[str, LLMClient]) -> None:
+        if not providers:
+            raise ValueError("RoutingLLMClient needs at least one provider")
+        self._providers = dict(providers)
+        self._order = list(providers)
+        self._health = {name: ProviderHealth(name) for name in providers}
+        self._lock = threading.Lock()
+        logger.info(
+            "RoutingLLMClient initialized: %s",
+            ", ".join(f"{n}={c.model_name}" for n, c in providers.items()),
+        )
+
+    @property
+    def model_name(self) -> str:
+        """Stable identifier for the routed set (results carry the real model)."""
+        return "router:" + "+".join(
+            self._providers[name].model_name for name in self._order
+        )
+
+    # ──────────────────────────────────────────────────────────
+    # generate / agenerate
+    # ──────────────────────────────────────────────────────────
+
+    def generate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Generate on the healthiest provider, failing over on errors."""
+        errors: list[str] = []
+        for name in self._ranked():
+            client = self._providers[name]
+            start = time.monotonic()
+            try:
+                result = client.generate(
+                    messages,
+                    tools=tools,
+                    schema=schema,
+                    max_iterations=max_iterations,
+                    **kwargs,
+                )
+            except ValidationError:
+                self._record(name, time.monotonic() - start, ok=True)
+                raise
+            except Exception as exc:
+                self._record(name, time.monotonic() - start, ok=False)
+                errors.append(f"{name}: {exc}")
+                logger.warning("Provider %s failed, failing over: %s", name, exc)
+                continue
+            self._record(name, time.monotonic() - start, ok=True)
+            return _tag(result, client)
+        raise AllProvidersFailedError("; ".join(errors) or "no provider available")
+
+    async def agenerate(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        tools: list[Any] | None = None,
+        schema: type[BaseModel] | None = None,
+        max_iterations: int = 10,
+        **kwargs: Any,
+    ) -> GenerateResult:
+        """Async ``generate`` over the providers' ``agenerate``."""
+        errors: list[str] = []
+        for name in self._ranked():
+            client = self._providers[name]
+            start = time.monotonic()
+            try:
+                result = await client.agenerate(
+                    messages,
+                    tools=tools,
+                    schema=schema,
+                    max_iterations=max_iterations,
+                    **kwargs,
+                )
+            except ValidationError:
+                self._record(name, time.monotonic() - start, ok=True)
+                raise
+            except Exception as exc:
+                self._record(name, time.monotonic() - start, ok=False)
+                errors.append(f"{name}: {exc}")
+                logger.warning("Provider %s failed, failing over: %s", name, exc)
+                continue
+            self._record(name, time.monotonic() - start, ok=True)
+            return _tag(result, client)
+        raise AllProvidersFailedError("; ".join(errors) or "no provider available")
+
+    # ──────────────────────────────────────────────────────────
+    # Health tracking
+    # ──────────────────────────────────────────────────────────
+
+    def health_snapshot(self) -> dict[str, dict[str, Any]]:
+        """Per-provider health stats (for logs, benchmarks and endpoints)."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "model": self._providers[name].model_name,
+                    "state": health.state(now),
+                    "error_rate": round(health.error_rate, 3),
+                    "latency_ewma_s": round(health.latency_ewma, 3),
+                    "consecutive_failures": health.consecutive_failures,
+                    "calls": health.calls,
+                    "failures": health.failures,
+                }
+                for name, health in self._health.items()
+            }
+
+    def _ranked(self) -> list[str]:
+        """Providers to try, best first; open circuits are skipped.
+
+        Ranking key: half-open trials after closed providers, recently
+        failed providers after healthy ones, then expected wait (rate
+        limiter queue + latency EWMA, whole seconds), then configured order.
+        Degradation expires after the cool-down so a recovered provider is
+        tried again even without an open circuit.
+        """
+        now = time.monotonic()
+        ranked: list[tuple[tuple[Any, ...], str]] = []
+        with self._lock:
+            for position, name in enumerate(self._order):
+                health = self._health[name]
+                state = health.state(now)
+                if state == "open":
+                    continue
+                limiter = self._providers[name].rate_limiter
+                queue_wait = limiter.wait_estimate() if limiter is not None else 0.0
+                ranked.append((
+                    (
+                        state == "half_open",
+                        health.degraded(now),
+                        int(queue_wait + health.latency_ewma),
+                        position,
+                    ),
+                    name,
+                ))
+        if not ranked:
+            logger.error("All provider circuits are open")
+        return [name for _, name in sorted(ranked)]
+
+    def _record(self, name: str, latency: float, ok: bool) -> None:
+        """Update a provider's stats and circuit after a call."""
+        with self._lock:
+            health = self._health[name]
+            health.calls += 1
+            health.outcomes.append(ok)
+            if ok:
+                health.latency_ewma = (
+                    latency if health.latency_ewma == 0.0
+                    else ROUTER_LATENCY_ALPHA * latency
+                    + (1 - ROUTER_LATENCY_ALPHA) * health.latency_ewma
+                )
+                health.consecutive_failures = 0
+                if health.opened_at is not None:
+                    logger.info("Provider %s recovered — circuit closed", name)
+                health.opened_at = None
+                return
+
+            health.failures += 1
+            health.consecutive_failures += 1
+            health.last_failure_at = time.monotonic()
+            half_open = health.opened_at is not None
+            if half_open or health.consecutive_failures >= ROUTER_FAILURE_THRESHOLD:
+                health.opened_at = time.monotonic()
+                logger.warning(
+                    "Provider %s circuit opened for %.0fs (%d consecutive failures)",
+                    name,
+                    ROUTER_COOLDOWN_SECONDS,
+                    health.consecutive_failures,
+                )
+
+
+def _tag(result: GenerateResult, client: LLMClient) -> GenerateResult:
+    """Record which model served *result*."""
+    if not result.model:
+        result.model = client.model_name
+    return result
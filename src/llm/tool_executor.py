@@ -0,0 +1,92 @@
+"""Concurrent dispatch of the tool calls returned in one model turn.
+
+Models often request several tools at once (e.g. ``get_technique_intel``
+for four techniques).  ``run_tool_calls`` executes them concurrently on a
+process-wide bounded executor and returns results in the original call
+order, so a turn takes as long as its slowest lookup instead of the sum.
+Each call runs in a copy of the caller's context, so tool timings land in
+the caller's usage scope (``src.llm.usage``).
+
+Used by the manual tool loops of ``OpenAICompatClient`` and
+``GeminiClient`` (when ``gemini_manual_function_calling`` is enabled).
+
+Usage:
+    from src.llm.tool_executor import run_tool_calls
+
+    results = run_tool_calls([("get_technique_intel", {"technique_id": "T1003"})],
+                             dispatch_map)
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.config import TOOL_DISPATCH_WORKERS
+
+logger = logging.getLogger(__name__)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the shared tool executor, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=TOOL_DISPATCH_WORKERS,
+                thread_name_prefix="tool",
+            )
+        return _executor
+
+
+def run_tool_calls(
+    calls: list[tuple[str, dict[str, Any]]],
+    dispatch_map: dict[str, Callable[..., Any]],
+) -> list[Any]:
+    """Execute ``(name, arguments)`` tool calls concurrently.
+
+    Unknown tools and tool exceptions become ``{"error": "..."}`` results
+    rather than propagating, matching what the model is sent back.
+
+    Args:
+        calls: Tool calls from a single model turn, in model order.
+        dispatch_map: Tool name → callable.
+
+    Returns:
+        Raw tool results, one per call, in the same order as *calls*.
+    """
+    if len(calls) <= 1:
+        return [_invoke(name, arguments, dispatch_map) for name, arguments in calls]
+
+    executor = _get_executor()
+    futures = [
+        executor.submit(
+            contextvars.copy_context().run, _invoke, name, arguments, dispatch_map
+        )
+        for name, arguments in calls
+    ]
+    logger.info("Dispatching %d tool calls concurrently", len(futures))
+    return [future.result() for future in futures]
+
+
+def _invoke(
+    name: str,
+    arguments: dict[str, Any],
+    dispatch_map: dict[str, Callable[..., Any]],
+) -> Any:
+    """Run one tool call, converting failures to error results."""
+    func = dispatch_map.get(name)
+    if func is None:
+        logger.warning("Unknown tool requested: %s", name)
+        return {"error": f"Unknown tool: {name}"}
+    try:
+        return func(**arguments)
+    except Exception as exc:
+        logger.error("Tool %s raised: %s", name, exc, exc_info=True)
+        return {"error": str(exc)}
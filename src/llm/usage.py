@@ -0,0 +1,153 @@
+"""Per-call usage scopes — token breakdown, retries and tool timings.
+
+A ``UsageScope`` collects what the LLM layer observes while it is open:
+
+- input / output / cached / total tokens of every provider response
+  (recorded by ``LLMClient._retry_with_backoff``)
+- transport retries (429 / 5xx / timeouts)
+- wall-clock time of each tool call (tools wrapped with ``timed_tool``)
+- call traces appended by the caller (``calls``)
+
+Scopes live in a ``ContextVar`` and nest: everything recorded in an inner
+scope is also counted in its enclosing scopes, so a request-level scope
+sees the totals while a per-call scope isolates one call.  Async tasks and
+``asyncio.to_thread`` inherit the current scope; thread pools do not, so
+work submitted to an executor must run in a copied context
+(``contextvars.copy_context().run``) to be attributed.
+
+Usage:
+    from src.llm.usage import track_usage
+
+    with track_usage() as usage:
+        result = llm.generate(messages, tools=tools)
+    usage.input_tokens, usage.cached_tokens, usage.retries, usage.tools
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from src import tracing
+
+_current: ContextVar[UsageScope | None] = ContextVar("llm_usage_scope", default=None)
+
+
+@dataclass
+class UsageScope:
+    """Usage observed while the scope is open (and in nested scopes)."""
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    total_tokens: int = 0
+    retries: int = 0
+    tools: list[tuple[str, float]] = field(default_factory=list)  # (name, seconds)
+    calls: list[Any] = field(default_factory=list)  # appended by callers
+    phase: str = ""  # pipeline phase of the calls made in the scope (metrics label)
+    parent: UsageScope | None = field(default=None, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add_response(self, response: Any) -> None:
+        """Count the token usage reported by a provider response."""
+        input_tokens, output_tokens, cached_tokens, total_tokens = response_usage(response)
+        scope: UsageScope | None = self
+        while scope is not None:
+            with scope._lock:
+                scope.input_tokens += input_tokens
+                scope.output_tokens += output_tokens
+                scope.cached_tokens += cached_tokens
+                scope.total_tokens += total_tokens
+            scope = scope.parent
+
+    def add_retry(self) -> None:
+        scope: UsageScope | None = self
+        while scope is not None:
+            with scope._lock:
+                scope.retries += 1
+            scope = scope.parent
+
+    def add_tool(self, name: str, seconds: float) -> None:
+        scope: UsageScope | None = self
+        while scope is not None:
+            with scope._lock:
+                scope.tools.append((name, seconds))
+            scope = scope.parent
+
+
+def current_usage() -> UsageScope | None:
+    """The innermost open scope, if any."""
+    return _current.get()
+
+
+def current_phase() -> str:
+    """Phase of the innermost scope that names one (``""`` if none does)."""
+    scope = _current.get()
+    while scope is not None:
+        if scope.phase:
+            return scope.phase
+        scope = scope.parent
+    return ""
+
+
+@contextmanager
+def track_usage(phase: str = "") -> Iterator[UsageScope]:
+    """Open a usage scope nested in the current one."""
+    scope = UsageScope(parent=_current.get(), phase=phase)
+    token = _current.set(scope)
+    try:
+        yield scope
+    finally:
+        _current.reset(token)
+
+
+def timed_tool(tool: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a tool so each call's wall-clock time lands in the current scope.
+
+    Each call is also traced as a ``tool.call`` span.  The wrapper keeps
+    the tool's name, docstring and signature, which is all a provider sees
+    of it.
+    """
+
+    @functools.wraps(tool)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            with tracing.span("tool.call", {"tool.name": tool.__name__}):
+                return tool(*args, **kwargs)
+        finally:
+            scope = _current.get()
+            if scope is not None:
+                scope.add_tool(tool.__name__, time.perf_counter() - start)
+
+    return wrapper
+
+
+def response_usage(response: Any) -> tuple[int, int, int, int]:
+    """``(input, output, cached, total)`` tokens of an OpenAI or Gemini response."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        output_tokens = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        total_tokens = getattr(usage, "total_tokens", 0) or input_tokens + output_tokens
+        return input_tokens, output_tokens, cached_tokens, total_tokens
+
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is not None:
+        input_tokens = (getattr(metadata, "prompt_token_count", 0) or 0) + (
+            getattr(metadata, "tool_use_prompt_token_count", 0) or 0
+        )
+        total_tokens = getattr(metadata, "total_token_count", 0) or 0
+        # Output includes thinking tokens (total − input)
+        output_tokens = max(total_tokens - input_tokens, 0)
+        cached_tokens = getattr(metadata, "cached_content_token_count", 0) or 0
+        return input_tokens, output_tokens, cached_tokens, total_tokens
+    return 0, 0, 0, 0
@@ -0,0 +1,305 @@
+"""Process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms live in a process-wide ``REGISTRY`` and
+are served by the API's ``GET /metrics``.  Layers update them where the
+numbers are produced:
+
+- ``/generate`` handler — request latency by category / platform, abilities
+  generated / blocked / warned, queued and in-flight requests
+- job workers (``src/api/jobs.py``) — job attempts by outcome, jobs by status
+- ``LLMClient`` retry loop — provider request latency and tokens by provider
+  and phase, retries, HTTP 429s, in-flight requests, prompt-cache outcome
+- ``RateLimiter`` — callers queued for capacity
+- ``CTITools`` — Neo4j query latency by query name
+- ``ReasoningEngine`` — research-cache outcome
+
+Updates take one lock per metric, so they are cheap enough for every
+graph query.  Hit ratios are derived at query time, e.g.
+``rate(advsim_cache_requests_total{outcome="hit"}[5m])
+/ rate(advsim_cache_requests_total[5m])``.
+
+Usage:
+    from src import metrics
+
+    metrics.GRAPH_QUERY_SECONDS.observe(0.012, query="TECHNIQUES_BY_TACTIC")
+    text = metrics.render()  # body of GET /metrics
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_PREFIX = "advsim_"
+
+# Histogram buckets (seconds)
+REQUEST_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+QUERY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+# ──────────────────────────────────────────────────────────────
+# Metric types
+# ──────────────────────────────────────────────────────────────
+
+class _Metric:
+    """A named metric family with a fixed label set."""
+
+    kind = ""
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = _PREFIX + name
+        self.description = description
+        self.labels = labels
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        if labels.keys() != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _label_text(self, key: tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labels, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, description, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{self._label_text(key)} {_number(v)}" for key, v in values]
+
+
+class Gauge(Counter):
+    """Value that goes up and down (in-flight work, queue depth)."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track(self, **labels: Any) -> Iterator[None]:
+        """Count the block as in progress while it runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = REQUEST_BUCKETS,
+    ) -> None:
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key → [count per bucket (non-cumulative, last is +Inf), sum]
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = next(
+            (i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets)
+        )
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted((key, (list(c), t[0])) for key, (c, t) in self._values.items())
+        lines: list[str] = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = 'le="{}"'.format("+Inf" if bound == math.inf else _number(bound))
+                lines.append(f"{self.name}_bucket{self._label_text(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """All metric families of the process, in registration order."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            if any(m.name == metric.name for m in self._metrics):
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """All metrics in the text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.description)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# ──────────────────────────────────────────────────────────────
+# Metrics
+# ──────────────────────────────────────────────────────────────
+
+# --- API ---
+GENERATE_REQUESTS = Counter(
+    "generate_requests_total",
+    "Generation requests by category, platform and HTTP status.",
+    ("category", "platform", "status"),
+)
+GENERATE_SECONDS = Histogram(
+    "generate_request_duration_seconds",
+    "Generation request latency by category and platform.",
+    ("category", "platform"),
+    REQUEST_BUCKETS,
+)
+GENERATE_IN_FLIGHT = Gauge(
+    "generate_in_flight", "Generation requests being processed."
+)
+GENERATE_QUEUED = Gauge(
+    "generate_queue_depth", "Generation requests waiting for a free slot."
+)
+ABILITIES_GENERATED = Counter(
+    "abilities_generated_total",
+    "Abilities returned by generation requests.",
+    ("category", "platform"),
+)
+ABILITIES_BLOCKED = Counter(
+    "abilities_blocked_total",
+    "Abilities blocked by the safety layer.",
+    ("category", "platform"),
+)
+ABILITIES_WARNED = Counter(
+    "abilities_warned_total",
+    "Abilities with safety warnings for human review.",
+    ("category", "platform"),
+)
+
+# --- Job queue ---
+JOBS = Gauge(
+    "jobs", "Jobs in the queue database by status (refreshed on scrape).", ("status",)
+)
+JOB_ATTEMPTS = Counter(
+    "job_attempts_total",
+    "Finished job attempts by outcome (succeeded, retried, failed, lost).",
+    ("outcome",),
+)
+
+# --- LLM ---
+LLM_REQUEST_SECONDS = Histogram(
+    "llm_request_duration_seconds",
+    "Latency of single provider requests (one attempt) by provider and phase.",
+    ("provider", "phase"),
+    LLM_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported by providers, by provider, phase and type "
+    "(input, output, cached).",
+    ("provider", "phase", "type"),
+)
+LLM_RETRIES = Counter(
+    "llm_retries_total", "Provider requests retried after a transient error.", ("provider",)
+)
+LLM_RATE_LIMITED = Counter(
+    "llm_rate_limited_total", "Provider requests rejected with HTTP 429.", ("provider",)
+)
+LLM_IN_FLIGHT = Gauge(
+    "llm_requests_in_flight", "Provider requests awaiting a response.", ("provider",)
+)
+LLM_QUEUED = Gauge(
+    "llm_rate_limit_queue_depth",
+    "Callers queued on the client-side rate limiter.",
+    ("provider",),
+)
+
+# --- Graph ---
+GRAPH_QUERY_SECONDS = Histogram(
+    "graph_query_duration_seconds",
+    "Neo4j query latency by query name (src/graph/queries.py).",
+    ("query",),
+    QUERY_BUCKETS,
+)
+
+# --- Caches ---
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by cache (research, llm_prompt) and outcome (hit, miss, bypass).",
+    ("cache", "outcome"),
+)
@@ -9,11 +9,17 @@ from .enums import (
 )
 from .ability import (
     Ability,
+    AbilityBatch,
+    AbilityDraft,
+    AbilityDraftBatch,
     CampaignUsage,
     Executor,
     GenerationTrace,
+    LLMCallTrace,
     MitreMapping,
+    PhaseTimings,
     ThreatIntelContext,
+    ToolCallTrace,
 )
 
 __all__ = [
@@ -23,9 +29,15 @@ __all__ = [
     "Platform",
     "PrivilegeLevel",
     "Ability",
+    "AbilityBatch",
+    "AbilityDraft",
+    "AbilityDraftBatch",
     "CampaignUsage",
     "Executor",
     "GenerationTrace",
+    "LLMCallTrace",
     "MitreMapping",
+    "PhaseTimings",
     "ThreatIntelContext",
+    "ToolCallTrace",
 ]
@@ -9,7 +9,7 @@ These Pydantic models are used for:
 
 import uuid
 from datetime import datetime, timezone
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SkipValidation
 
 from .enums import (
     ApprovalStatus,
@@ -246,6 +246,70 @@ class ThreatIntelContext(BaseModel):
     }
 
 
+class LLMCallTrace(BaseModel):
+    """Telemetry of one LLM call that contributed to an ability."""
+
+    phase: str = Field(description="Pipeline phase: 'phase_a' or 'phase_b'")
+    model: str = Field(default="", description="Model that served the call")
+    seconds: float = Field(
+        default=0.0,
+        description="Wall-clock time of the call, including retries and tool calls",
+    )
+    input_tokens: int = Field(default=0, description="Prompt tokens (all turns)")
+    output_tokens: int = Field(
+        default=0, description="Completion tokens, including thinking (all turns)"
+    )
+    cached_tokens: int = Field(
+        default=0, description="Prompt tokens served from the provider's prompt cache"
+    )
+    total_tokens: int = Field(default=0, description="Total tokens of the call")
+    attributed_tokens: int = Field(
+        default=0,
+        description=(
+            "Share of total_tokens attributed to this ability — the whole call "
+            "unless it served several abilities (Phase A, batched Phase B)"
+        ),
+    )
+    batch_size: int = Field(
+        default=1, description="Number of ability slots the call composed"
+    )
+    retries: int = Field(
+        default=0, description="Transport retries (HTTP 429 / 5xx / timeouts)"
+    )
+    repairs: int = Field(
+        default=0, description="Structured-output fixes applied locally"
+    )
+    failed: bool = Field(default=False, description="The call raised an error")
+
+
+class ToolCallTrace(BaseModel):
+    """Wall-clock time of one tool call made while researching the ability."""
+
+    name: str = Field(description="Tool function name")
+    seconds: float = Field(default=0.0, description="Wall-clock time of the call")
+
+
+class PhaseTimings(BaseModel):
+    """Wall-clock seconds per pipeline phase.
+
+    Phase A and planning run once per request and are shared by all of
+    its abilities; Phase B and validation are this ability's own.
+    """
+
+    phase_a_seconds: float = Field(
+        default=0.0, description="Phase A research (or graph-first plan), per request"
+    )
+    planning_seconds: float = Field(
+        default=0.0, description="Technique assignment and backfill, per request"
+    )
+    phase_b_seconds: float = Field(
+        default=0.0, description="This ability's composition call(s)"
+    )
+    validation_seconds: float = Field(
+        default=0.0, description="This ability's safety validation"
+    )
+
+
 class GenerationTrace(BaseModel):
     """Audit trail of how the ability was generated."""
 
@@ -261,8 +325,37 @@ class GenerationTrace(BaseModel):
     total_tokens: int = Field(
         default=0,
         description=(
-            "Total token consumption (input + output) cumulative across "
-            "all tool-calling iterations, including tool call/result tokens"
+            "Tokens attributed to this ability (input + output): its own "
+            "Phase B tokens plus its share of the request's Phase A tokens, "
+            "so the abilities of a request add up to the request's usage"
+        ),
+    )
+    phase_a_tokens: int = Field(
+        default=0,
+        description="Phase A tokens of the whole request (shared by its abilities)",
+    )
+    phase_b_tokens: int = Field(
+        default=0,
+        description="Phase B tokens attributed to this ability",
+    )
+    timings: PhaseTimings = Field(
+        default_factory=PhaseTimings,
+        description="Wall-clock time per pipeline phase",
+    )
+    llm_calls: list[LLMCallTrace] = Field(
+        default_factory=list,
+        description="LLM calls behind this ability (shared Phase A calls included)",
+    )
+    tool_calls: list[ToolCallTrace] = Field(
+        default_factory=list,
+        description="Timed tool calls made while researching the request",
+    )
+    cache: dict[str, str] = Field(
+        default_factory=dict,
+        description=(
+            "Outcome per cache layer consulted: 'research' (Phase A research "
+            "cache: hit / miss / bypass) and 'llm_prompt' (provider prompt "
+            "cache: hit / miss)"
         ),
     )
     blocklist_version: str = Field(
@@ -438,3 +531,52 @@ class Ability(BaseModel):
             ]
         }
     }
+
+
+class AbilityBatch(BaseModel):
+    """Envelope for batched Phase B composition (several abilities per call).
+
+    The JSON schema sent to the LLM describes every item as a full
+    ``Ability``, but items are NOT validated as part of the envelope —
+    they stay raw dicts so the caller can validate each one individually
+    and regenerate only the invalid items instead of the whole batch.
+    """
+
+    abilities: list[SkipValidation[Ability]] = Field(
+        description=(
+            "The requested abilities, in the order they were requested. "
+            "Each item is a complete Ability JSON object."
+        )
+    )
+
+
+class AbilityDraft(BaseModel):
+    """The creative part of an ability — the slim Phase B output schema.
+
+    The LLM writes only the name, description and executors.  Attack
+    category, MITRE mapping, threat intel and the safety / metadata fields
+    are filled deterministically from the request and the knowledge graph
+    when the draft is completed into an ``Ability`` (see
+    ``ReasoningEngine``), so no output tokens are spent restating graph
+    data and intel cannot be fabricated.
+    """
+
+    name: str = Field(description=Ability.model_fields["name"].description)
+    description: str = Field(
+        description=Ability.model_fields["description"].description
+    )
+    executors: list[Executor] = Field(
+        min_length=1,
+        description=Ability.model_fields["executors"].description,
+    )
+
+
+class AbilityDraftBatch(BaseModel):
+    """Envelope for batched slim Phase B composition (see ``AbilityBatch``)."""
+
+    abilities: list[SkipValidation[AbilityDraft]] = Field(
+        description=(
+            "The requested abilities, in the order they were requested. "
+            "Each item is a complete AbilityDraft JSON object."
+        )
+    )
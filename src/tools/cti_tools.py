@@ -15,14 +15,23 @@ Usage:
 from __future__ import annotations
 
 import logging
+import time
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+from src import metrics, tracing
 from src.graph.connection import Neo4jConnection
 from src.graph import queries
 
 logger = logging.getLogger(__name__)
 
+# Cypher text → constant name in src/graph/queries.py (span attribute)
+_QUERY_NAMES: dict[str, str] = {
+    value: name
+    for name, value in vars(queries).items()
+    if name.isupper() and isinstance(value, str)
+}
+
 
 class CTITools:
     """Neo4j-backed CTI query tools.
@@ -54,6 +63,25 @@ class CTITools:
     def __exit__(self, *exc: Any) -> None:
         self.close()
 
+    def _run_query(
+        self, cypher: str, params: dict[str, Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """``run_query`` traced as a ``graph.query`` span (query name, rows)
+        and timed in ``graph_query_duration_seconds``."""
+        name = _QUERY_NAMES.get(cypher, "adhoc")
+        start = time.perf_counter()
+        try:
+            with tracing.span(
+                "graph.query",
+                {"db.system": "neo4j", "db.query.name": name},
+                kind=tracing.SPAN_KIND_CLIENT,
+            ) as span:
+                results = self._conn.run_query(cypher, params)
+                span.set_attribute("db.rows", len(results))
+                return results
+        finally:
+            metrics.GRAPH_QUERY_SECONDS.observe(time.perf_counter() - start, query=name)
+
     # ──────────────────────────────────────────────────────────
     # Core query tools
     # ──────────────────────────────────────────────────────────
@@ -69,7 +97,7 @@ class CTITools:
         Returns:
             List of dicts with keys: group_name, aliases, usage_description.
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.INTRUSION_SETS_FOR_TECHNIQUE,
             {"technique_id": technique_id},
         )
@@ -89,7 +117,7 @@ class CTITools:
         Returns:
             List of dicts with keys: name, type, description, usage_description.
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.TOOLS_FOR_TECHNIQUE,
             {"technique_id": technique_id},
         )
@@ -107,7 +135,7 @@ class CTITools:
         Returns:
             Dict with keys: detection_text, data_sources.
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.DETECTION_FOR_TECHNIQUE,
             {"technique_id": technique_id},
         )
@@ -135,7 +163,7 @@ class CTITools:
             List of dicts with keys: mitigation_name, description,
             how_it_mitigates.
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.MITIGATIONS_FOR_TECHNIQUE,
             {"technique_id": technique_id},
         )
@@ -153,7 +181,7 @@ class CTITools:
         Returns:
             List of dicts with: name, attack_id, description, platforms.
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.SUBTECHNIQUES_FOR_TECHNIQUE,
             {"technique_id": technique_id},
         )
@@ -171,7 +199,7 @@ class CTITools:
         Returns:
             List of dicts with: name, attack_id, description, platforms.
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.TECHNIQUES_BY_TACTIC,
             {"tactic": tactic},
         )
@@ -193,9 +221,12 @@ class CTITools:
 
         Returns:
             Dict with: name, attack_id, description, platforms, tactics,
-            groups, tools, data_sources, mitigations, detection_text.
+            groups, tools, data_sources, mitigations, detection_text,
+            campaigns, and the MISP Galaxy context as galaxy_attack_pattern,
+            galaxy_groups, galaxy_tools, galaxy_malware (see
+            ``galaxy_context_from``).
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.FULL_TECHNIQUE_CONTEXT,
             {"technique_id": technique_id},
         )
@@ -217,7 +248,7 @@ class CTITools:
         Returns:
             List of dicts with: name, attack_id, description, platforms.
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.RANDOM_TECHNIQUES_BY_TACTIC,
             {"tactic": tactic, "count": count},
         )
@@ -235,12 +266,74 @@ class CTITools:
         Returns:
             List of dicts with: name, attack_id, description.
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.TECHNIQUES_FOR_PLATFORM,
             {"tactic": tactic, "platform": platform},
         )
         return results
 
+    def get_technique_candidates(
+        self, tactics: list[str], platforms: list[str]
+    ) -> list[dict[str, Any]]:
+        """Get techniques + sub-techniques for tactics/platforms with prevalence.
+
+        Args:
+            tactics: Tactic shortnames (e.g. ['credential-access']).
+            platforms: ATT&CK platform names (e.g. ['Windows']).
+
+        Returns:
+            List of dicts with: attack_id, name, is_subtechnique, platforms,
+            tactics, group_count, campaign_count, software_count.
+        """
+        results = self._run_query(
+            queries.TECHNIQUE_CANDIDATES,
+            {"tactics": tactics, "platforms": platforms},
+        )
+        logger.info(
+            "Found %d technique candidates for tactics=%s platforms=%s.",
+            len(results),
+            tactics,
+            platforms,
+        )
+        return results
+
+    def get_techniques_by_ids(
+        self, technique_ids: list[str]
+    ) -> list[dict[str, Any]]:
+        """Look up techniques / sub-techniques by ATT&CK ID.
+
+        IDs that are not in the graph are simply absent from the result.
+
+        Args:
+            technique_ids: ATT&CK IDs (e.g. ['T1003', 'T1003.001']).
+
+        Returns:
+            List of dicts with: attack_id, name, platforms.
+        """
+        if not technique_ids:
+            return []
+        return self._run_query(
+            queries.TECHNIQUES_BY_IDS,
+            {"technique_ids": technique_ids},
+        )
+
+    def get_graph_version(self) -> str:
+        """Return a fingerprint of the graph content.
+
+        Uses the ``GraphMeta`` version stamped at ingestion, combined with
+        node/relationship counts (which alone identify unstamped graphs).
+
+        Returns:
+            Version string, e.g. ``'3f2a...:24310:61877'``.
+        """
+        results = self._run_query(queries.GRAPH_VERSION)
+        record = results[0] if results else {}
+        return "{}:{}:{}".format(
+            record.get("version") or "unversioned",
+            record.get("nodes", 0),
+            record.get("rels", 0),
+        )
+
     def get_campaigns_for_technique(
         self, technique_id: str
     ) -> list[dict[str, Any]]:
@@ -253,7 +346,7 @@ class CTITools:
             List of dicts with: campaign_name, external_id, description,
             first_seen, last_seen, attributed_groups.
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.CAMPAIGNS_FOR_TECHNIQUE,
             {"technique_id": technique_id},
         )
@@ -274,7 +367,7 @@ class CTITools:
             List of dicts with: campaign_name, external_id, description,
             first_seen, last_seen.
         """
-        results = self._conn.run_query(
+        results = self._run_query(
             queries.CAMPAIGNS_FOR_GROUP,
             {"group_name": group_name},
         )
@@ -283,6 +376,46 @@ class CTITools:
         )
         return results
 
+    def get_galaxy_context(self, technique_id: str) -> dict[str, Any]:
+        """Get MISP Galaxy context for a technique from the graph.
+
+        Requires the galaxy to have been loaded with
+        ``src.graph.loader.load_galaxy``.  Returns the same shape as
+        ``GalaxyManager.get_technique_context``.
+
+        Args:
+            technique_id: ATT&CK technique ID (e.g. 'T1003', 'T1003.001').
+
+        Returns:
+            Dict with keys: technique_id, attack_pattern, groups, tools, malware.
+        """
+        results = self._run_query(
+            queries.GALAXY_CONTEXT_FOR_TECHNIQUE,
+            {"technique_id": technique_id},
+        )
+        record = results[0] if results else {}
+        return {
+            "technique_id": technique_id,
+            "attack_pattern": record.get("attack_pattern"),
+            "groups": record.get("groups", []),
+            "tools": record.get("tools", []),
+            "malware": record.get("malware", []),
+        }
+
+    @staticmethod
+    def galaxy_context_from(technique_id: str, context: dict[str, Any]) -> dict[str, Any]:
+        """MISP Galaxy context carried by a ``get_full_technique_context`` result.
+
+        Same shape as ``get_galaxy_context``, without another query.
+        """
+        return {
+            "technique_id": technique_id,
+            "attack_pattern": context.get("galaxy_attack_pattern"),
+            "groups": context.get("galaxy_groups", []),
+            "tools": context.get("galaxy_tools", []),
+            "malware": context.get("galaxy_malware", []),
+        }
+
     # ──────────────────────────────────────────────────────────
     # Omnibus enrichment tool
     # ──────────────────────────────────────────────────────────
@@ -307,9 +440,9 @@ class CTITools:
         * ``MITIGATIONS_FOR_TECHNIQUE`` — mitigations with descriptions
         * ``CAMPAIGNS_FOR_TECHNIQUE`` — campaigns with dates + attribution
 
-        Detection guidance (``detection_text``, ``data_sources``) is
-        already fully captured in ``FULL_TECHNIQUE_CONTEXT`` so no extra
-        query is needed.
+        Detection guidance (``detection_text``, ``data_sources``) and the
+        graph's MISP Galaxy context are already captured in
+        ``FULL_TECHNIQUE_CONTEXT`` so no extra query is needed.
 
         Args:
             technique_id: ATT&CK technique or sub-technique ID
@@ -331,6 +464,8 @@ class CTITools:
             * **campaigns** — ``list[dict]`` with ``campaign_name``,
               ``external_id``, ``description``, ``first_seen``,
               ``last_seen``, ``attributed_groups``
+            * **misp_galaxy** — galaxy context from the graph (see
+              ``get_galaxy_context``)
 
             Returns ``{"error": "..."}`` if the technique is not found.
         """
@@ -342,10 +477,10 @@ class CTITools:
 
         # 2. Detailed records in parallel (richer than the summary names above)
         with ThreadPoolExecutor(max_workers=4) as pool:
-            f_groups = pool.submit(self.get_intrusion_sets_for_technique, technique_id)
-            f_tools = pool.submit(self.get_tools_for_technique, technique_id)
-            f_mitigations = pool.submit(self.get_mitigations, technique_id)
-            f_campaigns = pool.submit(self.get_campaigns_for_technique, technique_id)
+            f_groups = tracing.submit(pool, self.get_intrusion_sets_for_technique, technique_id)
+            f_tools = tracing.submit(pool, self.get_tools_for_technique, technique_id)
+            f_mitigations = tracing.submit(pool, self.get_mitigations, technique_id)
+            f_campaigns = tracing.submit(pool, self.get_campaigns_for_technique, technique_id)
 
             groups = f_groups.result()
             tools = f_tools.result()
@@ -368,6 +503,8 @@ class CTITools:
             },
             "mitigations": mitigations,
             "campaigns": campaigns,
+            # Graph-served MISP Galaxy context (same query as the metadata)
+            "misp_galaxy": self.galaxy_context_from(technique_id, base),
         }
 
         logger.info(
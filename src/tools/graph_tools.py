@@ -15,13 +15,22 @@ Usage:
 
     tools = create_reasoning_tools(conn, galaxy)
     dispatch = create_dispatch_map(tools)
+
+Tool results are projected before they reach the LLM: only the fields the
+model needs are kept, long texts are truncated, lists are capped (with a
+``*_total`` count when cut) and null/empty values are dropped.  Each tool
+has a token budget (``TOOL_TOKEN_BUDGETS``); projections are tightened step
+by step (``TOOL_PROJECTION_STEPS``) until the result fits.
 """
 
 from __future__ import annotations
 
+import json
 import logging
+from collections.abc import Callable
 from typing import Any
 
+from src.config import TOOL_CHARS_PER_TOKEN, TOOL_PROJECTION_STEPS, TOOL_TOKEN_BUDGETS
 from src.graph.connection import Neo4jConnection
 from src.layers.layer2_enrichment import GalaxyManager
 from src.tools.cti_tools import CTITools
@@ -32,7 +41,7 @@ logger = logging.getLogger(__name__)
 
 def create_reasoning_tools(
     conn: Neo4jConnection,
-    galaxy: GalaxyManager,
+    galaxy: GalaxyManager | None,
 ) -> list[Any]:
     """Create the 4 LLM-facing tool closures capturing shared resources.
 
@@ -42,7 +51,8 @@ def create_reasoning_tools(
 
     Args:
         conn: Active Neo4j connection (shared across all closures).
-        galaxy: Loaded GalaxyManager instance (shared across all closures).
+        galaxy: Loaded GalaxyManager instance (shared across all closures),
+            or ``None`` to serve MISP Galaxy data from the graph.
 
     Returns:
         List of exactly 4 callable closures with ``__name__``, ``__doc__``,
@@ -53,7 +63,7 @@ def create_reasoning_tools(
 
     # ── Tool 1: Discover techniques by tactic ─────────────────
 
-    def get_techniques_by_tactic(tactic: str) -> list[dict]:
+    def get_techniques_by_tactic(tactic: str) -> dict:
         """Query the MITRE ATT&CK knowledge graph for techniques in a specific tactic.
 
         Use this to discover which attack techniques are available under a given tactic.
@@ -66,14 +76,19 @@ def create_reasoning_tools(
                 'lateral-movement', 'defense-evasion').
 
         Returns:
-            List of technique dicts with keys: name, attack_id, description, platforms.
+            Dict with keys: techniques (list of dicts with name, attack_id,
+            description, platforms), techniques_total (when the list was cut).
         """
         logger.info("Tool call: get_techniques_by_tactic(tactic=%r)", tactic)
-        return _cti.get_techniques_by_tactic(tactic)
+        return _fit_budget(
+            "get_techniques_by_tactic",
+            _cti.get_techniques_by_tactic(tactic),
+            _project_techniques,
+        )
 
     # ── Tool 2: Discover techniques by tactic + platform ──────
 
-    def get_techniques_for_platform(tactic: str, platform: str) -> list[dict]:
+    def get_techniques_for_platform(tactic: str, platform: str) -> dict:
         """Query ATT&CK techniques filtered by tactic AND target platform.
 
         Use this when generating abilities for a specific operating system.
@@ -85,18 +100,23 @@ def create_reasoning_tools(
             platform: Target platform name (e.g., 'Windows', 'Linux', 'macOS').
 
         Returns:
-            List of technique dicts with keys: name, attack_id, description.
+            Dict with keys: techniques (list of dicts with name, attack_id,
+            description), techniques_total (when the list was cut).
         """
         logger.info(
             "Tool call: get_techniques_for_platform(tactic=%r, platform=%r)",
             tactic,
             platform,
         )
-        return _cti.get_techniques_for_platform(tactic, platform)
+        return _fit_budget(
+            "get_techniques_for_platform",
+            _cti.get_techniques_for_platform(tactic, platform),
+            _project_techniques,
+        )
 
     # ── Tool 3: Navigate to sub-techniques ────────────────────
 
-    def get_subtechniques(technique_id: str) -> list[dict]:
+    def get_subtechniques(technique_id: str) -> dict:
         """Get sub-techniques for a parent ATT&CK technique.
 
         Use this to discover specific attack variants. For example T1003
@@ -107,20 +127,27 @@ def create_reasoning_tools(
             technique_id: Parent technique ID (e.g., 'T1003', 'T1110').
 
         Returns:
-            List of sub-technique dicts with keys: name, attack_id, description, platforms.
+            Dict with keys: techniques (list of sub-technique dicts with name,
+            attack_id, description, platforms), techniques_total (when the
+            list was cut).
         """
         logger.info("Tool call: get_subtechniques(technique_id=%r)", technique_id)
-        return _cti.get_subtechniques(technique_id)
+        return _fit_budget(
+            "get_subtechniques",
+            _cti.get_subtechniques(technique_id),
+            _project_techniques,
+        )
 
     # ── Tool 4: Omnibus enrichment ────────────────────────────
 
     def get_technique_intel(technique_id: str) -> dict:
         """Get comprehensive threat intelligence for a technique in ONE call.
 
-        Returns detailed groups (with aliases, usage), tools/malware (with type,
-        description), detection guidance (with data sources), mitigations (with
-        descriptions), real-world campaigns (with dates, group attribution), and
-        MISP Galaxy community intelligence.
+        Returns groups (with aliases, usage), tools/malware (with type, usage),
+        detection guidance (with data sources), mitigations (with how they
+        mitigate), real-world campaigns (with dates, group attribution), and
+        MISP Galaxy community intelligence.  Long lists are cut and report
+        the full size in a matching ``*_total`` key.
 
         This is the primary enrichment tool — call it once per technique instead
         of making multiple separate queries.
@@ -135,9 +162,10 @@ def create_reasoning_tools(
         """
         logger.info("Tool call: get_technique_intel(technique_id=%r)", technique_id)
         intel = _cti.get_technique_intel(technique_id)
-        if "error" not in intel:
+        if "error" not in intel and not _misp.galaxy_from_graph:
+            # Graph mode already carries the galaxy context in the intel query
             intel["misp_galaxy"] = _misp.search_misp_galaxy(technique_id)
-        return intel
+        return _fit_budget("get_technique_intel", intel, _project_intel)
 
     tools = [
         get_techniques_by_tactic,
@@ -154,6 +182,167 @@ def create_reasoning_tools(
     return tools
 
 
+# ──────────────────────────────────────────────────────────────
+# Result projection
+# ──────────────────────────────────────────────────────────────
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough token count of a tool result as serialised for the LLM."""
+    text = json.dumps(value, ensure_ascii=False, default=str, separators=(",", ":"))
+    return len(text) // TOOL_CHARS_PER_TOKEN
+
+
+def _fit_budget(
+    tool_name: str,
+    result: Any,
+    project: Callable[[Any, int, int], Any],
+) -> Any:
+    """Project *result* with progressively tighter limits until it fits.
+
+    Args:
+        tool_name: Key into ``TOOL_TOKEN_BUDGETS``.
+        result: Raw ``CTITools`` / ``MISPTools`` output.
+        project: ``project(result, max_text, max_items)`` projection.
+
+    Returns:
+        The first projection within budget, or the tightest one.
+    """
+    if isinstance(result, dict) and "error" in result:
+        return result
+    budget = TOOL_TOKEN_BUDGETS.get(tool_name, 0)
+    projected: Any = result
+    for max_text, max_items in TOOL_PROJECTION_STEPS:
+        projected = project(result, max_text, max_items)
+        if not budget or estimate_tokens(projected) <= budget:
+            return projected
+    logger.warning(
+        "%s result still over its %d-token budget (~%d tokens) after projection",
+        tool_name,
+        budget,
+        estimate_tokens(projected),
+    )
+    return projected
+
+
+def _project_techniques(rows: list[dict], max_text: int, max_items: int) -> dict:
+    """Project a technique list (discover / navigate tools)."""
+    techniques = [
+        {
+            "attack_id": row.get("attack_id"),
+            "name": row.get("name"),
+            "platforms": row.get("platforms"),
+            "description": _truncate(row.get("description"), max_text),
+        }
+        for row in rows
+    ]
+    # The list is the model's menu of choices: shorten descriptions well
+    # before dropping techniques.
+    return _prune({"techniques": techniques}, max_items * 8)
+
+
+def _project_intel(intel: dict, max_text: int, max_items: int) -> dict:
+    """Project a ``get_technique_intel`` result.
+
+    Key names match ``CTITools.get_technique_intel`` so downstream consumers
+    (``compact_intel``, ``extract_research``) read projected and raw results
+    alike.  Per-item long descriptions and MISP ``meta`` / ``related`` blobs
+    are dropped; usage texts are kept (shortened) as the most specific
+    evidence.
+    """
+    item_text = max_text // 2
+    detection = intel.get("detection") or {}
+    galaxy = intel.get("misp_galaxy") or {}
+    projected = {
+        "attack_id": intel.get("attack_id"),
+        "name": intel.get("name"),
+        "platforms": intel.get("platforms"),
+        "tactics": intel.get("tactics"),
+        "description": _truncate(intel.get("description"), max_text),
+        "groups": [
+            {
+                "group_name": g.get("group_name"),
+                "aliases": g.get("aliases"),
+                "usage_description": _truncate(g.get("usage_description"), item_text),
+            }
+            for g in intel.get("groups") or []
+        ],
+        "tools": [
+            {
+                "name": t.get("name"),
+                "type": t.get("type"),
+                "usage_description": _truncate(t.get("usage_description"), item_text),
+            }
+            for t in intel.get("tools") or []
+        ],
+        "detection": {
+            "detection_text": _truncate(detection.get("detection_text"), max_text),
+            "data_sources": detection.get("data_sources"),
+        },
+        "mitigations": [
+            {
+                "mitigation_name": m.get("mitigation_name"),
+                "how_it_mitigates": _truncate(m.get("how_it_mitigates"), item_text),
+            }
+            for m in intel.get("mitigations") or []
+        ],
+        "campaigns": [
+            {
+                "campaign_name": c.get("campaign_name"),
+                "external_id": c.get("external_id"),
+                "first_seen": c.get("first_seen"),
+                "last_seen": c.get("last_seen"),
+                "attributed_groups": c.get("attributed_groups"),
+            }
+            for c in intel.get("campaigns") or []
+        ],
+        "misp_galaxy": {
+            "attack_pattern": (galaxy.get("attack_pattern") or {}).get("name"),
+            "groups": [
+                {
+                    "name": g.get("name"),
+                    "aliases": g.get("aliases"),
+                    "country": g.get("country"),
+                }
+                for g in galaxy.get("groups") or []
+            ],
+            "tools": [t.get("name") for t in galaxy.get("tools") or []],
+            "malware": [m.get("name") for m in galaxy.get("malware") or []],
+        },
+    }
+    return _prune(projected, max_items)
+
+
+def _truncate(text: str | None, max_chars: int) -> str | None:
+    """Cut *text* to *max_chars* on a word boundary (``None`` if 0)."""
+    if not text or max_chars <= 0:
+        return None
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return cut.rstrip(".,;:") + "…"
+
+
+def _prune(value: Any, max_items: int) -> Any:
+    """Drop null/empty values and cap lists, recording ``<key>_total``."""
+    if isinstance(value, dict):
+        out: dict[str, Any] = {}
+        for key, item in value.items():
+            if isinstance(item, list) and len(item) > max_items:
+                out[f"{key}_total"] = len(item)
+                item = item[:max_items]
+            item = _prune(item, max_items)
+            if item not in (None, "", [], {}):
+                out[key] = item
+        # Drop totals whose list pruned away entirely
+        return {k: v for k, v in out.items() if not k.endswith("_total") or k[:-6] in out}
+    if isinstance(value, list):
+        items = [_prune(item, max_items) for item in value]
+        return [item for item in items if item not in (None, "", [], {})]
+    return value
+
+
 def create_dispatch_map(tools: list[Any]) -> dict[str, Any]:
     """Build a name → function dispatch map from tool callables.
 
@@ -22,7 +22,8 @@ import logging
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from src.config import MAX_DETECTION_TEXT_LEN, MAX_SNIPPET_LEN
+from src import tracing
+from src.config import MAX_DETECTION_TEXT_LEN, MAX_SNIPPET_LEN, get_settings
 from src.graph.connection import Neo4jConnection
 from src.layers.layer2_enrichment import GalaxyManager
 from src.models.ability import CampaignUsage, ThreatIntelContext
@@ -50,15 +51,19 @@ class MISPTools:
 
         Args:
             conn: Optional Neo4jConnection. Creates one if None.
-            galaxy_manager: Optional pre-loaded GalaxyManager. Creates and
-                loads one if None.
+            galaxy_manager: Optional pre-loaded GalaxyManager. If None,
+                galaxy lookups are served from the graph when
+                ``GALAXY_SOURCE=graph``; otherwise one is created and loaded.
         """
         self._conn = conn or Neo4jConnection()
         self._owns_conn = conn is None
         self._cti = CTITools(conn=self._conn)
 
+        self._galaxy: GalaxyManager | None
         if galaxy_manager is not None:
             self._galaxy = galaxy_manager
+        elif get_settings().galaxy_source == "graph":
+            self._galaxy = None
         else:
             self._galaxy = GalaxyManager()
             self._galaxy.load_all()
@@ -78,11 +83,18 @@ class MISPTools:
     # MISP Galaxy lookup
     # ──────────────────────────────────────────────────────────
 
+    @property
+    def galaxy_from_graph(self) -> bool:
+        """Whether galaxy data is served from the graph (no in-process copy)."""
+        return self._galaxy is None
+
     def search_misp_galaxy(self, technique_id: str) -> dict[str, Any]:
         """Search MISP Galaxy data for a technique.
 
         Returns aggregated galaxy context including groups, tools,
-        malware, and attack pattern metadata.
+        malware, and attack pattern metadata.  Served from the in-memory
+        GalaxyManager when one is attached, otherwise from the
+        ``GalaxyCluster`` nodes in the graph.
 
         Args:
             technique_id: ATT&CK technique ID (e.g. 'T1003', 'T1003.001').
@@ -90,7 +102,10 @@ class MISPTools:
         Returns:
             Dict with keys: technique_id, attack_pattern, groups, tools, malware.
         """
-        ctx = self._galaxy.get_technique_context(technique_id)
+        if self._galaxy is None:
+            ctx = self._cti.get_galaxy_context(technique_id)
+        else:
+            ctx = self._galaxy.get_technique_context(technique_id)
         logger.info(
             "MISP Galaxy lookup for %s: %d groups, %d tools, %d malware.",
             technique_id,
@@ -112,7 +127,8 @@ class MISPTools:
         This is the primary enrichment entry point.  It:
         1. Queries Neo4j for groups, tools, detection, mitigations
         2. Queries Neo4j for real STIX Campaign objects (with dates + attribution)
-        3. Queries MISP Galaxy for additional groups, tools, malware
+        3. Adds MISP Galaxy groups, tools, malware — carried by the
+           step 1 query in graph mode, else from the GalaxyManager
         4. Deduplicates and merges into a ThreatIntelContext
 
         Args:
@@ -121,15 +137,24 @@ class MISPTools:
         Returns:
             Fully populated ThreatIntelContext with structured campaigns.
         """
-        # --- Parallel queries: Neo4j context + campaigns + MISP galaxy ---
+        # --- Parallel queries: Neo4j context + campaigns (+ in-process galaxy) ---
+        # In graph mode the galaxy context comes back with the full context.
         with ThreadPoolExecutor(max_workers=3) as pool:
-            f_neo4j = pool.submit(self._cti.get_full_technique_context, technique_id)
-            f_campaigns = pool.submit(self._cti.get_campaigns_for_technique, technique_id)
-            f_galaxy = pool.submit(self.search_misp_galaxy, technique_id)
+            f_neo4j = tracing.submit(pool, self._cti.get_full_technique_context, technique_id)
+            f_campaigns = tracing.submit(pool, self._cti.get_campaigns_for_technique, technique_id)
+            f_galaxy = (
+                tracing.submit(pool, self.search_misp_galaxy, technique_id)
+                if self._galaxy is not None
+                else None
+            )
 
             neo4j_ctx = f_neo4j.result()
             campaign_records = f_campaigns.result()
-            galaxy_ctx = f_galaxy.result()
+            galaxy_ctx = (
+                f_galaxy.result()
+                if f_galaxy is not None
+                else self._cti.galaxy_context_from(technique_id, neo4j_ctx)
+            )
 
         neo4j_groups: list[str] = neo4j_ctx.get("groups", [])
         neo4j_tools: list[str] = neo4j_ctx.get("tools", [])
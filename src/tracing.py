@@ -0,0 +1,351 @@
+"""Optional request tracing — spans across the API, engine, LLM, tools and graph.
+
+A span times one unit of work and carries attributes (query name, tool
+name, tokens, retry attempt ...).  Spans nest through a ``ContextVar``:
+async tasks and ``asyncio.to_thread`` inherit the current span, and work
+submitted to a thread pool joins the submitter's trace when it runs in a
+copied context (``contextvars.copy_context().run``, see ``submit`` and
+``in_context``).
+
+Finished spans are exported as OTLP/JSON (the OpenTelemetry protocol's
+JSON encoding, one ``ExportTraceServiceRequest`` per line) to a local file
+— readable by the OpenTelemetry Collector's ``otlpjsonfile`` receiver and
+tools that import OTLP.  A trace is written when its root span ends.
+
+Tracing is off unless ``TRACING_ENABLED`` is set (``configure``); a
+disabled ``span()`` returns a shared no-op span, so instrumented code pays
+one global check per span.
+
+Usage:
+    from src import tracing
+
+    tracing.configure(get_settings())
+
+    with tracing.span("graph.query", {"db.query.name": "TECHNIQUES"}) as span:
+        rows = conn.run_query(cypher)
+        span.set_attribute("db.rows", len(rows))
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from src.config import AGENT_VERSION, TRACE_PATH, Settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+SERVICE_NAME = "adv-attack-simulation"
+
+# OTLP enums
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+_STATUS_ERROR = 2
+
+_FLUSH_AT = 512  # buffered spans that force a write (long-lived root spans)
+
+_current: ContextVar[Span | None] = ContextVar("trace_span", default=None)
+_exporter: FileExporter | None = None
+
+
+# ──────────────────────────────────────────────────────────────
+# Spans
+# ──────────────────────────────────────────────────────────────
+
+class Span:
+    """One timed operation; use as a context manager (see ``span``)."""
+
+    __slots__ = (
+        "name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+        "attributes", "events", "status", "_exporter", "_token",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        parent: Span | None,
+        attributes: dict[str, Any] | None,
+        kind: int,
+        exporter: FileExporter,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else ""
+        self.start_ns = 0
+        self.end_ns = 0
+        self.attributes: dict[str, Any] = dict(attributes) if attributes else {}
+        self.events: list[tuple[str, int, dict[str, Any]]] = []
+        self.status: tuple[int, str] = (0, "")
+        self._exporter = exporter
+        self._token: contextvars.Token | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: dict[str, Any] | None = None) -> None:
+        self.events.append((name, time.time_ns(), attributes or {}))
+
+    def set_error(self, message: str) -> None:
+        self.status = (_STATUS_ERROR, message)
+
+    def __enter__(self) -> Span:
+        self.start_ns = time.time_ns()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.end_ns = time.time_ns()
+        if exc is not None:
+            self.add_event("exception", {
+                "exception.type": exc_type.__name__,
+                "exception.message": str(exc),
+            })
+            self.set_error(f"{exc_type.__name__}: {exc}")
+        _current.reset(self._token)
+        self._exporter.export(self)
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: dict[str, Any]) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: dict[str, Any] | None = None) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def span(
+    name: str,
+    attributes: dict[str, Any] | None = None,
+    *,
+    kind: int = SPAN_KIND_INTERNAL,
+) -> Span | _NoopSpan:
+    """A span named *name*, child of the current span (no-op when disabled)."""
+    exporter = _exporter
+    if exporter is None:
+        return _NOOP
+    return Span(name, _current.get(), attributes, kind, exporter)
+
+
+def current_span() -> Span | _NoopSpan:
+    """The innermost open span (the no-op span when there is none)."""
+    return _current.get() or _NOOP
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator: run the function (sync or async) inside ``span(name)``."""
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def awrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return awrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def submit(executor: Executor, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """``executor.submit`` in a copy of the caller's context (spans nest)."""
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+def in_context(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Bind *func* to a copy of the caller's context, e.g. for ``pool.map``.
+
+    The copy is made here, in the submitting thread, so the worker's spans
+    (and usage scopes) nest under the caller's.
+    """
+    context = contextvars.copy_context()
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # A context can be entered by one thread at a time; pools run
+        # several calls at once, so each call enters its own copy.
+        return context.copy().run(func, *args, **kwargs)
+
+    return wrapper
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+# ──────────────────────────────────────────────────────────────
+# Configuration
+# ──────────────────────────────────────────────────────────────
+
+def configure(settings: Settings) -> None:
+    """Enable (or disable) tracing from ``TRACING_ENABLED`` / ``TRACING_PATH``."""
+    if settings.tracing_enabled:
+        enable(settings.tracing_path or TRACE_PATH)
+    else:
+        disable()
+
+
+def enable(path: str | Path) -> None:
+    """Export spans to *path* from now on."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.flush()
+    _exporter = FileExporter(path)
+    logger.info("Tracing enabled — spans exported to %s", _exporter.path)
+
+
+def disable() -> None:
+    global _exporter
+    if _exporter is not None:
+        _exporter.flush()
+    _exporter = None
+
+
+# ──────────────────────────────────────────────────────────────
+# OTLP/JSON file exporter
+# ──────────────────────────────────────────────────────────────
+
+class FileExporter:
+    """Buffer finished spans; append them to *path* as OTLP/JSON lines.
+
+    The buffer is written when a root span ends (a whole request), when it
+    reaches ``_FLUSH_AT`` spans and at interpreter exit.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._buffer: list[Span] = []
+        atexit.register(self.flush)
+
+    def export(self, finished: Span) -> None:
+        with self._lock:
+            self._buffer.append(finished)
+            if finished.parent_id and len(self._buffer) < _FLUSH_AT:
+                return
+            spans, self._buffer = self._buffer, []
+        self._write(spans)
+
+    def flush(self) -> None:
+        with self._lock:
+            spans, self._buffer = self._buffer, []
+        if spans:
+            self._write(spans)
+
+    def _write(self, spans: list[Span]) -> None:
+        line = json.dumps(_otlp_request(spans), ensure_ascii=False, default=str)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock, self.path.open("a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+        except OSError as exc:
+            logger.warning("Could not write %d spans to %s: %s", len(spans), self.path, exc)
+
+
+def _otlp_request(spans: list[Span]) -> dict[str, Any]:
+    """``ExportTraceServiceRequest`` (OTLP/JSON) holding *spans*."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({
+                "service.name": SERVICE_NAME,
+                "service.version": AGENT_VERSION,
+                "process.pid": os.getpid(),
+            })},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [_otlp_span(s) for s in spans],
+            }],
+        }],
+    }
+
+
+def _otlp_span(s: Span) -> dict[str, Any]:
+    data: dict[str, Any] = {
+        "traceId": s.trace_id,
+        "spanId": s.span_id,
+        "name": s.name,
+        "kind": s.kind,
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns),
+        "attributes": _otlp_attributes(s.attributes),
+    }
+    if s.parent_id:
+        data["parentSpanId"] = s.parent_id
+    if s.events:
+        data["events"] = [
+            {
+                "timeUnixNano": str(at),
+                "name": name,
+                "attributes": _otlp_attributes(attributes),
+            }
+            for name, at, attributes in s.events
+        ]
+    code, message = s.status
+    if code:
+        data["status"] = {"code": code, "message": message} if message else {"code": code}
+    return data
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}  # int64 is a string in OTLP/JSON
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}